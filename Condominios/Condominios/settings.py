@@ -90,6 +90,55 @@ DATABASES = {
 }
 
 
+# Cache
+# Los fragmentos del dashboard se invalidan por versión (frontend/cache_fragmentos.py).
+# Las versiones las incrementan también los comandos (cron) y otros procesos web,
+# así que el backend debe ser compartido: una caché local por proceso serviría
+# fragmentos viejos hasta que expiren. La tabla se crea con `manage.py createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_condominios',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+FRAGMENTOS_CACHE_TTL = 600
+
+# Facturación mensual (frontend/facturacion.py, comando generar_cuotas)
+CUOTA_MANTENIMIENTO_MONTO = '1500.00'
+CUOTA_MANTENIMIENTO_CATEGORIA = 'CUOTA_ORDINARIA'
+
+# Días después de fecha_emision en que un cobro PENDIENTE pasa a VENCIDO (comando vencer_pagos)
+DIAS_GRACIA_PAGO = 10
+
+# Folios de recibo que cada proceso reserva de una vez (frontend/folios.py)
+FOLIOS_TAMANO_BLOQUE = 50
+
+# Días antes/después de la emisión de un cargo en que un depósito puede corresponderle (conciliar_banco)
+CONCILIACION_VENTANA_DIAS = 60
+
+# Horas para resolver un ticket según su prioridad (Ticket.vence_en, comando escalar_tickets)
+SLA_TICKETS_HORAS = {
+    'EMERGENCIA': 4,
+    'ALTA': 24,
+    'MEDIA': 72,
+    'BAJA': 168,
+}
+
+# Auto-asignación de tickets (frontend/asignacion.py, comando asignar_tickets):
+# tipo de solicitud -> puestos de empleado y tipos de servicio de proveedor
+# que lo atienden. Se prefiere personal interno; el proveedor entra si no hay
+# empleado activo con ese puesto. Los tipos sin entrada usan 'Otro'.
+ASIGNACION_TICKETS = {
+    'Mantenimiento': {'puestos': ['Mantenimiento'], 'servicios': ['Plomería', 'Jardinería']},
+    'Queja': {'puestos': ['Administrador'], 'servicios': []},
+    'Sugerencia': {'puestos': ['Administrador'], 'servicios': []},
+    'Otro': {'puestos': ['Administrador', 'Conserje'], 'servicios': ['Limpieza']},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,189 @@
+"""
+Aplicación de abonos: un monto recibido de un residente se reparte entre
+sus cargos abiertos (INGRESO PENDIENTE/VENCIDO) del más antiguo al más
+nuevo.
+
+Todo un lote de abonos (p. ej. los depósitos de un estado de cuenta
+bancario) se aplica en una sola transacción: una lectura de los cargos con
+select_for_update, UPDATEs agrupados de los cargos y un bulk_create de
+abonos y aplicaciones. Como las escrituras en bloque no disparan señales,
+aquí se actualizan a mano saldos, resumen financiero, KPIs y fragmentos
+cacheados.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import agregados, folios, resumen_financiero, saldos
+from .models import Abono, AplicacionAbono, Pago, EstadoPago
+
+TAMANO_LOTE = 1000
+CAMPOS_CARGO = ('monto_pagado', 'estado', 'fecha_pago', 'metodo_pago', 'updated_at')
+
+
+class AbonoInvalido(Exception):
+    pass
+
+
+def _valores_resumen(cargo):
+    return {
+        'tipo_movimiento': cargo.tipo_movimiento, 'categoria': cargo.categoria,
+        'fecha_emision': cargo.fecha_emision, 'fecha_pago': cargo.fecha_pago,
+    }
+
+
+def _guardar_cargos(cargos, ahora):
+    """
+    Los cargos liquidados se guardan con un UPDATE por (fecha, método)
+    poniendo monto_pagado = monto_total; sólo los abonos parciales van por
+    bulk_update, cuyo CASE por fila es caro con miles de cargos.
+    """
+    liquidados = defaultdict(list)
+    parciales = []
+    for cargo in cargos:
+        if cargo.estado == EstadoPago.PAGADO:
+            liquidados[(cargo.fecha_pago, cargo.metodo_pago)].append(cargo.pk)
+        else:
+            parciales.append(cargo)
+    for (fecha_pago, metodo_pago), ids in liquidados.items():
+        for i in range(0, len(ids), TAMANO_LOTE):
+            Pago.objects.filter(pk__in=ids[i:i + TAMANO_LOTE]).update(
+                monto_pagado=F('monto_total'), estado=EstadoPago.PAGADO,
+                fecha_pago=fecha_pago, metodo_pago=metodo_pago, updated_at=ahora,
+            )
+    Pago.objects.bulk_update(parciales, CAMPOS_CARGO, batch_size=TAMANO_LOTE)
+
+
+def _repartir(abono, cargos, ahora):
+    """
+    Reparte el abono sobre `cargos` (ya ordenados) modificándolos en
+    memoria. Devuelve [(cargo, monto), ...].
+    """
+    restante = abono.monto
+    aplicados = []
+    for cargo in cargos:
+        if restante <= 0:
+            break
+        pendiente = cargo.monto_total - cargo.monto_pagado
+        if pendiente <= 0:
+            continue
+        monto = min(restante, pendiente)
+        restante -= monto
+        cargo.monto_pagado += monto
+        cargo.fecha_pago = abono.fecha
+        cargo.metodo_pago = abono.metodo_pago or cargo.metodo_pago
+        cargo.updated_at = ahora
+        if cargo.monto_pagado >= cargo.monto_total:
+            cargo.estado = EstadoPago.PAGADO
+        aplicados.append((cargo, monto))
+    abono.monto_aplicado = abono.monto - restante
+    return aplicados
+
+
+def asignar_folios(abonos):
+    """
+    Da número de recibo a los abonos que aún no lo tienen. Hay que llamarlo
+    fuera de cualquier transacción.
+    """
+    for abono in abonos:
+        if not abono.numero_recibo:
+            abono.numero_recibo = folios.numero_recibo('INGRESO')
+
+
+def aplicar(abonos, objetivos=None):
+    """
+    Guarda y aplica una lista de Abono sin guardar (residente, monto, fecha y
+    opcionalmente metodo_pago y referencia). Varios abonos del mismo
+    residente se aplican en el orden de la lista. `objetivos` (paralela a
+    `abonos`, con ids de Pago o None) indica un cargo que se paga primero,
+    antes del orden por antigüedad. Devuelve los abonos; cada uno trae en
+    `aplicaciones_nuevas` las AplicacionAbono creadas.
+    """
+    objetivos = objetivos or [None] * len(abonos)
+    for abono in abonos:
+        if abono.residente_id is None:
+            raise AbonoInvalido("El abono debe tener un residente.")
+        abono.monto = Decimal(str(abono.monto))
+        if abono.monto <= 0:
+            raise AbonoInvalido("El monto del abono debe ser mayor a cero.")
+        abono.fecha = abono.fecha or timezone.localdate()
+    # Los folios se piden antes de abrir la transacción (ver folios._reservar_bloque);
+    # quien llama a aplicar() desde su propia transacción los asigna antes con asignar_folios().
+    asignar_folios(abonos)
+
+    residentes = {a.residente_id for a in abonos}
+    with transaction.atomic():
+        cargos = defaultdict(list)
+        for cargo in (
+            Pago.objects.select_for_update()
+            .filter(
+                residente_id__in=residentes,
+                tipo_movimiento='INGRESO',
+                estado__in=saldos.ESTADOS_ADEUDO,
+            )
+            .order_by('fecha_emision', 'id')
+        ):
+            cargos[cargo.residente_id].append(cargo)
+
+        # Cubetas del resumen financiero de cada cargo antes de tocarlo
+        cubetas_previas = {
+            c.pk: resumen_financiero.cubetas(_valores_resumen(c))
+            for lista in cargos.values() for c in lista
+        }
+
+        ahora = timezone.now()
+        modificados = {}
+        repartos = []
+        for abono, objetivo in zip(abonos, objetivos):
+            lista = cargos[abono.residente_id]
+            if objetivo is not None:
+                lista = sorted(lista, key=lambda c: c.pk != objetivo)
+            aplicados = _repartir(abono, lista, ahora)
+            modificados.update((c.pk, c) for c, _ in aplicados)
+            repartos.append(aplicados)
+
+        _guardar_cargos(modificados.values(), ahora)
+        Abono.objects.bulk_create(abonos, batch_size=TAMANO_LOTE)
+        if any(a.pk is None for a in abonos):
+            # MySQL no devuelve los ids de bulk_create: se recuperan por el folio, que es único.
+            ids = dict(
+                Abono.objects.filter(numero_recibo__in=[a.numero_recibo for a in abonos])
+                .values_list('numero_recibo', 'pk')
+            )
+            for abono in abonos:
+                abono.pk = ids[abono.numero_recibo]
+
+        aplicaciones = []
+        for abono, aplicados in zip(abonos, repartos):
+            abono.aplicaciones_nuevas = [
+                AplicacionAbono(abono=abono, pago=cargo, monto=monto) for cargo, monto in aplicados
+            ]
+            aplicaciones.extend(abono.aplicaciones_nuevas)
+        AplicacionAbono.objects.bulk_create(aplicaciones, batch_size=TAMANO_LOTE)
+
+        liquidados = [c for c in modificados.values() if c.estado == EstadoPago.PAGADO]
+        saldos.recalcular(residentes)
+        afectadas = set()
+        for cargo in modificados.values():
+            afectadas |= cubetas_previas[cargo.pk] | resumen_financiero.cubetas(_valores_resumen(cargo))
+        resumen_financiero.recalcular(afectadas)
+        agregados.tras_escritura_masiva(
+            'Pago',
+            cuotas_pendientes=-len(liquidados),
+            total_ingresos=sum((c.monto_pagado for c in liquidados), Decimal('0')),
+        )
+    return abonos
+
+
+def abonar(residente, monto, fecha=None, metodo_pago=None, referencia=None):
+    """
+    Atajo para un solo abono.
+    """
+    abono = Abono(
+        residente=residente, monto=monto, fecha=fecha,
+        metodo_pago=metodo_pago, referencia=referencia or None,
+    )
+    return aplicar([abono])[0]
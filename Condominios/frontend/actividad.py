@@ -0,0 +1,52 @@
+from .models import Actividad, Pago, Ticket, ControlAcceso, Reserva, Reunion
+
+
+def _titular_pago(p):
+    if p.residente:
+        return p.residente.nombre_completo, p.residente.unidad_principal
+    if p.empleado:
+        return p.empleado.nombre_completo, "Staff"
+    if p.proveedor:
+        return p.proveedor.nombre_empresa, "Proveedor"
+    return "Sistema", "-"
+
+
+def _residente(obj):
+    if obj.residente_id and obj.residente:
+        return obj.residente.nombre_completo, obj.residente.unidad_principal
+    return "Desconocido", "-"
+
+
+def describir(instance):
+    """
+    Traduce un registro recién creado a los campos de una fila de Actividad.
+    Devuelve None si el modelo no genera eventos.
+    """
+    if isinstance(instance, Pago):
+        nom, uni = _titular_pago(instance)
+        return dict(tipo='pago', evento='Pago registrado',
+                    detalle=f"${instance.monto_pagado}", usuario=nom, unidad=uni)
+    if isinstance(instance, Ticket):
+        nom, uni = _residente(instance)
+        return dict(tipo='ticket', evento='Ticket creado',
+                    detalle=instance.asunto or '', usuario=nom, unidad=uni)
+    if isinstance(instance, ControlAcceso):
+        _, uni = _residente(instance)
+        return dict(tipo='acceso', evento='Ingreso registrado',
+                    detalle=instance.tipo_visitante or '', usuario=instance.nombre_visitante, unidad=uni)
+    if isinstance(instance, Reserva):
+        nom, uni = _residente(instance)
+        return dict(tipo='reserva', evento='Reserva creada',
+                    detalle=f"{instance.area.nombre} {instance.fecha_reserva}", usuario=nom, unidad=uni)
+    if isinstance(instance, Reunion):
+        return dict(tipo='reunion', evento='Asamblea programada',
+                    detalle=instance.titulo, usuario='Administración', unidad='-')
+    return None
+
+
+def registrar(instance):
+    datos = describir(instance)
+    if datos is None:
+        return None
+    datos['detalle'] = str(datos['detalle'])[:255]
+    return Actividad.objects.create(objeto_id=instance.pk, **datos)
@@ -1,3 +1,28 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from . import facturacion
+from .models import Residente, HistorialLog
+
+
+@admin.register(Residente)
+class ResidenteAdmin(admin.ModelAdmin):
+    list_display = ('nombre_completo', 'unidad_principal', 'tipo_residente', 'estado')
+    list_filter = ('estado', 'tipo_residente')
+    search_fields = ('unidad_principal', 'nombre_completo', 'dni')
+    actions = ['generar_cuota_mes_actual']
+
+    @admin.action(description="Generar la cuota de mantenimiento del mes en curso")
+    def generar_cuota_mes_actual(self, request, queryset):
+        periodo = facturacion.periodo_actual()
+        resultado = facturacion.generar_cuotas(periodo, residentes=queryset)
+        if resultado['creadas']:
+            HistorialLog.objects.create(
+                usuario=request.user, accion='CREACION', modulo='Pagos',
+                descripcion=f"Facturación {periodo:%Y-%m}: {resultado['creadas']} cuotas generadas",
+            )
+        self.message_user(
+            request,
+            f"{resultado['creadas']} cuotas creadas, {resultado['existentes']} ya existían "
+            f"(sólo se facturan residentes activos).",
+            messages.SUCCESS,
+        )
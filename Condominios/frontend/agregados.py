@@ -0,0 +1,15 @@
+from . import cache_fragmentos, indicadores
+
+
+def tras_escritura_masiva(nombre_modelo, kpis_a_recalcular=(), **deltas_kpi):
+    """
+    bulk_create() y QuerySet.update() no disparan las señales de
+    frontend.signals. Quien escribe en bloque llama a esto una vez al final
+    para aplicar lo que habrían hecho: sumar los deltas a los KPIs (o
+    recalcular desde las tablas los de `kpis_a_recalcular`, si no conoce el
+    delta exacto) e invalidar los fragmentos cacheados que dependen del modelo.
+    """
+    indicadores.aplicar_delta(**deltas_kpi)
+    if kpis_a_recalcular:
+        indicadores.recalcular_campos(*kpis_a_recalcular)
+    cache_fragmentos.invalidar(nombre_modelo)
@@ -8,12 +8,16 @@ from django.views.decorators.http import require_GET, require_http_methods
 from django.db import transaction
 from django.db.models import F
 from django.urls import reverse # Necesario para redireccionar
-from .models import Documento, Residente # Asegúrate de que Documento y Residente existan
+from .models import Documento, Residente, Actividad # Asegúrate de que Documento y Residente existan
+from .condicional import condicional
+from .paginacion import pagina_keyset
+from . import busqueda_residentes
 
 # --- VISTAS DE DOCUMENTOS ---
 
 @login_required
 @require_GET
+@condicional(lambda request: [Documento.objects.all()])
 def api_documentos_list(request: HttpRequest):
     """
     GET /api/documentos/
@@ -48,7 +52,7 @@ def api_documento_marcar_descarga(request: HttpRequest, pk: int):
             doc = Documento.objects.select_for_update().get(pk=pk)
             # F() realiza la operación directamente en la BD (evita race conditions)
             doc.descargas = F("descargas") + 1
-            doc.save(update_fields=['descargas']) 
+            doc.save(update_fields=['descargas', 'updated_at'])
             doc.refresh_from_db()
 
         data = {
@@ -62,6 +66,41 @@ def api_documento_marcar_descarga(request: HttpRequest, pk: int):
     except Exception as e:
         return JsonResponse({"detail": f"Error en la operación: {str(e)}"}, status=500)
 
+# --- ACTIVIDAD RECIENTE ---
+
+ACTIVIDAD_LIMITE = 20
+ACTIVIDAD_LIMITE_MAX = 100
+
+
+@login_required
+@require_GET
+def api_actividad_list(request: HttpRequest):
+    """
+    GET /api/actividad/?cursor=<cursor>&limite=<n>
+    Feed de actividad de todos los módulos, paginado por cursor (fecha, id).
+    """
+    try:
+        limite = min(int(request.GET.get("limite", ACTIVIDAD_LIMITE)), ACTIVIDAD_LIMITE_MAX)
+    except ValueError:
+        limite = ACTIVIDAD_LIMITE
+    limite = max(limite, 1)
+
+    filas, siguiente = pagina_keyset(Actividad.objects.all(), request.GET.get("cursor"), limite)
+    data = [
+        {
+            "id": a.id,
+            "tipo": a.tipo,
+            "evento": a.evento,
+            "detalle": a.detalle,
+            "usuario": a.usuario,
+            "unidad": a.unidad,
+            "fecha": a.fecha.isoformat(),
+        }
+        for a in filas
+    ]
+    return JsonResponse({"results": data, "siguiente": siguiente})
+
+
 # --- VISTAS DE RESIDENTES ---
 
 @login_required
@@ -132,6 +171,48 @@ def api_residentes_create(request: HttpRequest):
     }
     return JsonResponse(data, status=201)
 
+AUTOCOMPLETADO_LIMITE = 10
+AUTOCOMPLETADO_LIMITE_MAX = 50
+
+
+@login_required
+@require_GET
+def api_residentes_buscar(request: HttpRequest):
+    """
+    GET /api/residentes/buscar/?q=<texto>&limite=<n>
+    Autocompletado: residentes activos cuya unidad o nombre empieza con q.
+    """
+    q = (request.GET.get("q") or "").strip()
+    try:
+        limite = min(int(request.GET.get("limite", AUTOCOMPLETADO_LIMITE)), AUTOCOMPLETADO_LIMITE_MAX)
+    except ValueError:
+        limite = AUTOCOMPLETADO_LIMITE
+    if not q or limite <= 0:
+        return JsonResponse({"results": []})
+
+    campos = ("id", "unidad_principal", "nombre_completo")
+    activos = Residente.objects.filter(estado=Residente.ACTIVO)
+
+    # Primero la unidad por prefijo (índice estado+unidad); después nombre,
+    # DNI o correo por trigramas, sin acentos y con tolerancia a errores.
+    data = list(
+        activos.filter(unidad_principal__istartswith=q)
+        .order_by("unidad_principal")
+        .values(*campos)[:limite]
+    )
+    encontrados = busqueda_residentes.coincidencias(q)
+    if len(data) < limite and encontrados is not None:
+        vistos = {r["id"] for r in data}
+        ids = [
+            c["residente"]
+            for c in encontrados.filter(residente__estado=Residente.ACTIVO)[:limite]
+            if c["residente"] not in vistos
+        ]
+        por_id = {r["id"]: r for r in activos.filter(pk__in=ids).values(*campos)}
+        data.extend(por_id[i] for i in ids if i in por_id)
+    return JsonResponse({"results": data[:limite]})
+
+
 # --- VISTAS DE DETALLE Y EDICIÓN (para el CRUD del HTML) ---
 
 @login_required
@@ -0,0 +1,136 @@
+"""
+Asignación automática de tickets.
+
+Cada tipo de solicitud lo atienden ciertos puestos de empleado o tipos de
+servicio de proveedor (settings.ASIGNACION_TICKETS). Entre los candidatos
+se elige al que tiene menos tickets abiertos. La carga de todos sale de una
+sola consulta agregada y se actualiza en memoria mientras se reparte el
+lote, así una racha de quejas se reparte pareja en vez de caerle a uno.
+"""
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import agregados
+from .models import Empleado, Prioridad, Proveedor, Ticket
+from .normalizacion import normalizar
+
+TAMANO_LOTE = 1000
+ESTADO_CERRADO = 'CERRADO'
+TIPO_POR_DEFECTO = 'otro'
+# Primero lo urgente y, dentro de cada prioridad, lo más antiguo.
+ORDEN_PRIORIDAD = {p: i for i, p in enumerate(reversed(Prioridad.values))}
+
+
+def cargas():
+    """
+    {('e', empleado_id) | ('p', proveedor_id): tickets abiertos}, en una
+    sola consulta agregada.
+    """
+    carga = Counter()
+    for fila in (
+        Ticket.objects.exclude(estado=ESTADO_CERRADO)
+        .filter(Q(empleado_asignado__isnull=False) | Q(proveedor_asignado__isnull=False))
+        .values('empleado_asignado_id', 'proveedor_asignado_id')
+        .annotate(abiertos=Count('id'))
+        .order_by()
+    ):
+        if fila['empleado_asignado_id']:
+            carga[('e', fila['empleado_asignado_id'])] += fila['abiertos']
+        else:
+            carga[('p', fila['proveedor_asignado_id'])] += fila['abiertos']
+    return carga
+
+
+class Asignador:
+    """
+    Personal activo agrupado por puesto / servicio y su carga actual. Se
+    arma una vez por lote; elegir() suma el ticket a la carga del elegido.
+    """
+
+    def __init__(self):
+        self.reglas = {
+            normalizar(tipo): (
+                {normalizar(p) for p in regla.get('puestos', ())},
+                {normalizar(s) for s in regla.get('servicios', ())},
+            )
+            for tipo, regla in settings.ASIGNACION_TICKETS.items()
+        }
+        self.por_puesto = defaultdict(list)
+        for pk, puesto in Empleado.objects.filter(estado='ACTIVO').values_list('pk', 'puesto'):
+            self.por_puesto[normalizar(puesto)].append(('e', pk))
+        self.por_servicio = defaultdict(list)
+        for pk, servicio in Proveedor.objects.filter(estado='ACTIVO').values_list('pk', 'tipo_servicio'):
+            self.por_servicio[normalizar(servicio)].append(('p', pk))
+        self.carga = cargas()
+        self._candidatos = {}
+
+    def candidatos(self, tipo_solicitud):
+        clave = normalizar(tipo_solicitud)
+        if clave not in self.reglas:
+            clave = TIPO_POR_DEFECTO
+        if clave not in self._candidatos:
+            puestos, servicios = self.reglas.get(clave, ((), ()))
+            empleados = [c for p in puestos for c in self.por_puesto[p]]
+            self._candidatos[clave] = empleados or [c for s in servicios for c in self.por_servicio[s]]
+        return self._candidatos[clave]
+
+    def elegir(self, tipo_solicitud):
+        """
+        ('e', id) o ('p', id) del candidato con menos tickets abiertos (a
+        igual carga, el de id menor), o None si nadie atiende ese tipo.
+        """
+        candidatos = self.candidatos(tipo_solicitud)
+        if not candidatos:
+            return None
+        elegido = min(candidatos, key=lambda c: (self.carga[c], c))
+        self.carga[elegido] += 1
+        return elegido
+
+
+def asignar(tickets=None):
+    """
+    Asigna los tickets abiertos y sin responsable de `tickets` (por defecto,
+    todos): un UPDATE por responsable, condicionado a que el ticket siga sin
+    asignar para no pisar una asignación manual hecha mientras tanto.
+    Devuelve {'asignados': n, 'sin_candidato': n}.
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    pendientes = sorted(
+        tickets.filter(empleado_asignado__isnull=True, proveedor_asignado__isnull=True)
+        .exclude(estado=ESTADO_CERRADO)
+        .values_list('pk', 'tipo_solicitud', 'prioridad', 'fecha_creacion'),
+        key=lambda t: (ORDEN_PRIORIDAD.get(t[2], len(ORDEN_PRIORIDAD)), t[3], t[0]),
+    )
+    if not pendientes:
+        return {'asignados': 0, 'sin_candidato': 0}
+
+    asignador = Asignador()
+    por_responsable = defaultdict(list)
+    sin_candidato = 0
+    for pk, tipo, _, _ in pendientes:
+        elegido = asignador.elegir(tipo)
+        if elegido is None:
+            sin_candidato += 1
+        else:
+            por_responsable[elegido].append(pk)
+
+    ahora = timezone.now()
+    asignados = 0
+    with transaction.atomic():
+        for (clase, responsable), ids in por_responsable.items():
+            campo = 'empleado_asignado_id' if clase == 'e' else 'proveedor_asignado_id'
+            for i in range(0, len(ids), TAMANO_LOTE):
+                asignados += Ticket.objects.filter(
+                    pk__in=ids[i:i + TAMANO_LOTE],
+                    empleado_asignado__isnull=True,
+                    proveedor_asignado__isnull=True,
+                ).update(**{campo: responsable, 'updated_at': ahora})
+    if asignados:
+        # La asignación no cambia ningún KPI, sólo los fragmentos cacheados.
+        agregados.tras_escritura_masiva('Ticket')
+    return {'asignados': asignados, 'sin_candidato': sin_candidato}
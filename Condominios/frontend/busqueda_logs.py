@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import HistorialLog, HistorialLogToken
+from .normalizacion import normalizar
+
+# Palabras más cortas que esto no entran al índice FULLTEXT de InnoDB
+# (innodb_ft_min_token_size = 3 por defecto).
+LARGO_MINIMO_FULLTEXT = 3
+LARGO_MAXIMO_TOKEN = 50
+
+
+def usa_fulltext():
+    return connection.vendor == 'mysql'
+
+
+def tokenizar(texto):
+    """
+    Minúsculas, sin acentos y partido en palabras (sin repetir, en orden).
+    """
+    tokens = []
+    for palabra in normalizar(texto).split():
+        palabra = palabra[:LARGO_MAXIMO_TOKEN]
+        if len(palabra) >= 2 and palabra not in tokens:
+            tokens.append(palabra)
+    return tokens
+
+
+def indexar(log):
+    """
+    Guarda los tokens de un log en el índice invertido (sólo sin FULLTEXT).
+    """
+    if usa_fulltext():
+        return
+    HistorialLogToken.objects.bulk_create([
+        HistorialLogToken(log=log, token=t)
+        for t in tokenizar(f"{log.descripcion} {log.modulo}")
+    ])
+
+
+def _ids_por_texto(tokens):
+    if usa_fulltext():
+        consulta = ' '.join(f'+{t}*' for t in tokens)
+        return HistorialLog.objects.filter(
+            id__in=RawSQL(
+                f"SELECT id FROM {HistorialLog._meta.db_table} "
+                "WHERE MATCH (descripcion, modulo) AGAINST (%s IN BOOLEAN MODE)",
+                [consulta],
+            )
+        ).values('id')
+
+    ids = HistorialLog.objects.all()
+    for t in tokens:
+        ids = ids.filter(id__in=HistorialLogToken.objects.filter(token__startswith=t).values('log_id'))
+    return ids.values('id')
+
+
+def buscar(qs, texto):
+    """
+    Filtra `qs` (HistorialLog) por texto libre: todas las palabras deben
+    aparecer (por prefijo) en descripción/módulo, o el texto debe ser el
+    inicio del nombre de usuario.
+
+    En MySQL las palabras de menos de LARGO_MINIMO_FULLTEXT letras no están en
+    el índice: se buscan con LIKE sólo entre las filas que ya encontró el
+    FULLTEXT. Si todas son cortas, el texto sólo se busca en el nombre de usuario.
+    """
+    texto = (texto or '').strip()
+    if not texto:
+        return qs
+
+    tokens = tokenizar(texto)
+    cortos = []
+    if usa_fulltext():
+        cortos = [t for t in tokens if len(t) < LARGO_MINIMO_FULLTEXT]
+        tokens = [t for t in tokens if len(t) >= LARGO_MINIMO_FULLTEXT]
+
+    filtro = Q(pk__in=[])
+    if tokens:
+        ids = _ids_por_texto(tokens)
+        for t in cortos:
+            ids = ids.filter(Q(descripcion__icontains=t) | Q(modulo__icontains=t))
+        filtro |= Q(pk__in=ids)
+
+    usuarios = list(User.objects.filter(username__istartswith=texto).values_list('id', flat=True)[:50])
+    if usuarios:
+        filtro |= Q(usuario_id__in=usuarios)
+    return qs.filter(filtro)
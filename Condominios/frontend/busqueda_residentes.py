@@ -0,0 +1,80 @@
+import math
+
+from django.db import connection
+from django.db.models import Count
+
+from .models import ResidenteTrigrama
+from .normalizacion import normalizar, trigramas
+
+# Fracción de los trigramas de la búsqueda que debe tener un residente para
+# considerarse coincidencia. Menos de 1 tolera errores de dedo ("Mria" -> "María").
+SIMILITUD_MINIMA = 0.6
+
+TAMANO_LOTE_TRIGRAMAS = 5000
+
+
+def indexar(residente):
+    """
+    Reemplaza los trigramas del residente por los de su clave de búsqueda.
+    """
+    ResidenteTrigrama.objects.filter(residente=residente).delete()
+    ResidenteTrigrama.objects.bulk_create([
+        ResidenteTrigrama(residente=residente, trigrama=t)
+        for t in trigramas(residente.busqueda)
+    ])
+
+
+def indexar_lote(residentes):
+    """
+    Igual que indexar() para muchos residentes (importaciones, cambios
+    masivos). Son ~40 trigramas por residente, así que se insertan con
+    executemany en vez de instanciar un objeto del ORM por fila.
+    """
+    residentes = list(residentes)
+    ResidenteTrigrama.objects.filter(residente__in=[r.pk for r in residentes]).delete()
+    filas = [(r.pk, t) for r in residentes for t in trigramas(r.busqueda)]
+    if not filas:
+        return
+    meta = ResidenteTrigrama._meta
+    qn = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {qn(meta.db_table)} "
+        f"({qn(meta.get_field('residente').column)}, {qn(meta.get_field('trigrama').column)}) "
+        "VALUES (%s, %s)"
+    )
+    with connection.cursor() as cursor:
+        for i in range(0, len(filas), TAMANO_LOTE_TRIGRAMAS):
+            cursor.executemany(sql, filas[i:i + TAMANO_LOTE_TRIGRAMAS])
+
+
+def coincidencias(texto):
+    """
+    {residente: id, puntos: trigramas en común} de los residentes que se
+    parecen a `texto`, mejor puntuados primero. None si el texto no tiene
+    nada buscable.
+    """
+    buscados = trigramas(normalizar(texto))
+    if not buscados:
+        return None
+    minimo = max(1, math.ceil(len(buscados) * SIMILITUD_MINIMA))
+    return (
+        ResidenteTrigrama.objects.filter(trigrama__in=buscados)
+        .values('residente')
+        .annotate(puntos=Count('id'))
+        .filter(puntos__gte=minimo)
+        .order_by('-puntos')
+    )
+
+
+def buscar(qs, texto):
+    """
+    Filtra `qs` (Residente) a los que coinciden con `texto` por nombre, DNI,
+    unidad o correo, sin distinguir acentos y tolerando errores de dedo.
+    """
+    texto = (texto or '').strip()
+    if not texto:
+        return qs
+    encontrados = coincidencias(texto)
+    if encontrados is None:
+        return qs.none()
+    return qs.filter(pk__in=encontrados.values('residente'))
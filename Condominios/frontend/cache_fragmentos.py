@@ -0,0 +1,69 @@
+import time
+
+from django.core.cache import cache
+
+PREFIJO = 'fragmentos:version:'
+
+# Sección del dashboard -> modelos cuyos cambios la invalidan.
+# Cada modelo tiene un contador de versión que se incrementa al escribir
+# (ver frontend.signals), y la llave del fragmento incluye esas versiones.
+SECCIONES = {
+    'residentes': ('Residente',),
+    'pagos': ('Pago', 'Residente'),
+    'tickets': ('Ticket', 'Residente'),
+    'personal': ('Empleado', 'Proveedor'),
+    'reuniones': ('Reunion',),
+    'seguridad': ('ControlAcceso', 'Residente'),
+    'areas': ('AreaComun', 'Reserva', 'Residente'),
+    'documentacion': ('Documento',),
+    'usuarios': ('User',),
+    'logs': ('HistorialLog',),
+}
+
+MODELOS_VERSIONADOS = sorted({m for modelos in SECCIONES.values() for m in modelos})
+
+# Modelos versionados que no son de la app frontend
+APP_DEL_MODELO = {'User': 'auth'}
+
+
+def _version_inicial():
+    # Si la llave de versión se pierde (expulsión de la caché) no debe volver a
+    # un número ya usado: los fragmentos viejos con esa versión seguirían ahí.
+    return time.time_ns()
+
+
+def _llave(nombre_modelo):
+    return f"{PREFIJO}{nombre_modelo}"
+
+
+def invalidar(*nombres_modelo):
+    """
+    Incrementa la versión de los modelos indicados; los fragmentos que
+    dependen de ellos dejan de encontrarse en caché.
+    """
+    for nombre in nombres_modelo:
+        llave = _llave(nombre)
+        if cache.add(llave, _version_inicial(), timeout=None):
+            continue
+        try:
+            cache.incr(llave)
+        except ValueError:
+            # La llave expiró entre add() e incr()
+            cache.set(llave, _version_inicial(), timeout=None)
+
+
+def versiones_secciones():
+    """
+    Devuelve {seccion: 'v1.v2...'} leyendo todas las versiones con un solo get_many.
+    """
+    llaves = [_llave(nombre) for nombre in MODELOS_VERSIONADOS]
+    guardadas = cache.get_many(llaves)
+    faltantes = {llave: _version_inicial() for llave in llaves if llave not in guardadas}
+    if faltantes:
+        cache.set_many(faltantes, timeout=None)
+        guardadas.update(faltantes)
+
+    return {
+        seccion: '.'.join(str(guardadas[_llave(nombre)]) for nombre in modelos)
+        for seccion, modelos in SECCIONES.items()
+    }
@@ -0,0 +1,312 @@
+"""
+Conciliación de estados de cuenta bancarios contra los cargos abiertos.
+
+Se lee el CSV del banco, se guardan los depósitos (MovimientoBancario) y se
+arma en memoria un índice hash {(saldo pendiente, referencia): cargos} con
+los cargos INGRESO abiertos cuyo saldo coincide con algún depósito. Cada
+depósito se busca en el índice con las palabras de su referencia y
+concepto, y se queda con los cargos dentro de CONCILIACION_VENTANA_DIAS de
+su fecha:
+
+- un solo residente posible: se paga su cargo más antiguo que coincide;
+- varios residentes: queda EN REVISIÓN para que alguien elija;
+- ninguno: SIN COINCIDENCIA.
+
+Los pagos se registran como abonos (frontend/abonos.py), todos en una
+sola transacción.
+"""
+import csv
+import hashlib
+import io
+from collections import Counter, defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from . import abonos, saldos
+from .models import Abono, MovimientoBancario, EstadoMovimiento, Pago
+from .normalizacion import normalizar
+
+TAMANO_LOTE = 1000
+PALABRAS_POR_CLAVE = 3
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y')
+LARGO_REFERENCIA = MovimientoBancario._meta.get_field('referencia').max_length
+LARGO_DESCRIPCION = MovimientoBancario._meta.get_field('descripcion').max_length
+
+# Encabezado normalizado -> campo
+COLUMNAS = {
+    'fecha': 'fecha',
+    'fecha operacion': 'fecha',
+    'monto': 'monto',
+    'importe': 'monto',
+    'deposito': 'monto',
+    'depositos': 'monto',
+    'abono': 'monto',
+    'abonos': 'monto',
+    'referencia': 'referencia',
+    'ref': 'referencia',
+    'descripcion': 'descripcion',
+    'concepto': 'descripcion',
+}
+
+
+class EstadoCuentaInvalido(Exception):
+    pass
+
+
+def _fecha(texto):
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    return None
+
+
+def _monto(texto):
+    try:
+        return Decimal(texto.replace('$', '').replace(',', '').strip())
+    except InvalidOperation:
+        return None
+
+
+def leer_movimientos(archivo):
+    """
+    Lee un CSV (archivo binario) con columnas fecha, monto, referencia y
+    concepto. Devuelve ([MovimientoBancario sin guardar], [(fila, error)]).
+    Los cargos (montos negativos o cero) se omiten.
+    """
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    muestra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+    except csv.Error:
+        dialecto = csv.excel
+    filas = csv.reader(texto, dialecto)
+
+    try:
+        campos = [COLUMNAS.get(normalizar(e)) for e in next(filas)]
+    except StopIteration:
+        raise EstadoCuentaInvalido("El archivo está vacío.")
+    if 'fecha' not in campos or 'monto' not in campos:
+        raise EstadoCuentaInvalido("El estado de cuenta debe tener al menos las columnas 'fecha' y 'monto'.")
+
+    movimientos, errores = [], []
+    repetidas = Counter()
+    for numero, valores in enumerate(filas, start=2):
+        fila = {c: v.strip() for c, v in zip(campos, valores) if c}
+        if not any(fila.values()):
+            continue
+        fecha = _fecha(fila.get('fecha', ''))
+        monto = _monto(fila.get('monto', ''))
+        if fecha is None:
+            errores.append((numero, f"Fecha inválida: {fila.get('fecha', '')}."))
+            continue
+        if monto is None:
+            errores.append((numero, f"Monto inválido: {fila.get('monto', '')}."))
+            continue
+        if monto <= 0:
+            continue
+
+        referencia = fila.get('referencia', '')[:LARGO_REFERENCIA]
+        descripcion = fila.get('descripcion', '')[:LARGO_DESCRIPCION]
+        # Dos depósitos idénticos el mismo día son válidos: se distinguen por ocurrencia.
+        linea = f"{fecha}|{monto}|{referencia}|{descripcion}"
+        repetidas[linea] += 1
+        movimientos.append(MovimientoBancario(
+            fecha=fecha, monto=monto, referencia=referencia, descripcion=descripcion,
+            huella=hashlib.sha1(f"{linea}|{repetidas[linea]}".encode()).hexdigest(),
+        ))
+    return movimientos, errores
+
+
+def claves_referencia(texto):
+    """
+    'DEP CUOTA A-101' -> {'dep', 'cuota', 'a', '101', 'depcuota', 'a101', ...}:
+    cada palabra y cada unión de hasta PALABRAS_POR_CLAVE palabras seguidas,
+    para que 'A-101' o 'A 101' coincidan con la unidad 'A101'.
+    """
+    palabras = normalizar(texto).split()
+    return {
+        ''.join(palabras[i:j])
+        for i in range(len(palabras))
+        for j in range(i + 1, min(i + PALABRAS_POR_CLAVE, len(palabras)) + 1)
+    }
+
+
+def _indice(montos):
+    """
+    {(saldo pendiente, referencia): [cargo, ...]} con los cargos abiertos
+    cuyo saldo es alguno de `montos`. Las referencias de un cargo son la
+    unidad y el DNI de su residente, sin espacios ni signos.
+    """
+    indice = defaultdict(list)
+    cargos = (
+        Pago.objects.filter(
+            tipo_movimiento='INGRESO',
+            estado__in=saldos.ESTADOS_ADEUDO,
+            residente__isnull=False,
+        )
+        .annotate(pendiente=F('monto_total') - F('monto_pagado'))
+        .filter(pendiente__in=list(montos))
+        .values('pk', 'residente_id', 'pendiente', 'fecha_emision',
+                'residente__unidad_principal', 'residente__dni')
+        .order_by('fecha_emision', 'pk')
+    )
+    claves = {}  # un residente suele tener varios cargos: se normaliza una vez
+    for cargo in cargos:
+        rid = cargo['residente_id']
+        if rid not in claves:
+            claves[rid] = {
+                ''.join(normalizar(referencia or '').split())
+                for referencia in (cargo['residente__unidad_principal'], cargo['residente__dni'])
+            } - {''}
+        for clave in claves[rid]:
+            indice[(cargo['pendiente'], clave)].append(cargo)
+    return indice
+
+
+def _candidatos(movimiento, indice):
+    ventana = settings.CONCILIACION_VENTANA_DIAS
+    encontrados = {}
+    for clave in claves_referencia(f"{movimiento.referencia} {movimiento.descripcion}"):
+        for cargo in indice.get((movimiento.monto, clave), ()):
+            if abs((movimiento.fecha - cargo['fecha_emision']).days) <= ventana:
+                encontrados[cargo['pk']] = cargo
+    return sorted(encontrados.values(), key=lambda c: (c['fecha_emision'], c['pk']))
+
+
+def _abono(movimiento, residente_id):
+    return Abono(
+        residente_id=residente_id,
+        monto=movimiento.monto,
+        fecha=movimiento.fecha,
+        metodo_pago='TRANSFERENCIA',
+        referencia=movimiento.referencia or None,
+    )
+
+
+def _guardar_movimientos(movimientos):
+    """
+    Los no conciliados sólo cambian de estado: un UPDATE por estado. Los
+    conciliados llevan su pago y abono, con un executemany (bulk_update arma
+    un CASE por fila que con miles de movimientos tarda segundos).
+    """
+    por_estado = defaultdict(list)
+    for m in movimientos:
+        if m.estado != EstadoMovimiento.CONCILIADO:
+            por_estado[m.estado].append(m.pk)
+    for estado, ids in por_estado.items():
+        for i in range(0, len(ids), TAMANO_LOTE):
+            MovimientoBancario.objects.filter(pk__in=ids[i:i + TAMANO_LOTE]).update(estado=estado)
+
+    filas = [
+        (m.estado, m.pago_id, m.abono.pk, m.pk)
+        for m in movimientos if m.estado == EstadoMovimiento.CONCILIADO
+    ]
+    if not filas:
+        return
+    meta = MovimientoBancario._meta
+    qn = connection.ops.quote_name
+    sql = (
+        f"UPDATE {qn(meta.db_table)} SET {qn(meta.get_field('estado').column)} = %s, "
+        f"{qn(meta.get_field('pago').column)} = %s, {qn(meta.get_field('abono').column)} = %s "
+        f"WHERE {qn(meta.pk.column)} = %s"
+    )
+    with connection.cursor() as cursor:
+        for i in range(0, len(filas), TAMANO_LOTE):
+            cursor.executemany(sql, filas[i:i + TAMANO_LOTE])
+
+
+def conciliar(movimientos):
+    """
+    Concilia movimientos ya guardados. Los que tienen un único residente
+    candidato se pagan (un abono dirigido al cargo) y el resto queda para
+    revisión. Devuelve un Counter por estado.
+    """
+    indice = _indice({m.monto for m in movimientos})
+    tomados = set()
+    nuevos, objetivos, conciliados = [], [], []
+    for movimiento in movimientos:
+        todos = _candidatos(movimiento, indice)
+        candidatos = [c for c in todos if c['pk'] not in tomados]
+        if not todos:
+            movimiento.estado = EstadoMovimiento.SIN_COINCIDENCIA
+        elif len({c['residente_id'] for c in candidatos}) != 1:
+            # Varios residentes posibles, o el cargo ya lo tomó otro depósito (¿duplicado?)
+            movimiento.estado = EstadoMovimiento.REVISION
+        else:
+            elegido = candidatos[0]
+            tomados.add(elegido['pk'])
+            movimiento.estado = EstadoMovimiento.CONCILIADO
+            movimiento.pago_id = elegido['pk']
+            nuevos.append(_abono(movimiento, elegido['residente_id']))
+            objetivos.append(elegido['pk'])
+            conciliados.append(movimiento)
+
+    abonos.asignar_folios(nuevos)
+    with transaction.atomic():
+        if nuevos:
+            abonos.aplicar(nuevos, objetivos)
+        for movimiento, abono in zip(conciliados, nuevos):
+            movimiento.abono = abono
+        _guardar_movimientos(movimientos)
+    return Counter(m.estado for m in movimientos)
+
+
+def importar(archivo):
+    """
+    Lee, guarda y concilia un estado de cuenta. Las líneas que ya se habían
+    importado (misma huella) se ignoran. Devuelve {'leidos', 'nuevos',
+    'conciliados', 'revision', 'sin_coincidencia', 'errores'}.
+    """
+    movimientos, errores = leer_movimientos(archivo)
+    MovimientoBancario.objects.bulk_create(movimientos, ignore_conflicts=True, batch_size=TAMANO_LOTE)
+
+    huellas = [m.huella for m in movimientos]
+    pendientes = []
+    for i in range(0, len(huellas), TAMANO_LOTE):
+        pendientes += MovimientoBancario.objects.filter(
+            huella__in=huellas[i:i + TAMANO_LOTE], estado=EstadoMovimiento.PENDIENTE
+        ).order_by('fecha', 'id')
+    estados = conciliar(pendientes) if pendientes else Counter()
+    return {
+        'leidos': len(movimientos),
+        'nuevos': len(pendientes),
+        'conciliados': estados[EstadoMovimiento.CONCILIADO],
+        'revision': estados[EstadoMovimiento.REVISION],
+        'sin_coincidencia': estados[EstadoMovimiento.SIN_COINCIDENCIA],
+        'errores': errores,
+    }
+
+
+def candidatos_para(movimientos):
+    """
+    {movimiento.pk: [cargos candidatos]} para mostrar la cola de revisión.
+    """
+    indice = _indice({m.monto for m in movimientos})
+    return {m.pk: _candidatos(m, indice) for m in movimientos}
+
+
+def resolver(movimiento_id, pago):
+    """
+    Concilia a mano un movimiento en revisión con el cargo elegido.
+    """
+    if pago.residente_id is None:
+        raise abonos.AbonoInvalido("El cargo elegido no pertenece a un residente.")
+    movimiento = MovimientoBancario.objects.get(pk=movimiento_id)
+    abono = _abono(movimiento, pago.residente_id)
+    abonos.asignar_folios([abono])
+    with transaction.atomic():
+        movimiento = MovimientoBancario.objects.select_for_update().get(pk=movimiento_id)
+        if movimiento.estado == EstadoMovimiento.CONCILIADO:
+            raise abonos.AbonoInvalido("El movimiento ya estaba conciliado.")
+        movimiento.abono = abonos.aplicar([abono], [pago.pk])[0]
+        movimiento.pago = pago
+        movimiento.estado = EstadoMovimiento.CONCILIADO
+        movimiento.save(update_fields=['estado', 'pago', 'abono'])
+    return movimiento
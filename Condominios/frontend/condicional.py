@@ -0,0 +1,62 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+
+def _huella(request, fuentes):
+    """
+    ETag de la petición, o None si no se debe responder 304.
+
+    Sale de un MAX(updated_at) + COUNT(*) por tabla: MAX detecta altas y
+    cambios, COUNT detecta bajas. No se manda Last-Modified porque MAX no
+    cambia con una baja y un cliente que sólo envía If-Modified-Since
+    recibiría 304. El ETag incluye usuario, rol, URL completa y cookie CSRF
+    porque la página depende de ellos aunque las tablas no cambien.
+    """
+    # Importado aquí: views importa este módulo.
+    from .views import obtener_rol
+
+    huella = None
+    # Con mensajes pendientes la página no es la misma que tiene el cliente.
+    if request.method in ('GET', 'HEAD') and not len(messages.get_messages(request)):
+        partes = [
+            request.user.pk,
+            obtener_rol(request.user),
+            request.get_full_path(),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        ]
+        for qs in fuentes(request):
+            datos = qs.aggregate(ultima=Max('updated_at'), total=Count('pk'))
+            partes += [qs.model.__name__, datos['ultima'], datos['total']]
+        huella = hashlib.md5(repr(partes).encode()).hexdigest()
+    return huella
+
+
+def condicional(fuentes):
+    """
+    Decorador de vistas GET: responde 304 Not Modified si ninguna de las
+    tablas de `fuentes(request)` (lista de querysets con `updated_at`)
+    cambió desde la última respuesta que tiene el cliente.
+    """
+    def etag(request, *args, **kwargs):
+        return _huella(request, fuentes)
+
+    def decorador(vista):
+        vista_condicional = condition(etag_func=etag)(vista)
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            respuesta = vista_condicional(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                # Que el navegador siempre revalide, y que ningún caché comparta
+                # la respuesta entre sesiones (el contenido depende del rol).
+                patch_cache_control(respuesta, private=True, no_cache=True)
+                patch_vary_headers(respuesta, ('Cookie',))
+            return respuesta
+        return envoltura
+    return decorador
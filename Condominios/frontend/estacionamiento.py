@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .models import EspacioEstacionamiento
+
+LARGO_CODIGO = EspacioEstacionamiento._meta.get_field('codigo').max_length
+
+
+class EspacioOcupado(Exception):
+    def __init__(self, codigos):
+        self.codigos = sorted(codigos)
+        super().__init__(
+            f"Los espacios de estacionamiento {', '.join(self.codigos)} ya están asignados a otro residente."
+        )
+
+
+def limpiar_codigos(cadena):
+    """
+    'e1, E2 ,,e1' -> ['E1', 'E2'] (mayúsculas, sin vacíos ni repetidos).
+    """
+    codigos = []
+    for raw in (cadena or '').split(','):
+        c = raw.strip().upper()
+        if c and c not in codigos:
+            codigos.append(c)
+    return codigos
+
+
+def ocupados(codigos, residente=None):
+    """
+    Códigos que ya tiene asignados otro residente (una consulta por índice único).
+    """
+    if not codigos:
+        return []
+    qs = EspacioEstacionamiento.objects.filter(codigo__in=codigos, residente__isnull=False)
+    if residente is not None:
+        qs = qs.exclude(residente=residente)
+    return sorted(qs.values_list('codigo', flat=True))
+
+
+@transaction.atomic
+def asignar(residente, codigos):
+    """
+    Deja al residente exactamente con los cajones `codigos`.
+
+    El reclamo es un UPDATE condicionado a que el cajón esté libre (o ya sea
+    suyo): si dos escrituras compiten por el mismo cajón, la segunda no lo
+    actualiza y se lanza EspacioOcupado, deshaciendo la transacción.
+    Actualiza también el texto residente.espacios_estacionamiento (sin guardar).
+    """
+    codigos = list(codigos)
+    largos = [c for c in codigos if len(c) > LARGO_CODIGO]
+    if largos:
+        raise ValueError(f"Código de estacionamiento demasiado largo: {largos[0]}")
+
+    if codigos:
+        EspacioEstacionamiento.objects.bulk_create(
+            [EspacioEstacionamiento(codigo=c) for c in codigos],
+            ignore_conflicts=True,
+        )
+        reclamados = EspacioEstacionamiento.objects.filter(
+            Q(residente__isnull=True) | Q(residente=residente),
+            codigo__in=codigos,
+        ).update(residente=residente)
+        if reclamados < len(codigos):
+            raise EspacioOcupado(ocupados(codigos, residente))
+
+    EspacioEstacionamiento.objects.filter(residente=residente).exclude(
+        codigo__in=codigos
+    ).update(residente=None)
+    residente.espacios_estacionamiento = ', '.join(codigos) or None
@@ -0,0 +1,119 @@
+"""
+Generación de cuotas de mantenimiento por periodo y vencimiento de cobros.
+
+Idempotente: la restricción única (residente, periodo, categoría) de Pago
+hace que volver a correr el mismo periodo sólo cree lo que falte.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import agregados, resumen_financiero, saldos
+from .models import Pago, Residente, EstadoPago
+
+TAMANO_LOTE = 1000
+
+MESES = [
+    'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+    'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre',
+]
+
+
+def periodo_desde_texto(texto):
+    """
+    'AAAA-MM' -> date(AAAA, MM, 1). Lanza ValueError si no es válido.
+    """
+    anio, mes = texto.strip().split('-')
+    return date(int(anio), int(mes), 1)
+
+
+def periodo_actual():
+    return timezone.localdate().replace(day=1)
+
+
+def generar_cuotas(periodo, monto=None, categoria=None, residentes=None, tamano_lote=TAMANO_LOTE):
+    """
+    Crea una cuota PENDIENTE del periodo para cada residente activo (o sólo
+    los activos de `residentes`) que aún no la tenga. Un bulk_create por lote.
+    Devuelve {'creadas': n, 'existentes': n}.
+    """
+    periodo = periodo.replace(day=1)
+    monto = Decimal(str(monto if monto is not None else settings.CUOTA_MANTENIMIENTO_MONTO))
+    categoria = categoria or settings.CUOTA_MANTENIMIENTO_CATEGORIA
+    descripcion = f"Cuota de mantenimiento {MESES[periodo.month - 1]} {periodo.year}"
+
+    if residentes is None:
+        residentes = Residente.objects.all()
+    ids = list(
+        residentes.filter(estado=Residente.ACTIVO).order_by('pk').values_list('pk', flat=True)
+    )
+
+    creadas = existentes = 0
+    for i in range(0, len(ids), tamano_lote):
+        lote = ids[i:i + tamano_lote]
+        ya_facturados = set(
+            Pago.objects.filter(residente_id__in=lote, periodo=periodo, categoria=categoria)
+            .values_list('residente_id', flat=True)
+        )
+        nuevas = [
+            Pago(
+                residente_id=rid,
+                tipo_movimiento='INGRESO',
+                categoria=categoria,
+                descripcion=descripcion,
+                monto_total=monto,
+                monto_pagado=0,
+                periodo=periodo,
+                fecha_emision=periodo,
+                estado=EstadoPago.PENDIENTE,
+            )
+            for rid in lote if rid not in ya_facturados
+        ]
+        # ignore_conflicts: si otra corrida simultánea ya insertó alguna, la
+        # restricción única la descarta en vez de fallar el lote.
+        Pago.objects.bulk_create(nuevas, ignore_conflicts=True)
+        total = Pago.objects.filter(
+            residente_id__in=lote, periodo=periodo, categoria=categoria
+        ).count()
+        creadas += total - len(ya_facturados)
+        existentes += len(ya_facturados)
+        if total > len(ya_facturados):
+            saldos.recalcular(lote)
+
+    if creadas:
+        resumen_financiero.recalcular({(periodo.year, periodo.month, 'INGRESO', categoria)})
+        # Con otra corrida simultánea, `creadas` también cuenta las que insertó la otra
+        # (ignore_conflicts no dice cuáles entraron): el KPI se recalcula en vez de sumarlo.
+        agregados.tras_escritura_masiva('Pago', kpis_a_recalcular=('cuotas_pendientes',))
+    return {'creadas': creadas, 'existentes': existentes}
+
+
+def vencer_pagos(hoy=None, tamano_lote=TAMANO_LOTE):
+    """
+    Pasa a VENCIDO los cobros (INGRESO) PENDIENTES cuya fecha de emisión
+    más DIAS_GRACIA_PAGO ya pasó. Cada lote es una lectura de ids por el
+    índice (estado, tipo_movimiento, fecha_emision) y un UPDATE. Devuelve
+    cuántos cambiaron.
+    """
+    hoy = hoy or timezone.localdate()
+    limite = hoy - timedelta(days=settings.DIAS_GRACIA_PAGO)
+    pendientes = Pago.objects.filter(
+        estado=EstadoPago.PENDIENTE, fecha_emision__lt=limite, tipo_movimiento='INGRESO'
+    )
+
+    vencidos = 0
+    while True:
+        ids = list(pendientes.order_by('pk').values_list('pk', flat=True)[:tamano_lote])
+        if not ids:
+            break
+        vencidos += pendientes.filter(pk__in=ids).update(
+            estado=EstadoPago.VENCIDO, updated_at=timezone.now()
+        )
+        saldos.recalcular_de_pagos(ids)
+
+    if vencidos:
+        # PENDIENTE y VENCIDO cuentan igual en cuotas_pendientes: no hay delta de KPI.
+        agregados.tras_escritura_masiva('Pago')
+    return vencidos
@@ -0,0 +1,61 @@
+"""
+Folios consecutivos (números de recibo) sin colisiones.
+
+Cada proceso toma de la tabla SecuenciaFolio un bloque de
+FOLIOS_TAMANO_BLOQUE números con un único UPDATE bajo select_for_update y
+los reparte desde memoria, así que la fila sólo se bloquea una vez por
+bloque. Dentro de un proceso los folios siempre crecen; entre procesos
+pueden intercalarse y los números no usados de un bloque se pierden al
+reiniciar (puede haber huecos, nunca repetidos).
+"""
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import SecuenciaFolio
+
+PREFIJOS_RECIBO = {'INGRESO': 'ING', 'EGRESO': 'EGR'}
+
+_bloques = {}  # nombre -> [siguiente, tope) aún disponibles en este proceso
+_candado = threading.Lock()
+
+
+def _reservar_bloque(nombre, tamano):
+    """
+    Adelanta el contador `tamano` posiciones y devuelve el primer número
+    del bloque. Tiene que ser su propia transacción (durable): dentro de
+    otra, la fila quedaría bloqueada hasta que ésta termine y, si se
+    deshace, el contador vuelve atrás mientras el bloque sigue en _bloques
+    y otro proceso repetiría los mismos folios. Los folios se piden antes de
+    abrir cualquier transacción.
+    """
+    with transaction.atomic(durable=True):
+        SecuenciaFolio.objects.get_or_create(nombre=nombre)
+        inicio = (
+            SecuenciaFolio.objects.select_for_update()
+            .values_list('siguiente', flat=True).get(nombre=nombre)
+        )
+        SecuenciaFolio.objects.filter(nombre=nombre).update(siguiente=F('siguiente') + tamano)
+    return inicio
+
+
+def siguiente(nombre):
+    with _candado:
+        bloque = _bloques.get(nombre)
+        if bloque is None or bloque[0] >= bloque[1]:
+            tamano = settings.FOLIOS_TAMANO_BLOQUE
+            inicio = _reservar_bloque(nombre, tamano)
+            bloque = _bloques[nombre] = [inicio, inicio + tamano]
+        numero = bloque[0]
+        bloque[0] += 1
+    return numero
+
+
+def numero_recibo(tipo_movimiento):
+    """
+    'ING-00000123' / 'EGR-00000045'.
+    """
+    prefijo = PREFIJOS_RECIBO.get(tipo_movimiento, 'EGR')
+    return f"{prefijo}-{siguiente(prefijo):08d}"
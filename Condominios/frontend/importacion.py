@@ -0,0 +1,324 @@
+"""
+Importación masiva de residentes desde CSV o XLSX.
+
+El archivo se lee fila por fila (sin cargarlo entero en memoria) y se valida
+contra conjuntos en memoria de DNIs, unidades y cajones ya ocupados, que se
+cargan una sola vez. Las filas válidas se insertan con bulk_create por lotes;
+las inválidas se devuelven en el reporte con su número de fila.
+"""
+import codecs
+import csv
+import io
+import zipfile
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Case, When, Value
+
+from . import agregados, busqueda_residentes, estacionamiento
+from .models import Residente, EspacioEstacionamiento, dni_validator, telefono_validator
+from .normalizacion import normalizar
+
+try:
+    import openpyxl
+except ImportError:  # Sólo hace falta para .xlsx
+    openpyxl = None
+
+TAMANO_LOTE = 500
+
+# UTF-8 (con o sin BOM) y, si no, Windows-1252, que es lo que exporta Excel en Windows.
+CODIFICACIONES_CSV = ('utf-8-sig', 'cp1252')
+TAMANO_BLOQUE_LECTURA = 64 * 1024
+
+# Encabezado normalizado -> campo del modelo
+COLUMNAS = {
+    'nombre': 'nombre_completo',
+    'nombre completo': 'nombre_completo',
+    'dni': 'dni',
+    'dni pasaporte': 'dni',
+    'telefono': 'telefono',
+    'correo': 'correo_electronico',
+    'correo electronico': 'correo_electronico',
+    'email': 'correo_electronico',
+    'tipo': 'tipo_residente',
+    'tipo residente': 'tipo_residente',
+    'unidad': 'unidad_principal',
+    'unidad principal': 'unidad_principal',
+    'estado': 'estado',
+    'estacionamiento': 'espacios_estacionamiento',
+    'espacios estacionamiento': 'espacios_estacionamiento',
+}
+
+
+class ArchivoInvalido(Exception):
+    pass
+
+
+def _opciones(choices):
+    """
+    Acepta tanto el código ('PR') como la etiqueta ('Propietario').
+    """
+    opciones = {}
+    for codigo, etiqueta in choices:
+        opciones[normalizar(codigo)] = codigo
+        opciones[normalizar(str(etiqueta))] = codigo
+    return opciones
+
+
+TIPOS = _opciones(Residente.TIPO_RESIDENTE_CHOICES)
+ESTADOS = _opciones(Residente.ESTADO_CHOICES)
+
+
+def _mapear_encabezados(encabezados):
+    campos = [COLUMNAS.get(normalizar(str(e or ''))) for e in encabezados]
+    if 'nombre_completo' not in campos or 'unidad_principal' not in campos:
+        raise ArchivoInvalido("El archivo debe tener al menos las columnas 'nombre' y 'unidad'.")
+    return campos
+
+
+def _codificacion(archivo):
+    """
+    Primera de CODIFICACIONES_CSV con la que se decodifica el archivo
+    completo. Se recorre por bloques antes de leer la primera fila, para no
+    fallar a la mitad con lotes ya guardados.
+    """
+    for codificacion in CODIFICACIONES_CSV:
+        decodificador = codecs.getincrementaldecoder(codificacion)()
+        archivo.seek(0)
+        try:
+            for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE_LECTURA), b''):
+                decodificador.decode(bloque)
+            decodificador.decode(b'', final=True)
+        except UnicodeDecodeError:
+            continue
+        archivo.seek(0)
+        return codificacion
+    raise ArchivoInvalido("No se pudo leer el archivo: guárdalo como CSV UTF-8.")
+
+
+def _filas_csv(archivo):
+    texto = io.TextIOWrapper(archivo, encoding=_codificacion(archivo), newline='')
+    muestra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+    except csv.Error:
+        dialecto = csv.excel
+    lector = csv.reader(texto, dialecto)
+    yield from lector
+
+
+def _filas_xlsx(archivo):
+    if openpyxl is None:
+        raise ArchivoInvalido("Para importar .xlsx hay que instalar openpyxl (o subir un .csv).")
+    try:
+        libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError, OSError, ValueError) as e:
+        raise ArchivoInvalido("El archivo .xlsx está dañado o no es un libro de Excel.") from e
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def leer_filas(archivo, nombre):
+    """
+    Genera (numero_de_fila, {campo: valor}) a partir de un archivo abierto en
+    modo binario. La fila 1 es el encabezado.
+    """
+    nombre = nombre.lower()
+    if nombre.endswith('.csv'):
+        filas = _filas_csv(archivo)
+    elif nombre.endswith('.xlsx'):
+        filas = _filas_xlsx(archivo)
+    else:
+        raise ArchivoInvalido("Formato no soportado: sube un archivo .csv o .xlsx.")
+
+    try:
+        campos = _mapear_encabezados(next(filas))
+    except StopIteration:
+        raise ArchivoInvalido("El archivo está vacío.")
+
+    for numero, valores in enumerate(filas, start=2):
+        if not any(v not in (None, '') for v in valores):
+            continue
+        fila = {}
+        for campo, valor in zip(campos, valores):
+            if campo:
+                fila[campo] = '' if valor is None else str(valor).strip()
+        yield numero, fila
+
+
+class Validador:
+    """
+    Valida filas contra lo que ya hay en la base y lo ya leído del archivo.
+    Los conjuntos se cargan una vez; cada fila válida se agrega a ellos.
+    """
+
+    def __init__(self):
+        self.dnis = set(
+            Residente.objects.exclude(dni__isnull=True).values_list('dni', flat=True)
+        )
+        self.unidades = {
+            u.lower() for u in Residente.objects.values_list('unidad_principal', flat=True)
+        }
+        self.cajones = set(
+            EspacioEstacionamiento.objects.filter(residente__isnull=False)
+            .values_list('codigo', flat=True)
+        )
+
+    def validar(self, fila):
+        """
+        Devuelve (Residente sin guardar, códigos de estacionamiento, errores).
+        """
+        errores = []
+        nombre = fila.get('nombre_completo', '')
+        unidad = fila.get('unidad_principal', '')
+        dni = fila.get('dni', '').upper() or None
+        telefono = fila.get('telefono', '') or None
+        correo = fila.get('correo_electronico', '') or None
+
+        if not nombre:
+            errores.append("Falta el nombre.")
+        if not unidad:
+            errores.append("Falta la unidad.")
+        elif unidad.lower() in self.unidades:
+            errores.append(f"Ya existe un residente registrado para la unidad {unidad}.")
+
+        if dni:
+            try:
+                dni_validator(dni)
+            except ValidationError as e:
+                errores.extend(e.messages)
+            if dni in self.dnis:
+                errores.append(f"Ya existe un residente con el DNI {dni}.")
+        if telefono:
+            try:
+                telefono_validator(telefono)
+            except ValidationError as e:
+                errores.extend(e.messages)
+        if correo:
+            try:
+                validate_email(correo)
+            except ValidationError:
+                errores.append(f"Correo inválido: {correo}.")
+
+        tipo = fila.get('tipo_residente', '')
+        tipo_codigo = TIPOS.get(normalizar(tipo)) if tipo else Residente.PROPIETARIO
+        if tipo_codigo is None:
+            errores.append(f"Tipo de residente desconocido: {tipo}.")
+        estado = fila.get('estado', '')
+        estado_codigo = ESTADOS.get(normalizar(estado)) if estado else Residente.PENDIENTE
+        if estado_codigo is None:
+            errores.append(f"Estado desconocido: {estado}.")
+
+        codigos = estacionamiento.limpiar_codigos(fila.get('espacios_estacionamiento', ''))
+        largos = [c for c in codigos if len(c) > estacionamiento.LARGO_CODIGO]
+        if largos:
+            errores.append(f"Código de estacionamiento demasiado largo: {largos[0]}.")
+        ocupados = sorted(set(codigos) & self.cajones)
+        if ocupados:
+            errores.append(
+                f"Los espacios de estacionamiento {', '.join(ocupados)} ya están asignados a otro residente."
+            )
+
+        if errores:
+            return None, [], errores
+
+        self.unidades.add(unidad.lower())
+        if dni:
+            self.dnis.add(dni)
+        self.cajones.update(codigos)
+        residente = Residente(
+            nombre_completo=nombre,
+            dni=dni,
+            telefono=telefono,
+            correo_electronico=correo,
+            tipo_residente=tipo_codigo,
+            unidad_principal=unidad,
+            estado=estado_codigo,
+            espacios_estacionamiento=', '.join(codigos) or None,
+        )
+        residente.busqueda = residente.calcular_busqueda()
+        return residente, codigos, []
+
+
+@transaction.atomic
+def _guardar_lote(lote):
+    """
+    Inserta un lote de (residente, códigos). bulk_create no llama a save() ni
+    dispara señales, así que aquí se hace lo que harían: clave de búsqueda
+    (ya calculada al validar), trigramas y cajones.
+    """
+    residentes = Residente.objects.bulk_create([r for r, _ in lote])
+    if any(r.pk is None for r in residentes):
+        # MySQL no devuelve los ids de bulk_create: se recuperan por unidad,
+        # que el validador garantiza única.
+        ids = dict(
+            Residente.objects.filter(
+                unidad_principal__in=[r.unidad_principal for r in residentes]
+            ).values_list('unidad_principal', 'pk')
+        )
+        for r in residentes:
+            r.pk = ids[r.unidad_principal]
+
+    busqueda_residentes.indexar_lote(residentes)
+
+    dueno = {c: r.pk for r, codigos in lote for c in codigos}
+    if dueno:
+        EspacioEstacionamiento.objects.bulk_create(
+            [EspacioEstacionamiento(codigo=c) for c in dueno],
+            ignore_conflicts=True,
+        )
+        # Mismo reclamo condicionado que estacionamiento.asignar(), en un UPDATE por lote.
+        reclamados = EspacioEstacionamiento.objects.filter(
+            codigo__in=list(dueno), residente__isnull=True
+        ).update(residente=Case(*[When(codigo=c, then=Value(pk)) for c, pk in dueno.items()]))
+        if reclamados < len(dueno):
+            raise estacionamiento.EspacioOcupado(
+                estacionamiento.ocupados(list(dueno))
+            )
+    return residentes
+
+
+def importar(filas, tamano_lote=TAMANO_LOTE):
+    """
+    Importa las filas de leer_filas(). Devuelve
+    {'creados': n, 'errores': [(fila, mensaje), ...]}.
+    """
+    validador = Validador()
+    creados = 0
+    activos = 0
+    errores = []
+    lote = []
+    numeros = []
+
+    def guardar():
+        nonlocal creados, activos
+        try:
+            residentes = _guardar_lote(lote)
+        except (estacionamiento.EspacioOcupado, IntegrityError) as e:
+            # Otro usuario registró el mismo DNI/unidad/cajón mientras se
+            # importaba: el lote se deshace completo.
+            errores.extend((n, f"Lote no importado: {e}") for n in numeros)
+            return
+        creados += len(residentes)
+        activos += sum(1 for r in residentes if r.estado == Residente.ACTIVO)
+
+    for numero, fila in filas:
+        residente, codigos, problemas = validador.validar(fila)
+        if problemas:
+            errores.extend((numero, p) for p in problemas)
+            continue
+        lote.append((residente, codigos))
+        numeros.append(numero)
+        if len(lote) >= tamano_lote:
+            guardar()
+            lote, numeros = [], []
+    if lote:
+        guardar()
+
+    if creados:
+        agregados.tras_escritura_masiva('Residente', residentes_activos=activos)
+    return {'creados': creados, 'errores': errores}
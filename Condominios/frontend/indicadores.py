@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Residente, Pago, Ticket, EstadoPago, ResumenKPI
+
+RESUMEN_PK = 1
+
+ESTADOS_CUOTA_PENDIENTE = (EstadoPago.PENDIENTE, EstadoPago.VENCIDO)
+
+# Campos que cada modelo necesita para calcular su aporte a los KPIs.
+# frontend.signals los lee antes del save para poder calcular el delta.
+CAMPOS_KPI = {
+    Residente: ('estado',),
+    # residente_id, categoria y las fechas no suman a ningún KPI: los usan saldos y
+    # resumen_financiero para saber qué recalcular cuando el pago cambia.
+    Pago: (
+        'estado', 'tipo_movimiento', 'monto_pagado',
+        'residente_id', 'categoria', 'fecha_emision', 'fecha_pago',
+    ),
+    Ticket: ('estado',),
+}
+
+
+def aporte(modelo, valores):
+    """
+    Devuelve cuánto suma una fila (dict con CAMPOS_KPI) a cada indicador.
+    """
+    if valores is None:
+        return {}
+    if modelo is Residente:
+        return {'residentes_activos': 1 if valores['estado'] == Residente.ACTIVO else 0}
+    if modelo is Pago:
+        ingreso = (
+            valores['tipo_movimiento'] == 'INGRESO'
+            and valores['estado'] == EstadoPago.PAGADO
+        )
+        return {
+            'cuotas_pendientes': 1 if valores['estado'] in ESTADOS_CUOTA_PENDIENTE else 0,
+            'total_ingresos': Decimal(valores['monto_pagado'] or 0) if ingreso else Decimal('0'),
+        }
+    if modelo is Ticket:
+        return {'tickets_abiertos': 0 if valores['estado'] == 'CERRADO' else 1}
+    return {}
+
+
+def diferencia(modelo, antes, despues):
+    previo = aporte(modelo, antes)
+    nuevo = aporte(modelo, despues)
+    return {
+        campo: nuevo.get(campo, 0) - previo.get(campo, 0)
+        for campo in set(previo) | set(nuevo)
+    }
+
+
+def aplicar_delta(**deltas):
+    """
+    Suma los deltas al resumen con un único UPDATE (F() evita condiciones de carrera).
+    """
+    cambios = {campo: F(campo) + valor for campo, valor in deltas.items() if valor}
+    if not cambios:
+        return
+    cambios['actualizado'] = timezone.now()
+    if not ResumenKPI.objects.filter(pk=RESUMEN_PK).update(**cambios):
+        # Aún no existe la fila: se construye desde cero (ya incluye el cambio actual).
+        recalcular()
+
+
+CALCULOS = {
+    'residentes_activos': lambda: Residente.objects.filter(estado=Residente.ACTIVO).count(),
+    'cuotas_pendientes': lambda: Pago.objects.filter(estado__in=ESTADOS_CUOTA_PENDIENTE).count(),
+    'tickets_abiertos': lambda: Ticket.objects.exclude(estado='CERRADO').count(),
+    'total_ingresos': lambda: Pago.objects.filter(
+        tipo_movimiento='INGRESO', estado=EstadoPago.PAGADO
+    ).aggregate(t=Sum('monto_pagado'))['t'] or 0,
+}
+
+
+def calcular_desde_tablas(campos=None):
+    return {campo: CALCULOS[campo]() for campo in (campos or CALCULOS)}
+
+
+def recalcular():
+    with transaction.atomic():
+        resumen, _ = ResumenKPI.objects.update_or_create(
+            pk=RESUMEN_PK, defaults=calcular_desde_tablas()
+        )
+    return resumen
+
+
+def recalcular_campos(*campos):
+    """
+    Recalcula sólo `campos` desde las tablas, para escrituras en bloque que
+    no saben cuántas filas cambiaron de verdad (bulk_create con
+    ignore_conflicts). La fila queda bloqueada entre el conteo y el UPDATE
+    para que ningún delta concurrente se pierda.
+    """
+    with transaction.atomic():
+        if not ResumenKPI.objects.select_for_update().filter(pk=RESUMEN_PK).exists():
+            return recalcular()
+        ResumenKPI.objects.filter(pk=RESUMEN_PK).update(
+            **calcular_desde_tablas(campos), actualizado=timezone.now()
+        )
+
+
+def obtener_resumen():
+    resumen = ResumenKPI.objects.filter(pk=RESUMEN_PK).first()
+    if resumen is None:
+        resumen = recalcular()
+    return resumen
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from frontend import asignacion
+from frontend.models import HistorialLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Asigna los tickets abiertos sin responsable al empleado o proveedor con menos "
+        "tickets abiertos según su tipo de solicitud (ASIGNACION_TICKETS). Pensado para "
+        "correr periódicamente (cron)."
+    )
+
+    def handle(self, *args, **options):
+        resultado = asignacion.asignar()
+        if resultado['asignados']:
+            HistorialLog.objects.create(
+                usuario=None, accion='EDICION', modulo='Tickets',
+                descripcion=f"Asignación automática: {resultado['asignados']} tickets",
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['asignados']} tickets asignados, "
+            f"{resultado['sin_candidato']} sin personal activo para su tipo."
+        ))
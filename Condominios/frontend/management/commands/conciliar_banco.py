@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import conciliacion
+from frontend.models import HistorialLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa un estado de cuenta bancario (.csv con fecha, monto, referencia, concepto) "
+        "y concilia los depósitos contra los cargos pendientes de los residentes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], 'rb') as archivo:
+                resultado = conciliacion.importar(archivo)
+        except OSError as e:
+            raise CommandError(f"No se pudo abrir el archivo: {e}")
+        except conciliacion.EstadoCuentaInvalido as e:
+            raise CommandError(str(e))
+
+        for fila, mensaje in resultado['errores']:
+            self.stdout.write(self.style.WARNING(f"Fila {fila}: {mensaje}"))
+        if resultado['conciliados']:
+            HistorialLog.objects.create(
+                usuario=None, accion='EDICION', modulo='Pagos',
+                descripcion=f"Conciliación bancaria: {resultado['conciliados']} depósitos aplicados",
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['nuevos']} depósitos nuevos de {resultado['leidos']}: "
+            f"{resultado['conciliados']} conciliados, {resultado['revision']} en revisión, "
+            f"{resultado['sin_coincidencia']} sin coincidencia, {len(resultado['errores'])} errores."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from frontend import sla
+from frontend.models import HistorialLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Escala los tickets abiertos con el plazo de SLA vencido (SLA_TICKETS_HORAS): "
+        "suben un nivel de prioridad y reciben un plazo nuevo. Pensado para correr "
+        "cada hora (cron)."
+    )
+
+    def handle(self, *args, **options):
+        escalados = sla.escalar()
+        total = sum(escalados.values())
+        if total:
+            detalle = ', '.join(f"{n} {prioridad}" for prioridad, n in escalados.items())
+            HistorialLog.objects.create(
+                usuario=None, accion='EDICION', modulo='Tickets',
+                descripcion=f"Escalamiento automático por SLA: {total} tickets ({detalle})",
+            )
+        self.stdout.write(self.style.SUCCESS(f"{total} tickets escalados por SLA vencido."))
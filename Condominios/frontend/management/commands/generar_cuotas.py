@@ -0,0 +1,49 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import facturacion
+from frontend.models import HistorialLog, Pago
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera la cuota de mantenimiento de un periodo para todos los residentes activos. "
+        "Se puede volver a correr: sólo crea las cuotas que falten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--periodo', help="AAAA-MM (por defecto, el mes en curso)")
+        parser.add_argument('--monto', help="Monto de la cuota (por defecto CUOTA_MANTENIMIENTO_MONTO)")
+        parser.add_argument('--categoria', help="Categoría (por defecto CUOTA_MANTENIMIENTO_CATEGORIA)")
+
+    def handle(self, *args, **options):
+        try:
+            periodo = (
+                facturacion.periodo_desde_texto(options['periodo'])
+                if options['periodo'] else facturacion.periodo_actual()
+            )
+        except ValueError:
+            raise CommandError("El periodo debe tener el formato AAAA-MM.")
+
+        monto = options['monto']
+        if monto is not None:
+            try:
+                # Mismas reglas que el campo: número, máximo de dígitos y decimales.
+                monto = Pago._meta.get_field('monto_total').clean(monto, None)
+            except ValidationError as e:
+                raise CommandError(f"Monto inválido: {' '.join(e.messages)}")
+            if monto <= 0:
+                raise CommandError("El monto debe ser mayor que cero.")
+
+        resultado = facturacion.generar_cuotas(
+            periodo, monto=monto, categoria=options['categoria']
+        )
+        if resultado['creadas']:
+            HistorialLog.objects.create(
+                usuario=None, accion='CREACION', modulo='Pagos',
+                descripcion=f"Facturación {periodo:%Y-%m}: {resultado['creadas']} cuotas generadas",
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Periodo {periodo:%Y-%m}: {resultado['creadas']} cuotas creadas, "
+            f"{resultado['existentes']} ya existían."
+        ))
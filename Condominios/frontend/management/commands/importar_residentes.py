@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import importacion
+
+
+class Command(BaseCommand):
+    help = "Importa residentes desde un archivo .csv o .xlsx (columnas: nombre, unidad, dni, telefono, correo, tipo, estado, estacionamiento)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+        parser.add_argument('--lote', type=int, default=importacion.TAMANO_LOTE)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], 'rb') as archivo:
+                resultado = importacion.importar(
+                    importacion.leer_filas(archivo, options['archivo']),
+                    tamano_lote=options['lote'],
+                )
+        except OSError as e:
+            raise CommandError(f"No se pudo abrir el archivo: {e}")
+        except importacion.ArchivoInvalido as e:
+            raise CommandError(str(e))
+
+        for fila, mensaje in resultado['errores']:
+            self.stdout.write(self.style.WARNING(f"Fila {fila}: {mensaje}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['creados']} residentes importados, {len(resultado['errores'])} errores."
+        ))
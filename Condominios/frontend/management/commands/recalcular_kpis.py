@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from frontend import indicadores
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero la tabla de KPIs del dashboard (resumen_kpis)."
+
+    def handle(self, *args, **options):
+        resumen = indicadores.recalcular()
+        self.stdout.write(f"→ Residentes activos: {resumen.residentes_activos}")
+        self.stdout.write(f"→ Cuotas pendientes: {resumen.cuotas_pendientes}")
+        self.stdout.write(f"→ Tickets abiertos: {resumen.tickets_abiertos}")
+        self.stdout.write(f"→ Total ingresos: {resumen.total_ingresos}")
+        self.stdout.write(self.style.SUCCESS("KPIs recalculados correctamente."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from frontend import resumen_financiero
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye la tabla resumen_financiero (totales mensuales por tipo y categoría) "
+        "desde gestion_pagos."
+    )
+
+    def handle(self, *args, **options):
+        total = resumen_financiero.recalcular_todo()
+        self.stdout.write(self.style.SUCCESS(f"Resumen financiero reconstruido: {total} cubetas."))
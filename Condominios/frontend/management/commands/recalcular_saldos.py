@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from frontend import saldos
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye la tabla de saldos por residente desde gestion_pagos. "
+        "Sólo hace falta si se escribió en la tabla de pagos por fuera de la aplicación."
+    )
+
+    def handle(self, *args, **options):
+        total = saldos.recalcular_todos()
+        self.stdout.write(self.style.SUCCESS(f"Saldos recalculados para {total} residentes."))
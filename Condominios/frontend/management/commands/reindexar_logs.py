@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from frontend import busqueda_logs
+from frontend.models import HistorialLog, HistorialLogToken
+
+TAMANO_LOTE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice invertido de búsqueda del historial (historiallog_tokens). "
+        "En MySQL no hace nada: la búsqueda usa el índice FULLTEXT."
+    )
+
+    def handle(self, *args, **options):
+        if busqueda_logs.usa_fulltext():
+            self.stdout.write("MySQL usa el índice FULLTEXT; no hay nada que reindexar.")
+            return
+
+        with transaction.atomic():
+            HistorialLogToken.objects.all().delete()
+            total = 0
+            lote = []
+            for log in HistorialLog.objects.only('id', 'descripcion', 'modulo').iterator(chunk_size=TAMANO_LOTE):
+                lote.extend(
+                    HistorialLogToken(log_id=log.id, token=t)
+                    for t in busqueda_logs.tokenizar(f"{log.descripcion} {log.modulo}")
+                )
+                total += 1
+                if len(lote) >= TAMANO_LOTE:
+                    HistorialLogToken.objects.bulk_create(lote)
+                    lote = []
+            HistorialLogToken.objects.bulk_create(lote)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} registros del historial reindexados."))
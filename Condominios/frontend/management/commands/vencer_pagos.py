@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import facturacion
+from frontend.models import HistorialLog
+
+
+class Command(BaseCommand):
+    help = (
+        "Marca como VENCIDO los cobros pendientes con más de DIAS_GRACIA_PAGO días "
+        "desde su emisión. Pensado para correr a diario (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', help="Fecha de referencia AAAA-MM-DD (por defecto, hoy)")
+
+    def handle(self, *args, **options):
+        try:
+            hoy = date.fromisoformat(options['fecha']) if options['fecha'] else None
+        except ValueError:
+            raise CommandError("La fecha debe tener el formato AAAA-MM-DD.")
+
+        vencidos = facturacion.vencer_pagos(hoy)
+        if vencidos:
+            HistorialLog.objects.create(
+                usuario=None, accion='EDICION', modulo='Pagos',
+                descripcion=f"Vencimiento automático: {vencidos} cobros pasaron a VENCIDO",
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{vencidos} cobros marcados como vencidos (gracia: {settings.DIAS_GRACIA_PAGO} días)."
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0010_alter_controlacceso_tipo_visitante_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenKPI',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('residentes_activos', models.IntegerField(default=0)),
+                ('cuotas_pendientes', models.IntegerField(default=0)),
+                ('tickets_abiertos', models.IntegerField(default=0)),
+                ('total_ingresos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen de KPIs',
+                'db_table': 'resumen_kpis',
+            },
+        ),
+    ]
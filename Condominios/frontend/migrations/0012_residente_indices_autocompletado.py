@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0011_resumenkpi'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['estado', 'unidad_principal'], name='residente_estado_unidad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['estado', 'nombre_completo'], name='residente_estado_nombre_idx'),
+        ),
+    ]
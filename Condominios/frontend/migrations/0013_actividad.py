@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+LOTE = 1000
+
+
+def _nombre_unidad(residente):
+    if residente is None:
+        return "Desconocido", "-"
+    return residente.nombre_completo, residente.unidad_principal
+
+
+def poblar_actividad(apps, schema_editor):
+    """
+    Carga en el feed los pagos, tickets y accesos ya existentes (los que
+    tienen fecha de creación). Reservas y reuniones no guardan cuándo se
+    crearon, así que empiezan a aparecer con los registros nuevos.
+    """
+    Actividad = apps.get_model('frontend', 'Actividad')
+    Pago = apps.get_model('frontend', 'Pago')
+    Ticket = apps.get_model('frontend', 'Ticket')
+    ControlAcceso = apps.get_model('frontend', 'ControlAcceso')
+
+    def filas():
+        for p in Pago.objects.select_related('residente', 'empleado', 'proveedor').iterator(chunk_size=LOTE):
+            if p.residente:
+                nom, uni = _nombre_unidad(p.residente)
+            elif p.empleado:
+                nom, uni = p.empleado.nombre_completo, "Staff"
+            elif p.proveedor:
+                nom, uni = p.proveedor.nombre_empresa, "Proveedor"
+            else:
+                nom, uni = "Sistema", "-"
+            yield Actividad(tipo='pago', evento='Pago registrado', detalle=f"${p.monto_pagado}",
+                            usuario=nom, unidad=uni, objeto_id=p.id, fecha=p.created_at)
+
+        for t in Ticket.objects.select_related('residente').iterator(chunk_size=LOTE):
+            nom, uni = _nombre_unidad(t.residente)
+            yield Actividad(tipo='ticket', evento='Ticket creado', detalle=(t.asunto or '')[:255],
+                            usuario=nom, unidad=uni, objeto_id=t.id, fecha=t.fecha_creacion)
+
+        for a in ControlAcceso.objects.select_related('residente').iterator(chunk_size=LOTE):
+            _, uni = _nombre_unidad(a.residente)
+            yield Actividad(tipo='acceso', evento='Ingreso registrado', detalle=a.tipo_visitante or '',
+                            usuario=a.nombre_visitante, unidad=uni, objeto_id=a.id, fecha=a.fecha_entrada)
+
+    lote = []
+    for fila in filas():
+        lote.append(fila)
+        if len(lote) >= LOTE:
+            Actividad.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        Actividad.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0012_residente_indices_autocompletado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Actividad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('pago', 'Pago'), ('ticket', 'Ticket'), ('acceso', 'Acceso'), ('reserva', 'Reserva'), ('reunion', 'Reunión')], max_length=20)),
+                ('evento', models.CharField(max_length=100)),
+                ('detalle', models.CharField(blank=True, max_length=255)),
+                ('usuario', models.CharField(blank=True, max_length=255)),
+                ('unidad', models.CharField(blank=True, max_length=100)),
+                ('objeto_id', models.BigIntegerField(blank=True, null=True)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Actividad',
+                'verbose_name_plural': 'Actividades',
+                'db_table': 'actividad_condominio',
+                'indexes': [models.Index(fields=['-fecha', '-id'], name='actividad_fecha_id_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_actividad, migrations.RunPython.noop),
+    ]
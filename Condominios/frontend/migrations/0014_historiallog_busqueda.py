@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:21
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+LOTE = 1000
+INDICE_FULLTEXT = 'historiallog_texto_ft'
+LARGO_MAXIMO_TOKEN = 50
+
+
+# Copia de frontend.busqueda_logs.tokenizar tal como era al crear el índice:
+# la migración no debe cambiar si el módulo cambia después.
+def tokenizar(texto):
+    sin_acentos = ''.join(
+        c for c in unicodedata.normalize('NFKD', texto or '')
+        if not unicodedata.combining(c)
+    )
+    tokens = []
+    for palabra in re.findall(r'[^\W_]+', sin_acentos.lower()):
+        palabra = palabra[:LARGO_MAXIMO_TOKEN]
+        if len(palabra) >= 2 and palabra not in tokens:
+            tokens.append(palabra)
+    return tokens
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    """
+    MySQL: índice FULLTEXT sobre descripción y módulo.
+    Otros motores: se llena el índice invertido con los logs existentes.
+    """
+    HistorialLog = apps.get_model('frontend', 'HistorialLog')
+    if schema_editor.connection.vendor == 'mysql':
+        tabla = schema_editor.quote_name(HistorialLog._meta.db_table)
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {INDICE_FULLTEXT} ON {tabla} (descripcion, modulo)"
+        )
+        return
+
+    HistorialLogToken = apps.get_model('frontend', 'HistorialLogToken')
+    lote = []
+    for log in HistorialLog.objects.only('id', 'descripcion', 'modulo').iterator(chunk_size=LOTE):
+        lote.extend(
+            HistorialLogToken(log_id=log.id, token=t)
+            for t in tokenizar(f"{log.descripcion} {log.modulo}")
+        )
+        if len(lote) >= LOTE:
+            HistorialLogToken.objects.bulk_create(lote)
+            lote = []
+    HistorialLogToken.objects.bulk_create(lote)
+
+
+def borrar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        HistorialLog = apps.get_model('frontend', 'HistorialLog')
+        tabla = schema_editor.quote_name(HistorialLog._meta.db_table)
+        schema_editor.execute(f"DROP INDEX {INDICE_FULLTEXT} ON {tabla}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0013_actividad'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorialLogToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='frontend.historiallog')),
+            ],
+            options={
+                'db_table': 'historiallog_tokens',
+                'indexes': [models.Index(fields=['token', 'log'], name='historiallog_token_idx')],
+            },
+        ),
+        migrations.RunPython(crear_indice_busqueda, borrar_indice_busqueda),
+    ]
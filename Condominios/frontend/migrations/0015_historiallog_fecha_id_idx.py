@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0014_historiallog_busqueda'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historiallog',
+            index=models.Index(fields=['-fecha', '-id'], name='historiallog_fecha_id_idx'),
+        ),
+    ]
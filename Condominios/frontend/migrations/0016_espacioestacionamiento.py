@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:23
+
+import logging
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+LOTE = 1000
+
+
+def poblar_espacios(apps, schema_editor):
+    """
+    Crea un EspacioEstacionamiento por cada código que aparece en
+    Residente.espacios_estacionamiento. Si un código estaba repetido entre
+    residentes, se queda con el primero (por id) y se avisa del resto.
+    """
+    Residente = apps.get_model('frontend', 'Residente')
+    EspacioEstacionamiento = apps.get_model('frontend', 'EspacioEstacionamiento')
+    largo = EspacioEstacionamiento._meta.get_field('codigo').max_length
+
+    asignados = {}
+    filas = (
+        Residente.objects.exclude(espacios_estacionamiento__isnull=True)
+        .exclude(espacios_estacionamiento='')
+        .order_by('pk')
+        .values_list('pk', 'espacios_estacionamiento')
+    )
+    for pk, cadena in filas.iterator(chunk_size=LOTE):
+        for raw in cadena.split(','):
+            codigo = raw.strip().upper()
+            if not codigo:
+                continue
+            if len(codigo) > largo:
+                logger.warning(
+                    "Código de estacionamiento '%s' del residente %s demasiado largo; se omite.", codigo, pk
+                )
+            elif codigo in asignados and asignados[codigo] != pk:
+                logger.warning(
+                    "El estacionamiento %s del residente %s ya era del residente %s; se omite.",
+                    codigo, pk, asignados[codigo],
+                )
+            else:
+                asignados[codigo] = pk
+
+    EspacioEstacionamiento.objects.bulk_create(
+        [EspacioEstacionamiento(codigo=c, residente_id=pk) for c, pk in asignados.items()],
+        batch_size=LOTE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0015_historiallog_fecha_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EspacioEstacionamiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(max_length=20, unique=True)),
+                ('residente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='espacios', to='frontend.residente')),
+            ],
+            options={
+                'db_table': 'espacios_estacionamiento',
+                'ordering': ['codigo'],
+            },
+        ),
+        migrations.RunPython(poblar_espacios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0016_espacioestacionamiento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['nombre_completo'], name='residente_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['tipo_residente', 'nombre_completo'], name='residente_tipo_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['tipo_residente', 'unidad_principal'], name='residente_tipo_unidad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='residente',
+            index=models.Index(fields=['estado', 'tipo_residente', 'unidad_principal'], name='residente_estado_tipo_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:25
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+LOTE = 1000
+CAMPOS_BUSQUEDA = ('nombre_completo', 'dni', 'unidad_principal', 'correo_electronico')
+
+
+# Copias de frontend.normalizacion tal como era al crear la columna:
+# la migración no debe cambiar si el módulo cambia después.
+def normalizar(texto):
+    sin_acentos = ''.join(
+        c for c in unicodedata.normalize('NFKD', texto or '')
+        if not unicodedata.combining(c)
+    )
+    return ' '.join(re.findall(r'[^\W_]+', sin_acentos.lower()))
+
+
+def trigramas(texto):
+    resultado = set()
+    for palabra in texto.split():
+        relleno = f"  {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+
+def poblar_busqueda(apps, schema_editor):
+    """
+    Calcula la clave de búsqueda y los trigramas de los residentes existentes.
+    """
+    Residente = apps.get_model('frontend', 'Residente')
+    ResidenteTrigrama = apps.get_model('frontend', 'ResidenteTrigrama')
+
+    def guardar(lote):
+        Residente.objects.bulk_update(lote, ['busqueda'])
+        ResidenteTrigrama.objects.bulk_create([
+            ResidenteTrigrama(residente_id=r.pk, trigrama=t)
+            for r in lote
+            for t in trigramas(r.busqueda)
+        ])
+
+    lote = []
+    for r in Residente.objects.only('pk', *CAMPOS_BUSQUEDA).iterator(chunk_size=LOTE):
+        r.busqueda = normalizar(' '.join(getattr(r, c) or '' for c in CAMPOS_BUSQUEDA))
+        lote.append(r)
+        if len(lote) >= LOTE:
+            guardar(lote)
+            lote = []
+    guardar(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0017_residente_indices_listado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='residente',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='ResidenteTrigrama',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigrama', models.CharField(max_length=3)),
+                ('residente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigramas', to='frontend.residente')),
+            ],
+            options={
+                'db_table': 'residente_trigramas',
+                'indexes': [models.Index(fields=['trigrama', 'residente'], name='residente_trigrama_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_busqueda, migrations.RunPython.noop),
+    ]
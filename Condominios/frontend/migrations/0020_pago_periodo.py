@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0019_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pago',
+            name='periodo',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='pago',
+            constraint=models.UniqueConstraint(fields=('residente', 'periodo', 'categoria'), name='uniq_cuota_residente_periodo'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Min, Q, Sum
+from django.utils import timezone
+
+LOTE = 1000
+
+
+def poblar_saldos(apps, schema_editor):
+    """
+    Un GROUP BY sobre los cargos adeudados; sólo se crean filas para los
+    residentes con deuda (sin fila equivale a saldo cero).
+    """
+    Pago = apps.get_model('frontend', 'Pago')
+    SaldoResidente = apps.get_model('frontend', 'SaldoResidente')
+
+    pendiente = F('monto_total') - F('monto_pagado')
+    filas = (
+        Pago.objects.filter(
+            residente__isnull=False,
+            tipo_movimiento='INGRESO',
+            estado__in=['PENDIENTE', 'VENCIDO'],
+        )
+        .values('residente_id')
+        .annotate(
+            saldo=Sum(pendiente),
+            saldo_vencido=Sum(pendiente, filter=Q(estado='VENCIDO')),
+            fecha_adeudo_mas_antiguo=Min('fecha_emision'),
+            cargos_vencidos=Count('id', filter=Q(estado='VENCIDO')),
+        )
+        .order_by()
+    )
+    ahora = timezone.now()
+    SaldoResidente.objects.bulk_create(
+        [
+            SaldoResidente(
+                residente_id=f['residente_id'],
+                saldo=f['saldo'] or 0,
+                saldo_vencido=f['saldo_vencido'] or 0,
+                fecha_adeudo_mas_antiguo=f['fecha_adeudo_mas_antiguo'],
+                cargos_vencidos=f['cargos_vencidos'],
+                actualizado=ahora,
+            )
+            for f in filas.iterator(chunk_size=LOTE)
+        ],
+        batch_size=LOTE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0021_pago_estado_emision_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoResidente',
+            fields=[
+                ('residente', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='saldo', serialize=False, to='frontend.residente')),
+                ('saldo', models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=14)),
+                ('saldo_vencido', models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=14)),
+                ('fecha_adeudo_mas_antiguo', models.DateField(blank=True, null=True)),
+                ('cargos_vencidos', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Saldo de Residente',
+                'db_table': 'saldos_residentes',
+            },
+        ),
+        migrations.RunPython(poblar_saldos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0022_saldoresidente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaFolio',
+            fields=[
+                ('nombre', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('siguiente', models.BigIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Folios',
+                'db_table': 'secuencias_folios',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0023_secuenciafolio'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Abono',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('monto_aplicado', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('fecha', models.DateField()),
+                ('metodo_pago', models.CharField(blank=True, max_length=50, null=True)),
+                ('referencia', models.CharField(blank=True, max_length=100, null=True)),
+                ('numero_recibo', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('residente', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='abonos', to='frontend.residente')),
+            ],
+            options={
+                'verbose_name': 'Abono',
+                'db_table': 'abonos',
+                'ordering': ['-fecha', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AplicacionAbono',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('abono', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aplicaciones', to='frontend.abono')),
+                ('pago', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aplicaciones', to='frontend.pago')),
+            ],
+            options={
+                'verbose_name': 'Aplicación de Abono',
+                'db_table': 'abonos_aplicaciones',
+            },
+        ),
+    ]
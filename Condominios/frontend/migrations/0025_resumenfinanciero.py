@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:37
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+LOTE = 1000
+
+
+def poblar_resumen(apps, schema_editor):
+    """
+    Misma lógica que resumen_financiero.recalcular_todo(): emitido por mes de
+    emisión (sin cancelados), cobrado por mes de pago.
+    """
+    Pago = apps.get_model('frontend', 'Pago')
+    ResumenFinanciero = apps.get_model('frontend', 'ResumenFinanciero')
+    ahora = timezone.now()
+    filas = {}
+
+    def fila(d):
+        clave = (d['anio'], d['mes'], d['tipo_movimiento'], d['categoria'])
+        if clave not in filas:
+            filas[clave] = ResumenFinanciero(
+                anio=clave[0], mes=clave[1], tipo_movimiento=clave[2], categoria=clave[3],
+                actualizado=ahora,
+            )
+        return filas[clave]
+
+    campos = ('anio', 'mes', 'tipo_movimiento', 'categoria')
+    for d in (
+        Pago.objects.exclude(estado='CANCELADO')
+        .annotate(anio=ExtractYear('fecha_emision'), mes=ExtractMonth('fecha_emision'))
+        .values(*campos).annotate(movimientos=Count('id'), emitido=Sum('monto_total')).order_by()
+    ):
+        f = fila(d)
+        f.movimientos, f.emitido = d['movimientos'], d['emitido'] or 0
+    for d in (
+        Pago.objects.filter(monto_pagado__gt=0)
+        .annotate(fecha=Coalesce('fecha_pago', 'fecha_emision'))
+        .annotate(anio=ExtractYear('fecha'), mes=ExtractMonth('fecha'))
+        .values(*campos)
+        .annotate(
+            cobrado=Sum('monto_pagado'),
+            cobrado_liquidado=Sum('monto_pagado', filter=Q(estado='PAGADO')),
+        ).order_by()
+    ):
+        f = fila(d)
+        f.cobrado, f.cobrado_liquidado = d['cobrado'] or 0, d['cobrado_liquidado'] or 0
+
+    ResumenFinanciero.objects.bulk_create(filas.values(), batch_size=LOTE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0024_abonos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenFinanciero',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio', models.PositiveSmallIntegerField()),
+                ('mes', models.PositiveSmallIntegerField()),
+                ('tipo_movimiento', models.CharField(max_length=20)),
+                ('categoria', models.CharField(max_length=50)),
+                ('movimientos', models.PositiveIntegerField(default=0)),
+                ('emitido', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cobrado', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cobrado_liquidado', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumen Financiero Mensual',
+                'db_table': 'resumen_financiero',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['tipo_movimiento', 'categoria', 'fecha_emision'], name='pago_tipo_cat_emision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['tipo_movimiento', 'categoria', 'fecha_pago'], name='pago_tipo_cat_fpago_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumenfinanciero',
+            constraint=models.UniqueConstraint(fields=('anio', 'mes', 'tipo_movimiento', 'categoria'), name='uniq_resumen_financiero_cubeta'),
+        ),
+        migrations.RunPython(poblar_resumen, migrations.RunPython.noop),
+    ]
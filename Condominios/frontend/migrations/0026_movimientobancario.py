@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0025_resumenfinanciero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovimientoBancario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('referencia', models.CharField(blank=True, default='', max_length=100)),
+                ('descripcion', models.CharField(blank=True, default='', max_length=255)),
+                ('huella', models.CharField(max_length=40, unique=True)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('CONCILIADO', 'Conciliado'), ('REVISION', 'En revisión'), ('SIN_COINCIDENCIA', 'Sin coincidencia'), ('DESCARTADO', 'Descartado')], default='PENDIENTE', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('abono', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimientos_bancarios', to='frontend.abono')),
+                ('pago', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimientos_bancarios', to='frontend.pago')),
+            ],
+            options={
+                'verbose_name': 'Movimiento Bancario',
+                'db_table': 'movimientos_bancarios',
+                'indexes': [models.Index(fields=['estado', 'fecha', 'id'], name='movbanco_estado_fecha_idx')],
+            },
+        ),
+    ]
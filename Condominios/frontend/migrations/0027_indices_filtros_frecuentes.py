@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0026_movimientobancario'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pago',
+            name='pago_estado_emision_idx',
+        ),
+        migrations.AddIndex(
+            model_name='controlacceso',
+            index=models.Index(fields=['fecha_salida', 'fecha_entrada'], name='acceso_salida_entrada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='controlacceso',
+            index=models.Index(fields=['fecha_entrada'], name='acceso_fecha_entrada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['estado', 'tipo_movimiento', 'fecha_emision'], name='pago_estado_tipo_emision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['fecha_pago'], name='pago_fecha_pago_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['fecha_emision'], name='pago_fecha_emision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['area', 'fecha_reserva', 'estado'], name='reserva_area_fecha_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['fecha_reserva', 'hora_inicio'], name='reserva_fecha_hora_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='ticket_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['fecha_creacion'], name='ticket_fecha_creacion_idx'),
+        ),
+    ]
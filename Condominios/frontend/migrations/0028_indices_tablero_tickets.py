@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0027_indices_filtros_frecuentes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['prioridad', 'fecha_creacion'], name='ticket_prioridad_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['tipo_solicitud', 'fecha_creacion'], name='ticket_tipo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['empleado_asignado', 'fecha_creacion'], name='ticket_empleado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['proveedor_asignado', 'fecha_creacion'], name='ticket_proveedor_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['residente', 'fecha_creacion'], name='ticket_residente_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+SEPARADOR = '\n[Nota]: '
+LOTE = 500
+
+
+def separar_notas(apps, schema_editor):
+    """
+    Las notas se agregaban a la descripción como '\\n[Nota]: texto'. Cada
+    una pasa a ser un comentario (sin autor ni hora conocidos: se fechan con
+    la apertura del ticket) y la descripción queda con el texto original.
+    """
+    Ticket = apps.get_model('frontend', 'Ticket')
+    TicketComentario = apps.get_model('frontend', 'TicketComentario')
+    ids = list(Ticket.objects.filter(descripcion__contains=SEPARADOR).values_list('pk', flat=True))
+    for i in range(0, len(ids), LOTE):
+        comentarios = []
+        for ticket in Ticket.objects.filter(pk__in=ids[i:i + LOTE]).only('pk', 'descripcion', 'fecha_creacion'):
+            original, *notas = ticket.descripcion.split(SEPARADOR)
+            Ticket.objects.filter(pk=ticket.pk).update(descripcion=original or None)
+            comentarios += [
+                TicketComentario(ticket_id=ticket.pk, texto=nota, fecha=ticket.fecha_creacion)
+                for nota in notas if nota.strip()
+            ]
+        TicketComentario.objects.bulk_create(comentarios)
+
+
+def unir_notas(apps, schema_editor):
+    Ticket = apps.get_model('frontend', 'Ticket')
+    TicketComentario = apps.get_model('frontend', 'TicketComentario')
+    notas = {}
+    for ticket_id, texto in TicketComentario.objects.order_by('ticket_id', 'fecha', 'id').values_list('ticket_id', 'texto'):
+        notas.setdefault(ticket_id, []).append(texto)
+    for ticket in Ticket.objects.filter(pk__in=list(notas)).only('pk', 'descripcion'):
+        descripcion = (ticket.descripcion or '') + ''.join(SEPARADOR + n for n in notas[ticket.pk])
+        Ticket.objects.filter(pk=ticket.pk).update(descripcion=descripcion)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0028_indices_tablero_tickets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketComentario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('texto', models.TextField()),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('autor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comentarios', to='frontend.ticket')),
+            ],
+            options={
+                'db_table': 'gestion_tickets_comentarios',
+                'ordering': ['fecha', 'id'],
+                'indexes': [models.Index(fields=['ticket', 'fecha'], name='ticket_comentario_fecha_idx')],
+            },
+        ),
+        migrations.RunPython(separar_notas, unir_notas),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:49
+
+from datetime import timedelta
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def sellar_tickets(apps, schema_editor):
+    """
+    vence_en = apertura + plazo de su prioridad. La hora real de cierre no
+    se guardaba, así que fecha_cierre queda en NULL para los ya cerrados
+    (updated_at no sirve: la 0019 lo llenó con la hora de esa migración).
+    """
+    Ticket = apps.get_model('frontend', 'Ticket')
+    horas = settings.SLA_TICKETS_HORAS
+    for prioridad in Ticket.objects.values_list('prioridad', flat=True).distinct().order_by():
+        plazo = timedelta(hours=horas.get(prioridad, horas['MEDIA']))
+        Ticket.objects.filter(prioridad=prioridad).update(vence_en=F('fecha_creacion') + plazo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0029_ticketcomentario'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='fecha_creacion',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='fecha_cierre',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='nivel_escalamiento',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='vence_en',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['vence_en', 'estado'], name='ticket_vence_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['fecha_cierre'], name='ticket_fecha_cierre_idx'),
+        ),
+        migrations.RunPython(sellar_tickets, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,10 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.core.validators import RegexValidator
+from django.conf import settings
+from datetime import timedelta
+
+from .normalizacion import normalizar
 
 dni_validator = RegexValidator(
     regex=r'^\d{8}[A-Za-z]$',
@@ -22,6 +26,7 @@ class Documento(models.Model):
     archivo = models.FileField(upload_to='documentos/')
     tipo = models.CharField(max_length=100, blank=True)
     fecha = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.nombre
@@ -145,6 +150,13 @@ class Residente(models.Model):
         verbose_name=_('Estacionamiento'),
     )
 
+    # Nombre, DNI, unidad y correo normalizados (ver frontend/normalizacion.py).
+    # Se recalcula en save(); la búsqueda usa los trigramas de ResidenteTrigrama.
+    busqueda = models.TextField(blank=True, default='', editable=False)
+
+    # Último cambio de la fila; lo usa frontend/condicional.py para el ETag.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     class Meta:
         db_table = 'frontend_residente'
         verbose_name = _('Residente')
@@ -159,10 +171,71 @@ class Residente(models.Model):
             #    name='uniq_estacionamiento_por_tipo',
             #),
         ]
+        indexes = [
+            # Autocompletado por prefijo de unidad / nombre entre residentes activos
+            models.Index(fields=['estado', 'unidad_principal'], name='residente_estado_unidad_idx'),
+            models.Index(fields=['estado', 'nombre_completo'], name='residente_estado_nombre_idx'),
+            # Listado paginado: orden por columna con filtros por estado/tipo
+            models.Index(fields=['nombre_completo'], name='residente_nombre_idx'),
+            models.Index(fields=['tipo_residente', 'nombre_completo'], name='residente_tipo_nombre_idx'),
+            models.Index(fields=['tipo_residente', 'unidad_principal'], name='residente_tipo_unidad_idx'),
+            models.Index(fields=['estado', 'tipo_residente', 'unidad_principal'], name='residente_estado_tipo_idx'),
+        ]
 
     def __str__(self):
         return f'{self.nombre_completo} ({self.unidad_principal})'
 
+    CAMPOS_BUSQUEDA = ('nombre_completo', 'dni', 'unidad_principal', 'correo_electronico')
+
+    def calcular_busqueda(self):
+        return normalizar(' '.join(getattr(self, c) or '' for c in self.CAMPOS_BUSQUEDA))
+
+    def save(self, *args, **kwargs):
+        self.busqueda = self.calcular_busqueda()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.CAMPOS_BUSQUEDA):
+            kwargs['update_fields'] = {*update_fields, 'busqueda'}
+        super().save(*args, **kwargs)
+
+
+class ResidenteTrigrama(models.Model):
+    """
+    Índice de trigramas de Residente.busqueda para búsqueda tolerante a
+    errores de dedo. Se mantiene desde frontend/busqueda_residentes.py.
+    """
+    residente = models.ForeignKey(Residente, on_delete=models.CASCADE, related_name='trigramas')
+    trigrama = models.CharField(max_length=3)
+
+    class Meta:
+        db_table = 'residente_trigramas'
+        indexes = [
+            models.Index(fields=['trigrama', 'residente'], name='residente_trigrama_idx'),
+        ]
+
+
+class EspacioEstacionamiento(models.Model):
+    """
+    Un cajón de estacionamiento. El índice único en `codigo` hace que la base
+    de datos impida asignar el mismo cajón a dos residentes; la asignación se
+    hace en frontend/estacionamiento.py. Residente.espacios_estacionamiento se
+    conserva como texto para mostrar.
+    """
+    codigo = models.CharField(max_length=20, unique=True)
+    residente = models.ForeignKey(
+        Residente,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='espacios',
+    )
+
+    class Meta:
+        db_table = 'espacios_estacionamiento'
+        ordering = ['codigo']
+
+    def __str__(self):
+        return self.codigo
+
 # 3. PERSONAL Y PROVEEDORES
 
 class Empleado(models.Model):
@@ -174,6 +247,7 @@ class Empleado(models.Model):
     estado = models.CharField(max_length=20, default='ACTIVO')
     fecha_ingreso = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'frontend_empleado'
@@ -190,6 +264,7 @@ class Proveedor(models.Model):
     telefono_contacto = models.CharField(max_length=50, null=True, blank=True)
     tipo_servicio = models.CharField(max_length=100) # Plomería, Seguridad...
     estado = models.CharField(max_length=20, default='ACTIVO')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'frontend_proveedor'
@@ -251,6 +326,9 @@ class Pago(models.Model):
     monto_total = models.DecimalField(max_digits=10, decimal_places=2)
     monto_pagado = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
 
+    # Periodo facturado (día 1 del mes) en las cuotas generadas por frontend/facturacion.py
+    periodo = models.DateField(null=True, blank=True)
+
     # Fechas
     fecha_emision = models.DateField()
     fecha_pago = models.DateField(null=True, blank=True)
@@ -267,6 +345,25 @@ class Pago(models.Model):
     class Meta:
         db_table = 'gestion_pagos'
         verbose_name = 'Pago / Cobro'
+        constraints = [
+            # Una sola cuota por residente, periodo y categoría: la facturación se puede re-ejecutar.
+            # Los pagos capturados a mano tienen periodo NULL y no chocan entre sí.
+            models.UniqueConstraint(
+                fields=['residente', 'periodo', 'categoria'],
+                name='uniq_cuota_residente_periodo',
+            ),
+        ]
+        indexes = [
+            # Barrido de vencimiento (estado=PENDIENTE AND tipo=INGRESO AND fecha_emision < límite)
+            # y pendientes del dashboard (estado IN ... ORDER BY fecha_emision)
+            models.Index(fields=['estado', 'tipo_movimiento', 'fecha_emision'], name='pago_estado_tipo_emision_idx'),
+            # Historial de cobros (ORDER BY fecha_pago DESC) y últimos pagos / exportación por fecha_emision
+            models.Index(fields=['fecha_pago'], name='pago_fecha_pago_idx'),
+            models.Index(fields=['fecha_emision'], name='pago_fecha_emision_idx'),
+            # Recálculo de una cubeta de ResumenFinanciero
+            models.Index(fields=['tipo_movimiento', 'categoria', 'fecha_emision'], name='pago_tipo_cat_emision_idx'),
+            models.Index(fields=['tipo_movimiento', 'categoria', 'fecha_pago'], name='pago_tipo_cat_fpago_idx'),
+        ]
 
     @property
     def saldo_pendiente(self):
@@ -281,9 +378,114 @@ class Pago(models.Model):
         if count == 0:
             raise ValidationError("El pago debe asignarse a un Residente, Empleado o Proveedor.")
 
+class SaldoResidente(models.Model):
+    """
+    Estado de cuenta acumulado por residente (cargos INGRESO pendientes o
+    vencidos). Se recalcula para el residente afectado en cada escritura de
+    Pago (frontend/saldos.py), así que consultar u ordenar por deuda es una
+    lectura por índice en vez de un GROUP BY sobre gestion_pagos.
+    """
+    residente = models.OneToOneField(
+        Residente, on_delete=models.CASCADE, primary_key=True, related_name='saldo'
+    )
+    saldo = models.DecimalField(max_digits=14, decimal_places=2, default=0, db_index=True)
+    saldo_vencido = models.DecimalField(max_digits=14, decimal_places=2, default=0, db_index=True)
+    fecha_adeudo_mas_antiguo = models.DateField(null=True, blank=True)
+    cargos_vencidos = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'saldos_residentes'
+        verbose_name = 'Saldo de Residente'
+
+    def __str__(self):
+        return f"{self.residente_id}: ${self.saldo}"
+
+
+class Abono(models.Model):
+    """
+    Dinero recibido de un residente. Se reparte entre sus cargos abiertos,
+    del más antiguo al más nuevo (frontend/abonos.py); lo que sobra queda
+    como saldo a favor (monto - monto_aplicado).
+    """
+    residente = models.ForeignKey(Residente, on_delete=models.SET_NULL, null=True, related_name='abonos')
+    monto = models.DecimalField(max_digits=12, decimal_places=2)
+    monto_aplicado = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    fecha = models.DateField()
+    metodo_pago = models.CharField(max_length=50, null=True, blank=True)
+    referencia = models.CharField(max_length=100, null=True, blank=True)
+    numero_recibo = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'abonos'
+        verbose_name = 'Abono'
+        ordering = ['-fecha', '-id']
+
+    @property
+    def saldo_a_favor(self):
+        return self.monto - self.monto_aplicado
+
+    def __str__(self):
+        return f"{self.numero_recibo} - ${self.monto}"
+
+
+class AplicacionAbono(models.Model):
+    """
+    Cuánto de un abono se aplicó a un cargo.
+    """
+    abono = models.ForeignKey(Abono, on_delete=models.CASCADE, related_name='aplicaciones')
+    pago = models.ForeignKey(Pago, on_delete=models.CASCADE, related_name='aplicaciones')
+    monto = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        db_table = 'abonos_aplicaciones'
+        verbose_name = 'Aplicación de Abono'
+
+    def __str__(self):
+        return f"{self.abono_id} -> {self.pago_id}: ${self.monto}"
+
+
+class EstadoMovimiento(models.TextChoices):
+    PENDIENTE = 'PENDIENTE', 'Pendiente'
+    CONCILIADO = 'CONCILIADO', 'Conciliado'
+    REVISION = 'REVISION', 'En revisión'
+    SIN_COINCIDENCIA = 'SIN_COINCIDENCIA', 'Sin coincidencia'
+    DESCARTADO = 'DESCARTADO', 'Descartado'
+
+
+class MovimientoBancario(models.Model):
+    """
+    Depósito leído de un estado de cuenta bancario (frontend/conciliacion.py).
+    `huella` identifica la línea del archivo para que reimportar el mismo
+    estado de cuenta no duplique movimientos.
+    """
+    fecha = models.DateField()
+    monto = models.DecimalField(max_digits=12, decimal_places=2)
+    referencia = models.CharField(max_length=100, blank=True, default='')
+    descripcion = models.CharField(max_length=255, blank=True, default='')
+    huella = models.CharField(max_length=40, unique=True)
+    estado = models.CharField(max_length=20, choices=EstadoMovimiento.choices, default=EstadoMovimiento.PENDIENTE)
+    pago = models.ForeignKey(Pago, on_delete=models.SET_NULL, null=True, blank=True, related_name='movimientos_bancarios')
+    abono = models.ForeignKey(Abono, on_delete=models.SET_NULL, null=True, blank=True, related_name='movimientos_bancarios')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'movimientos_bancarios'
+        verbose_name = 'Movimiento Bancario'
+        indexes = [
+            # Cola de revisión: estado IN (...) ORDER BY fecha, id
+            models.Index(fields=['estado', 'fecha', 'id'], name='movbanco_estado_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} ${self.monto} {self.referencia}"
+
 # 6. OPERACIONES (Tickets y Áreas Comunes)
 
 class Ticket(models.Model):
+    TIPOS_SOLICITUD = ['Mantenimiento', 'Queja', 'Sugerencia', 'Otro']
+
     residente = models.ForeignKey(Residente, on_delete=models.CASCADE, related_name='tickets_creados')
     empleado_asignado = models.ForeignKey(Empleado, on_delete=models.SET_NULL, null=True, blank=True)
     proveedor_asignado = models.ForeignKey(Proveedor, on_delete=models.SET_NULL, null=True, blank=True)
@@ -293,10 +495,87 @@ class Ticket(models.Model):
     descripcion = models.TextField(null=True, blank=True)
     prioridad = models.CharField(max_length=20, choices=Prioridad.choices, default=Prioridad.MEDIA)
     estado = models.CharField(max_length=20, default='ABIERTO')
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    # default en vez de auto_now_add: save() usa la misma hora para apertura, vence_en y fecha_cierre.
+    fecha_creacion = models.DateTimeField(default=timezone.now, editable=False)
+    # SLA: plazo según prioridad (SLA_TICKETS_HORAS); el barrido escalar_tickets
+    # sube la prioridad de los vencidos y les da un plazo nuevo.
+    vence_en = models.DateTimeField(null=True, blank=True)
+    fecha_cierre = models.DateTimeField(null=True, blank=True)
+    nivel_escalamiento = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'gestion_tickets'
+        indexes = [
+            # Tablero filtrado por estado y conteos por estado, ordenados por fecha
+            models.Index(fields=['estado', 'fecha_creacion'], name='ticket_estado_fecha_idx'),
+            # Últimos tickets y exportación por rango de fechas
+            models.Index(fields=['fecha_creacion'], name='ticket_fecha_creacion_idx'),
+            # Filtros combinables del tablero, cada uno seguido de la fecha del cursor
+            models.Index(fields=['prioridad', 'fecha_creacion'], name='ticket_prioridad_fecha_idx'),
+            models.Index(fields=['tipo_solicitud', 'fecha_creacion'], name='ticket_tipo_fecha_idx'),
+            models.Index(fields=['empleado_asignado', 'fecha_creacion'], name='ticket_empleado_fecha_idx'),
+            models.Index(fields=['proveedor_asignado', 'fecha_creacion'], name='ticket_proveedor_fecha_idx'),
+            models.Index(fields=['residente', 'fecha_creacion'], name='ticket_residente_fecha_idx'),
+            # Barrido de vencidos (vence_en < ahora, sin cerrar) y percentiles de resolución por periodo
+            models.Index(fields=['vence_en', 'estado'], name='ticket_vence_estado_idx'),
+            models.Index(fields=['fecha_cierre'], name='ticket_fecha_cierre_idx'),
+        ]
+
+    @staticmethod
+    def plazo_sla(prioridad):
+        horas = settings.SLA_TICKETS_HORAS
+        return timedelta(hours=horas.get(prioridad, horas[Prioridad.MEDIA]))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        ticket = super().from_db(db, field_names, values)
+        ticket._estado_guardado = ticket.__dict__.get('estado')
+        return ticket
+
+    def save(self, *args, **kwargs):
+        ahora = timezone.now()
+        if self._state.adding and self.fecha_creacion is None:
+            self.fecha_creacion = ahora
+        sellados = []
+        if self.vence_en is None:
+            self.vence_en = (self.fecha_creacion or ahora) + self.plazo_sla(self.prioridad)
+            sellados.append('vence_en')
+        if self.estado != 'CERRADO':
+            if self.fecha_cierre is not None:
+                self.fecha_cierre = None
+                sellados.append('fecha_cierre')
+        elif self.fecha_cierre is None and getattr(self, '_estado_guardado', None) != 'CERRADO':
+            # Sólo al pasar a CERRADO: los cerrados antes de la 0030 no tienen hora de cierre real.
+            self.fecha_cierre = ahora
+            sellados.append('fecha_cierre')
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and sellados:
+            kwargs['update_fields'] = {*update_fields, *sellados}
+        super().save(*args, **kwargs)
+        self._estado_guardado = self.estado
+
+
+class TicketComentario(models.Model):
+    """
+    Notas de seguimiento de un ticket. Sólo se insertan: la descripción
+    del ticket queda como la escribió el solicitante.
+    """
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='comentarios')
+    autor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    texto = models.TextField()
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'gestion_tickets_comentarios'
+        ordering = ['fecha', 'id']
+        indexes = [
+            # Hilo de un ticket en orden cronológico
+            models.Index(fields=['ticket', 'fecha'], name='ticket_comentario_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ticket #{self.ticket_id} - {self.fecha:%Y-%m-%d %H:%M}"
 
 class AreaComun(models.Model):
     nombre = models.CharField(max_length=100)
@@ -324,6 +603,12 @@ class Reserva(models.Model):
 
     class Meta:
         db_table = 'reservas_areas'
+        indexes = [
+            # Choques de horario al reservar: area = ? AND fecha_reserva = ? AND estado IN (...)
+            models.Index(fields=['area', 'fecha_reserva', 'estado'], name='reserva_area_fecha_estado_idx'),
+            # Próximas reservas: fecha_reserva >= hoy ORDER BY fecha_reserva, hora_inicio
+            models.Index(fields=['fecha_reserva', 'hora_inicio'], name='reserva_fecha_hora_idx'),
+        ]
 
     def clean(self):
         """
@@ -385,10 +670,17 @@ class ControlAcceso(models.Model):
 
     fecha_entrada = models.DateTimeField(auto_now_add=True)
     fecha_salida = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'control_accesos'
         verbose_name = 'Registro de Acceso'
+        indexes = [
+            # Visitantes dentro: fecha_salida IS NULL ORDER BY fecha_entrada DESC
+            models.Index(fields=['fecha_salida', 'fecha_entrada'], name='acceso_salida_entrada_idx'),
+            # Historial: fecha_salida IS NOT NULL ORDER BY fecha_entrada DESC LIMIT n
+            models.Index(fields=['fecha_entrada'], name='acceso_fecha_entrada_idx'),
+        ]
 
 # Reuniones asamblea
 class Reunion(models.Model):
@@ -441,6 +733,127 @@ class HistorialLog(models.Model):
 
     class Meta:
         ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['-fecha', '-id'], name='historiallog_fecha_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.usuario} - {self.accion} - {self.fecha}"
+
+
+# 8. INDICADORES (tablas de resumen mantenidas por señales)
+
+class ResumenKPI(models.Model):
+    """
+    Fila única con los indicadores del dashboard. Se actualiza con deltas
+    desde frontend.signals y se reconstruye con `manage.py recalcular_kpis`.
+    """
+    residentes_activos = models.IntegerField(default=0)
+    cuotas_pendientes = models.IntegerField(default=0)
+    tickets_abiertos = models.IntegerField(default=0)
+    total_ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resumen_kpis'
+        verbose_name = 'Resumen de KPIs'
+
+    def __str__(self):
+        return f"KPIs ({self.actualizado})"
+
+
+class ResumenFinanciero(models.Model):
+    """
+    Totales de gestion_pagos por mes, tipo de movimiento y categoría.
+    emitido/movimientos van por fecha_emision (sin cancelados); cobrado y
+    cobrado_liquidado (sólo PAGADO) van por fecha_pago. Las señales de Pago
+    recalculan las cubetas que toca cada escritura; `manage.py
+    recalcular_resumen_financiero` la reconstruye completa.
+    """
+    anio = models.PositiveSmallIntegerField()
+    mes = models.PositiveSmallIntegerField()
+    tipo_movimiento = models.CharField(max_length=20)
+    categoria = models.CharField(max_length=50)
+    movimientos = models.PositiveIntegerField(default=0)
+    emitido = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cobrado = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cobrado_liquidado = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'resumen_financiero'
+        verbose_name = 'Resumen Financiero Mensual'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['anio', 'mes', 'tipo_movimiento', 'categoria'],
+                name='uniq_resumen_financiero_cubeta',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.anio}-{self.mes:02d} {self.tipo_movimiento} {self.categoria}"
+
+
+class SecuenciaFolio(models.Model):
+    """
+    Contador de folios (p. ej. recibos 'ING'/'EGR'). Cada proceso reserva
+    bloques de números adelantando `siguiente`; ver frontend/folios.py.
+    """
+    nombre = models.CharField(max_length=20, primary_key=True)
+    siguiente = models.BigIntegerField(default=1)
+
+    class Meta:
+        db_table = 'secuencias_folios'
+        verbose_name = 'Secuencia de Folios'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.siguiente}"
+
+
+class Actividad(models.Model):
+    """
+    Bitácora de solo inserción con los eventos de todos los módulos que se
+    muestran en "Actividad reciente". Se llena desde frontend.signals.
+    """
+    TIPO_CHOICES = [
+        ('pago', 'Pago'),
+        ('ticket', 'Ticket'),
+        ('acceso', 'Acceso'),
+        ('reserva', 'Reserva'),
+        ('reunion', 'Reunión'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
+    evento = models.CharField(max_length=100)
+    detalle = models.CharField(max_length=255, blank=True)
+    usuario = models.CharField(max_length=255, blank=True)
+    unidad = models.CharField(max_length=100, blank=True)
+    objeto_id = models.BigIntegerField(null=True, blank=True)
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'actividad_condominio'
+        verbose_name = 'Actividad'
+        verbose_name_plural = 'Actividades'
+        indexes = [
+            # Paginación por cursor sobre (fecha, id)
+            models.Index(fields=['-fecha', '-id'], name='actividad_fecha_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.evento} - {self.fecha}"
+
+
+class HistorialLogToken(models.Model):
+    """
+    Índice invertido de HistorialLog para motores sin FULLTEXT (en MySQL se
+    usa el índice FULLTEXT de la propia tabla). Ver frontend/busqueda_logs.py.
+    """
+    log = models.ForeignKey(HistorialLog, on_delete=models.CASCADE, related_name='tokens')
+    token = models.CharField(max_length=50)
+
+    class Meta:
+        db_table = 'historiallog_tokens'
+        indexes = [
+            models.Index(fields=['token', 'log'], name='historiallog_token_idx'),
+        ]
@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+
+def normalizar(texto):
+    """
+    Minúsculas, sin acentos y con cualquier signo convertido en espacio:
+    'María-José  LÓPEZ' -> 'maria jose lopez'.
+    """
+    sin_acentos = ''.join(
+        c for c in unicodedata.normalize('NFKD', texto or '')
+        if not unicodedata.combining(c)
+    )
+    return ' '.join(re.findall(r'[^\W_]+', sin_acentos.lower()))
+
+
+def trigramas(texto):
+    """
+    Trigramas de cada palabra de un texto ya normalizado, al estilo pg_trgm
+    (dos espacios al inicio y uno al final): 'ana' -> {'  a', ' an', 'ana', 'na '}.
+    """
+    resultado = set()
+    for palabra in texto.split():
+        relleno = f"  {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return resultado
@@ -0,0 +1,73 @@
+import base64
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+
+def codificar_cursor(valor, pk):
+    texto = valor.isoformat() if hasattr(valor, 'isoformat') else str(valor)
+    crudo = f"{texto}|{pk}".encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, campo_modelo):
+    """
+    Devuelve (valor, pk) o None si el cursor está vacío o mal formado.
+    `campo_modelo` convierte el texto guardado al tipo de la columna.
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        texto, pk = base64.urlsafe_b64decode(cursor + relleno).decode().rsplit('|', 1)
+        valor = campo_modelo.to_python(texto)
+        if valor is None:
+            return None
+        return valor, int(pk)
+    except (ValueError, UnicodeDecodeError, ValidationError):
+        return None
+
+
+def pagina_keyset(qs, cursor, limite, campo='fecha', descendente=True):
+    """
+    Paginación por cursor sobre (campo, id): cada página es un rango del
+    índice, sin COUNT(*) ni OFFSET. `campo` no debe admitir NULL.
+    Devuelve (filas, siguiente_cursor).
+    """
+    signo, comparador = ('-', 'lt') if descendente else ('', 'gt')
+    qs = qs.order_by(f'{signo}{campo}', f'{signo}id')
+    posicion = decodificar_cursor(cursor, qs.model._meta.get_field(campo))
+    if posicion:
+        valor, pk = posicion
+        qs = qs.filter(
+            Q(**{f'{campo}__{comparador}': valor})
+            | Q(**{campo: valor, f'id__{comparador}': pk})
+        )
+
+    filas = list(qs[:limite + 1])
+    siguiente = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        ultima = filas[-1]
+        siguiente = codificar_cursor(getattr(ultima, campo), ultima.pk)
+    return filas, siguiente
+
+
+def total_aproximado(modelo):
+    """
+    Número aproximado de filas de la tabla. En MySQL se lee de las
+    estadísticas de InnoDB (information_schema) en vez de hacer COUNT(*);
+    en otros motores se cuenta.
+    """
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [modelo._meta.db_table],
+            )
+            fila = cursor.fetchone()
+        if fila and fila[0] is not None:
+            return fila[0]
+    return modelo.objects.count()
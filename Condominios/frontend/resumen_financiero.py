@@ -0,0 +1,142 @@
+"""
+Tabla de resumen ResumenFinanciero: una fila por (año, mes, tipo de
+movimiento, categoría). Cada escritura de Pago recalcula sólo las cubetas
+que toca (la de su fecha de emisión y la de su fecha de pago, antes y
+después del cambio) con dos agregados sobre los índices
+(tipo_movimiento, categoria, fecha); los dashboards leen de aquí.
+"""
+import calendar
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .models import Pago, ResumenFinanciero, EstadoPago
+
+CAMPOS = ('movimientos', 'emitido', 'cobrado', 'cobrado_liquidado', 'actualizado')
+TAMANO_LOTE = 1000
+
+
+def _fecha(valor):
+    # El save() puede recibir la fecha como texto del formulario.
+    return Pago._meta.get_field('fecha_emision').to_python(valor)
+
+
+def cubetas(valores):
+    """
+    Cubetas (anio, mes, tipo_movimiento, categoria) a las que aporta un pago,
+    dado un dict con tipo_movimiento, categoria, fecha_emision y fecha_pago.
+    """
+    if not valores:
+        return set()
+    clave = (valores['tipo_movimiento'], valores['categoria'])
+    resultado = set()
+    for campo in ('fecha_emision', 'fecha_pago'):
+        fecha = _fecha(valores.get(campo))
+        if fecha:
+            resultado.add((fecha.year, fecha.month) + clave)
+    return resultado
+
+
+def _rango(anio, mes):
+    return date(anio, mes, 1), date(anio, mes, calendar.monthrange(anio, mes)[1])
+
+
+def _calcular(anio, mes, tipo_movimiento, categoria):
+    rango = _rango(anio, mes)
+    pagos = Pago.objects.filter(tipo_movimiento=tipo_movimiento, categoria=categoria)
+    emitidos = pagos.filter(fecha_emision__range=rango).exclude(
+        estado=EstadoPago.CANCELADO
+    ).aggregate(movimientos=Count('id'), emitido=Sum('monto_total'))
+    cobrados = pagos.filter(
+        Q(fecha_pago__range=rango) | Q(fecha_pago__isnull=True, fecha_emision__range=rango),
+        monto_pagado__gt=0,
+    ).aggregate(
+        cobrado=Sum('monto_pagado'),
+        cobrado_liquidado=Sum('monto_pagado', filter=Q(estado=EstadoPago.PAGADO)),
+    )
+    return ResumenFinanciero(
+        anio=anio, mes=mes, tipo_movimiento=tipo_movimiento, categoria=categoria,
+        movimientos=emitidos['movimientos'],
+        emitido=emitidos['emitido'] or 0,
+        cobrado=cobrados['cobrado'] or 0,
+        cobrado_liquidado=cobrados['cobrado_liquidado'] or 0,
+        actualizado=timezone.now(),
+    )
+
+
+def _guardar(filas):
+    opciones = {'update_conflicts': True, 'update_fields': CAMPOS, 'batch_size': TAMANO_LOTE}
+    # MySQL resuelve el conflicto por cualquier llave única y no acepta que se indique cuál.
+    if connection.features.supports_update_conflicts_with_target:
+        opciones['unique_fields'] = ['anio', 'mes', 'tipo_movimiento', 'categoria']
+    ResumenFinanciero.objects.bulk_create(filas, **opciones)
+
+
+def recalcular(claves):
+    """
+    Recalcula desde gestion_pagos las cubetas indicadas y las guarda con un upsert.
+    """
+    claves = {c for c in claves if c and all(p is not None for p in c)}
+    if claves:
+        with transaction.atomic():
+            _guardar([_calcular(*c) for c in sorted(claves)])
+
+
+def recalcular_todo():
+    """
+    Reconstruye la tabla completa con dos GROUP BY (comando
+    recalcular_resumen_financiero). Devuelve cuántas cubetas quedaron.
+    """
+    filas = {}
+
+    def fila(anio, mes, tipo, categoria):
+        clave = (anio, mes, tipo, categoria)
+        if clave not in filas:
+            filas[clave] = ResumenFinanciero(
+                anio=anio, mes=mes, tipo_movimiento=tipo, categoria=categoria,
+                actualizado=timezone.now(),
+            )
+        return filas[clave]
+
+    emitidos = (
+        Pago.objects.exclude(estado=EstadoPago.CANCELADO)
+        .annotate(anio=ExtractYear('fecha_emision'), mes=ExtractMonth('fecha_emision'))
+        .values('anio', 'mes', 'tipo_movimiento', 'categoria')
+        .annotate(movimientos=Count('id'), emitido=Sum('monto_total'))
+        .order_by()
+    )
+    for e in emitidos:
+        f = fila(e['anio'], e['mes'], e['tipo_movimiento'], e['categoria'])
+        f.movimientos, f.emitido = e['movimientos'], e['emitido'] or 0
+
+    cobrados = (
+        Pago.objects.filter(monto_pagado__gt=0)
+        .annotate(fecha=Coalesce('fecha_pago', 'fecha_emision'))
+        .annotate(anio=ExtractYear('fecha'), mes=ExtractMonth('fecha'))
+        .values('anio', 'mes', 'tipo_movimiento', 'categoria')
+        .annotate(
+            cobrado=Sum('monto_pagado'),
+            cobrado_liquidado=Sum('monto_pagado', filter=Q(estado=EstadoPago.PAGADO)),
+        )
+        .order_by()
+    )
+    for c in cobrados:
+        f = fila(c['anio'], c['mes'], c['tipo_movimiento'], c['categoria'])
+        f.cobrado, f.cobrado_liquidado = c['cobrado'] or 0, c['cobrado_liquidado'] or 0
+
+    with transaction.atomic():
+        ResumenFinanciero.objects.all().delete()
+        ResumenFinanciero.objects.bulk_create(filas.values(), batch_size=TAMANO_LOTE)
+    return len(filas)
+
+
+def total(campo, **filtros):
+    """
+    Suma de `campo` sobre las cubetas que cumplen `filtros`, p. ej.
+    total('cobrado', anio=2025, mes=3, tipo_movimiento='INGRESO').
+    """
+    return ResumenFinanciero.objects.filter(**filtros).aggregate(t=Sum(campo))['t'] or Decimal('0')
@@ -0,0 +1,88 @@
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Q, Sum
+from django.utils import timezone
+
+from .models import Pago, Residente, SaldoResidente, EstadoPago
+
+ESTADOS_ADEUDO = (EstadoPago.PENDIENTE, EstadoPago.VENCIDO)
+CAMPOS = ('saldo', 'saldo_vencido', 'fecha_adeudo_mas_antiguo', 'cargos_vencidos', 'actualizado')
+TAMANO_LOTE = 1000
+
+
+def _adeudos(residente_ids):
+    """
+    {residente_id: {saldo, saldo_vencido, fecha_adeudo_mas_antiguo, cargos_vencidos}}
+    agrupando sólo los cargos de esos residentes (índice por residente_id).
+    """
+    filas = (
+        Pago.objects.filter(
+            residente_id__in=residente_ids,
+            tipo_movimiento='INGRESO',
+            estado__in=ESTADOS_ADEUDO,
+        )
+        .values('residente_id')
+        .annotate(
+            saldo=Sum(F('monto_total') - F('monto_pagado')),
+            saldo_vencido=Sum(
+                F('monto_total') - F('monto_pagado'), filter=Q(estado=EstadoPago.VENCIDO)
+            ),
+            fecha_adeudo_mas_antiguo=Min('fecha_emision'),
+            cargos_vencidos=Count('id', filter=Q(estado=EstadoPago.VENCIDO)),
+        )
+        .order_by()
+    )
+    return {f.pop('residente_id'): f for f in filas}
+
+
+def _guardar(filas):
+    opciones = {'update_conflicts': True, 'update_fields': CAMPOS}
+    # MySQL resuelve el conflicto por cualquier llave única y no acepta que se indique cuál.
+    if connection.features.supports_update_conflicts_with_target:
+        opciones['unique_fields'] = ['residente']
+    SaldoResidente.objects.bulk_create(filas, **opciones)
+
+
+def recalcular(residente_ids):
+    """
+    Recalcula el saldo de los residentes indicados desde sus cargos y lo
+    guarda con un solo upsert. Ids None o de residentes borrados se ignoran.
+    """
+    ids = {i for i in residente_ids if i is not None}
+    if not ids:
+        return
+    with transaction.atomic():
+        existentes = set(Residente.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        adeudos = _adeudos(existentes)
+        ahora = timezone.now()
+        _guardar([
+            SaldoResidente(
+                residente_id=rid,
+                saldo=adeudos.get(rid, {}).get('saldo') or 0,
+                saldo_vencido=adeudos.get(rid, {}).get('saldo_vencido') or 0,
+                fecha_adeudo_mas_antiguo=adeudos.get(rid, {}).get('fecha_adeudo_mas_antiguo'),
+                cargos_vencidos=adeudos.get(rid, {}).get('cargos_vencidos') or 0,
+                actualizado=ahora,
+            )
+            for rid in existentes
+        ])
+
+
+def recalcular_de_pagos(pago_ids):
+    """
+    Para escrituras masivas sobre Pago: recalcula los residentes dueños de esos pagos.
+    """
+    recalcular(
+        Pago.objects.filter(pk__in=pago_ids, residente__isnull=False)
+        .values_list('residente_id', flat=True).distinct()
+    )
+
+
+def recalcular_todos(tamano_lote=TAMANO_LOTE):
+    """
+    Reconstruye la tabla completa (comando recalcular_saldos).
+    """
+    ids = list(Residente.objects.order_by('pk').values_list('pk', flat=True))
+    for i in range(0, len(ids), tamano_lote):
+        recalcular(ids[i:i + tamano_lote])
+    SaldoResidente.objects.exclude(residente_id__in=Residente.objects.values('pk')).delete()
+    return len(ids)
@@ -0,0 +1,124 @@
+from django.apps import apps
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import (
+    actividad, busqueda_logs, busqueda_residentes, cache_fragmentos, indicadores, resumen_financiero, saldos,
+)
+from .models import Residente, Pago, Ticket, ControlAcceso, Reserva, Reunion, HistorialLog
+
+
+def _valores(instance, campos):
+    return {campo: getattr(instance, campo) for campo in campos}
+
+
+# --- KPIs del dashboard ---
+
+@receiver(pre_save, sender=Residente)
+@receiver(pre_save, sender=Pago)
+@receiver(pre_save, sender=Ticket)
+def guardar_valores_previos(sender, instance, **kwargs):
+    """
+    Guarda en la instancia los valores que tenía la fila antes del save,
+    para que post_save pueda aplicar sólo la diferencia.
+    """
+    campos = indicadores.CAMPOS_KPI[sender]
+    instance._kpi_previo = None
+    if instance.pk:
+        instance._kpi_previo = (
+            sender.objects.filter(pk=instance.pk).values(*campos).first()
+        )
+
+
+@receiver(post_save, sender=Residente)
+@receiver(post_save, sender=Pago)
+@receiver(post_save, sender=Ticket)
+def actualizar_kpis_al_guardar(sender, instance, **kwargs):
+    campos = indicadores.CAMPOS_KPI[sender]
+    antes = getattr(instance, '_kpi_previo', None)
+    indicadores.aplicar_delta(
+        **indicadores.diferencia(sender, antes, _valores(instance, campos))
+    )
+
+
+@receiver(post_delete, sender=Residente)
+@receiver(post_delete, sender=Pago)
+@receiver(post_delete, sender=Ticket)
+def actualizar_kpis_al_eliminar(sender, instance, **kwargs):
+    campos = indicadores.CAMPOS_KPI[sender]
+    indicadores.aplicar_delta(
+        **indicadores.diferencia(sender, _valores(instance, campos), None)
+    )
+
+
+# --- Versiones de los fragmentos cacheados del dashboard ---
+
+def invalidar_fragmentos(sender, update_fields=None, **kwargs):
+    # El login sólo guarda last_login, que ninguna sección muestra
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    cache_fragmentos.invalidar(sender.__name__)
+
+
+for _nombre in cache_fragmentos.MODELOS_VERSIONADOS:
+    _modelo = apps.get_model(cache_fragmentos.APP_DEL_MODELO.get(_nombre, 'frontend'), _nombre)
+    post_save.connect(invalidar_fragmentos, sender=_modelo, dispatch_uid=f'fragmentos_save_{_nombre}')
+    post_delete.connect(invalidar_fragmentos, sender=_modelo, dispatch_uid=f'fragmentos_delete_{_nombre}')
+
+
+# --- Feed de actividad reciente ---
+
+@receiver(post_save, sender=Pago)
+@receiver(post_save, sender=Ticket)
+@receiver(post_save, sender=ControlAcceso)
+@receiver(post_save, sender=Reserva)
+@receiver(post_save, sender=Reunion)
+def registrar_actividad(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        actividad.registrar(instance)
+
+
+# --- Índice de búsqueda del historial (motores sin FULLTEXT) ---
+
+@receiver(post_save, sender=HistorialLog)
+def indexar_log(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        busqueda_logs.indexar(instance)
+
+
+# --- Índice de trigramas para buscar residentes ---
+
+@receiver(post_save, sender=Residente)
+def indexar_residente(sender, instance, raw=False, **kwargs):
+    if not raw:
+        busqueda_residentes.indexar(instance)
+
+
+# --- Saldos por residente ---
+
+@receiver(post_save, sender=Pago)
+@receiver(post_delete, sender=Pago)
+def actualizar_saldo(sender, instance, **kwargs):
+    """
+    Recalcula el saldo del residente del pago (y del anterior si el pago
+    cambió de dueño). Corre después de los receptores de KPIs, que dejan
+    los valores previos en _kpi_previo.
+    """
+    previo = getattr(instance, '_kpi_previo', None) or {}
+    saldos.recalcular({instance.residente_id, previo.get('residente_id')})
+
+
+# --- Resumen financiero mensual ---
+
+@receiver(post_save, sender=Pago)
+@receiver(post_delete, sender=Pago)
+def actualizar_resumen_financiero(sender, instance, **kwargs):
+    """
+    Recalcula las cubetas del pago antes y después del cambio (mes de
+    emisión y de pago, tipo y categoría).
+    """
+    previo = getattr(instance, '_kpi_previo', None)
+    actual = _valores(instance, indicadores.CAMPOS_KPI[Pago])
+    resumen_financiero.recalcular(
+        resumen_financiero.cubetas(previo) | resumen_financiero.cubetas(actual)
+    )
@@ -0,0 +1,110 @@
+"""
+SLA de tickets: plazo por prioridad (settings.SLA_TICKETS_HORAS), barrido
+de escalamiento y percentiles de tiempo de resolución.
+
+Ticket.save() sella vence_en y fecha_cierre uno por uno; aquí todo se hace
+por conjuntos, con un UPDATE o una consulta por prioridad o percentil, sin
+recorrer los tickets en Python.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F
+from django.utils import timezone
+
+from . import agregados
+from .models import Prioridad, Ticket
+
+ESTADO_CERRADO = 'CERRADO'
+PERCENTILES = (50, 90, 95)
+# Prioridad a la que sube un ticket vencido; EMERGENCIA se queda igual.
+SIGUIENTE_PRIORIDAD = dict(zip(Prioridad.values, Prioridad.values[1:] + [Prioridad.EMERGENCIA]))
+
+
+def sellar_sin_vencimiento():
+    """
+    vence_en = fecha_creacion + plazo para los tickets que no lo tienen
+    (los creados con bulk_create o por fuera de la aplicación).
+    """
+    total = 0
+    for prioridad in Prioridad.values:
+        total += Ticket.objects.filter(vence_en__isnull=True, prioridad=prioridad).update(
+            vence_en=F('fecha_creacion') + Ticket.plazo_sla(prioridad)
+        )
+    return total
+
+
+def escalar(ahora=None):
+    """
+    Escala los tickets abiertos con el plazo vencido: suben un nivel de
+    prioridad, nivel_escalamiento + 1 y un plazo nuevo desde ahora según la
+    prioridad nueva. Un UPDATE por prioridad, de la más alta a la más baja;
+    los recién escalados ya no están vencidos, así que no se escalan dos
+    veces en el mismo barrido. Devuelve {prioridad anterior: tickets}.
+    """
+    ahora = ahora or timezone.now()
+    escalados = {}
+    with transaction.atomic():
+        sellar_sin_vencimiento()
+        for prioridad in reversed(Prioridad.values):
+            nueva = SIGUIENTE_PRIORIDAD[prioridad]
+            n = Ticket.objects.filter(vence_en__lt=ahora, prioridad=prioridad).exclude(
+                estado=ESTADO_CERRADO
+            ).update(
+                prioridad=nueva,
+                nivel_escalamiento=F('nivel_escalamiento') + 1,
+                vence_en=ahora + Ticket.plazo_sla(nueva),
+                updated_at=ahora,
+            )
+            if n:
+                escalados[prioridad] = n
+    if escalados:
+        # Prioridad y plazo no entran en los KPIs: sólo se invalidan los fragmentos.
+        agregados.tras_escritura_masiva('Ticket')
+    return escalados
+
+
+def percentiles_resolucion(tickets=None, percentiles=PERCENTILES):
+    """
+    {percentil: timedelta} del tiempo entre apertura y cierre de los tickets
+    de `tickets` (por defecto, todos) con hora de cierre conocida, por rango
+    más cercano: un COUNT y una consulta ordenada con OFFSET por percentil,
+    porque MySQL no tiene PERCENTILE_CONT. Vacío si no hay ninguno.
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    cerrados = tickets.filter(fecha_cierre__isnull=False).annotate(
+        resolucion=ExpressionWrapper(F('fecha_cierre') - F('fecha_creacion'), output_field=DurationField())
+    )
+    total = cerrados.count()
+    if not total:
+        return {}
+    ordenados = cerrados.order_by('resolucion').values_list('resolucion', flat=True)
+    return {
+        p: ordenados[max(math.ceil(p / 100 * total), 1) - 1]
+        for p in percentiles
+    }
+
+
+def resumen(tickets=None, ahora=None):
+    """
+    Indicadores de SLA para reportes: percentiles de resolución en horas,
+    porcentaje de cerrados dentro del plazo y abiertos ya vencidos.
+    """
+    if tickets is None:
+        tickets = Ticket.objects.all()
+    ahora = ahora or timezone.now()
+    # Los cerrados antes de la 0030 no tienen hora de cierre real (fecha_cierre NULL): no cuentan.
+    cerrados = tickets.filter(fecha_cierre__isnull=False, vence_en__isnull=False)
+    total_cerrados = cerrados.count()
+    # Un escalado ya incumplió su plazo original aunque cierre antes del nuevo.
+    a_tiempo = cerrados.filter(nivel_escalamiento=0, fecha_cierre__lte=F('vence_en')).count()
+    return {
+        'percentiles_horas': [
+            (p, round(duracion.total_seconds() / 3600, 1))
+            for p, duracion in percentiles_resolucion(tickets).items()
+        ],
+        'cerrados': total_cerrados,
+        'cumplimiento': round(100 * a_tiempo / total_cerrados, 1) if total_cerrados else None,
+        'vencidos_abiertos': tickets.filter(vence_en__lt=ahora).exclude(estado=ESTADO_CERRADO).count(),
+    }
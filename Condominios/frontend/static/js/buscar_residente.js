@@ -0,0 +1,46 @@
+// Autocompletado de residentes activos.
+// Uso: <input data-buscar-residente data-destino="<id del input oculto>" list="<id de un datalist>">
+// Las sugerencias se piden a /api/residentes/buscar/ (URL en data-url de este <script>)
+// y el id del residente elegido se copia al input oculto, que es el que se envía.
+(function () {
+    const URL_BUSQUEDA = document.currentScript.dataset.url;
+    let temporizador = null;
+
+    function opcionElegida(input, lista) {
+        return Array.from(lista.options).find(o => o.value === input.value);
+    }
+
+    // Delegación en document: funciona también con las secciones del dashboard cargadas por fetch
+    document.addEventListener('input', (e) => {
+        const input = e.target;
+        if (!input.matches('[data-buscar-residente]')) return;
+
+        const destino = document.getElementById(input.dataset.destino);
+        const lista = document.getElementById(input.getAttribute('list'));
+        const elegida = opcionElegida(input, lista);
+
+        destino.value = elegida ? elegida.dataset.id : '';
+        input.setCustomValidity(
+            elegida || (!input.value && !input.required) ? '' : 'Seleccione un residente de la lista.'
+        );
+        if (elegida) return;
+
+        clearTimeout(temporizador);
+        const q = input.value.trim();
+        if (!q) return;
+
+        temporizador = setTimeout(() => {
+            fetch(`${URL_BUSQUEDA}?q=${encodeURIComponent(q)}`)
+                .then(r => r.json())
+                .then(data => {
+                    lista.innerHTML = '';
+                    data.results.forEach(r => {
+                        const opcion = document.createElement('option');
+                        opcion.value = `${r.unidad_principal} - ${r.nombre_completo}`;
+                        opcion.dataset.id = r.id;
+                        lista.appendChild(opcion);
+                    });
+                });
+        }, 200);
+    });
+})();
@@ -1,3 +1,951 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+
+from . import (
+    abonos, asignacion, busqueda_logs, busqueda_residentes, conciliacion, estacionamiento, facturacion, folios,
+    cache_fragmentos, importacion, indicadores, resumen_financiero, saldos, sla,
+)
+from .models import (
+    Abono, AplicacionAbono, ControlAcceso, Documento, Empleado, EspacioEstacionamiento, EstadoMovimiento, HistorialLog,
+    MovimientoBancario, Pago, Proveedor, Reserva, Residente, ResumenFinanciero, ResumenKPI, SaldoResidente,
+    SecuenciaFolio, Ticket, Usuario,
+)
+from .paginacion import pagina_keyset
+
+
+# Tablas con índices compuestos para los filtros de las vistas (migración 0027).
+TABLAS_VIGILADAS = {m._meta.db_table for m in (Pago, Ticket, Reserva, ControlAcceso)}
+
+VISTAS = [
+    ('dashboard_pagos', {}),
+    ('dashboard_tickets', {}),
+    ('dashboard_areas', {}),
+    ('dashboard_accesos', {}),
+    ('dashboard_reportes', {}),
+    ('dashboard_seccion', {'seccion': 'pagos'}),
+    ('dashboard_seccion', {'seccion': 'tickets'}),
+    ('dashboard_seccion', {'seccion': 'seguridad'}),
+    ('dashboard_seccion', {'seccion': 'areas'}),
+]
+
+
+@skipUnless(connection.vendor == 'mysql', "EXPLAIN de MySQL: sólo corre contra la base MySQL")
+class PlanesDeConsultaTests(TransactionTestCase):
+    """
+    Corre EXPLAIN sobre cada consulta que hacen las vistas y falla si
+    alguna recorre completa (type = ALL) una de TABLAS_VIGILADAS. Los datos
+    salen de seed_demo_data y se hace ANALYZE TABLE para que el optimizador
+    tenga estadísticas reales. Es TransactionTestCase porque ANALYZE TABLE
+    hace commit implícito.
+    """
+
+    def setUp(self):
+        call_command('seed_demo_data', stdout=StringIO())
+        with connection.cursor() as cursor:
+            for tabla in sorted(TABLAS_VIGILADAS):
+                cursor.execute(f"ANALYZE TABLE {connection.ops.quote_name(tabla)}")
+                cursor.fetchall()
+        admin = User.objects.create_superuser('explain', 'explain@demo.condogest', 'x')
+        self.client.force_login(admin)
+
+    def _recorridos_completos(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            columnas = [c[0] for c in cursor.description]
+            filas = [dict(zip(columnas, f)) for f in cursor.fetchall()]
+        return [f['table'] for f in filas if f['type'] == 'ALL' and f['table'] in TABLAS_VIGILADAS]
+
+    def test_vistas_sin_recorrido_completo(self):
+        for nombre, kwargs in VISTAS:
+            url = reverse(nombre, kwargs=kwargs)
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as consultas:
+                    respuesta = self.client.get(url)
+                self.assertEqual(respuesta.status_code, 200)
+                for consulta in consultas.captured_queries:
+                    sql = consulta['sql']
+                    if not sql.lstrip().upper().startswith('SELECT'):
+                        continue
+                    tablas = self._recorridos_completos(sql)
+                    self.assertFalse(tablas, f"Recorrido completo de {tablas} en {url}:\n{sql}")
+
+
+def crear_residente(unidad='A101', dni='DNI101', **extra):
+    campos = dict(nombre_completo=f"Residente {unidad}", tipo_residente=Residente.PROPIETARIO, estado=Residente.ACTIVO)
+    campos.update(extra)
+    return Residente.objects.create(unidad_principal=unidad, dni=dni, **campos)
+
+
+def crear_cargo(residente, monto, fecha_emision, **extra):
+    campos = dict(tipo_movimiento='INGRESO', categoria='CUOTA_ORDINARIA', descripcion='Cuota')
+    campos.update(extra)
+    return Pago.objects.create(residente=residente, monto_total=Decimal(monto), fecha_emision=fecha_emision, **campos)
+
+
+def resumen_al_vuelo_y_reconstruido():
+    """
+    Filas de ResumenFinanciero mantenidas por las señales y las que deja
+    recalcular_todo(). Al vuelo pueden quedar cubetas en cero (p. ej. tras
+    borrar su único pago); la reconstrucción no las crea, así que no cuentan.
+    """
+    columnas = ('anio', 'mes', 'tipo_movimiento', 'categoria', 'movimientos', 'emitido', 'cobrado', 'cobrado_liquidado')
+    con_datos = ResumenFinanciero.objects.exclude(movimientos=0, cobrado=0)
+    al_vuelo = set(con_datos.values_list(*columnas))
+    resumen_financiero.recalcular_todo()
+    return al_vuelo, set(con_datos.values_list(*columnas))
+
+
+def estado_de_cuenta(*lineas):
+    return BytesIO(("fecha,monto,referencia\n" + "\n".join(lineas)).encode())
+
+
+class ConciliacionTests(TestCase):
+
+    def setUp(self):
+        # Los bloques de folios viven en memoria del proceso; cada prueba parte de la base limpia.
+        folios._bloques.clear()
+        self.residente = crear_residente()
+        self.cargo = crear_cargo(self.residente, '1500.00', date(2026, 3, 1))
+
+    def test_concilia_deposito_con_unico_residente(self):
+        resultado = conciliacion.importar(estado_de_cuenta("2026-03-05,1500.00,DEP A-101"))
+        self.assertEqual(resultado['conciliados'], 1)
+        self.cargo.refresh_from_db()
+        self.assertEqual(self.cargo.estado, 'PAGADO')
+        movimiento = MovimientoBancario.objects.get()
+        self.assertEqual(movimiento.pago_id, self.cargo.pk)
+        self.assertEqual(movimiento.abono.numero_recibo, 'ING-00000001')
+
+    def test_reimportar_no_duplica(self):
+        conciliacion.importar(estado_de_cuenta("2026-03-05,1500.00,DEP A-101"))
+        resultado = conciliacion.importar(estado_de_cuenta("2026-03-05,1500.00,DEP A-101"))
+        self.assertEqual(resultado['nuevos'], 0)
+        self.assertEqual(Abono.objects.count(), 1)
+
+    def test_sin_coincidencia_y_revision(self):
+        otro = crear_residente('B202', 'DNI202')
+        crear_cargo(otro, '1500.00', date(2026, 3, 1))
+        conciliacion.importar(estado_de_cuenta(
+            "2026-03-05,999.00,DEP A-101",
+            "2026-03-05,1500.00,A101 B202",
+        ))
+        estados = dict(MovimientoBancario.objects.values_list('monto', 'estado'))
+        self.assertEqual(estados[Decimal('999.00')], EstadoMovimiento.SIN_COINCIDENCIA)
+        self.assertEqual(estados[Decimal('1500.00')], EstadoMovimiento.REVISION)
+        self.assertFalse(Abono.objects.exists())
+
+    def test_conciliacion_deshecha_no_repite_folios(self):
+        with mock.patch.object(conciliacion, '_guardar_movimientos', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                conciliacion.importar(estado_de_cuenta("2026-03-05,1500.00,DEP A-101"))
+        self.assertFalse(Abono.objects.exists())
+        self.cargo.refresh_from_db()
+        self.assertEqual(self.cargo.estado, 'PENDIENTE')
+
+        # El bloque reservado sobrevive al rollback: ni este proceso ni otro reparten ING-00000001 otra vez.
+        tamano = folios.settings.FOLIOS_TAMANO_BLOQUE
+        self.assertEqual(SecuenciaFolio.objects.get(nombre='ING').siguiente, 1 + tamano)
+        self.assertEqual(folios.numero_recibo('INGRESO'), 'ING-00000002')
+        folios._bloques.clear()  # otro proceso
+        self.assertEqual(folios.numero_recibo('INGRESO'), f"ING-{1 + tamano:08d}")
+
+    def test_resolver_asigna_folio_fuera_de_la_transaccion(self):
+        movimiento = MovimientoBancario.objects.create(
+            fecha=date(2026, 3, 5), monto=Decimal('1500.00'), huella='x', estado=EstadoMovimiento.REVISION,
+        )
+        with mock.patch.object(conciliacion.abonos, 'aplicar', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                conciliacion.resolver(movimiento.pk, self.cargo)
+        movimiento = conciliacion.resolver(movimiento.pk, self.cargo)
+        self.assertEqual(movimiento.estado, EstadoMovimiento.CONCILIADO)
+        self.assertEqual(movimiento.abono.numero_recibo, 'ING-00000002')
+
+
+class SlaTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+
+    def crear_ticket(self, **extra):
+        return Ticket.objects.create(residente=self.residente, tipo_solicitud='Otro', asunto='Fuga', **extra)
+
+    def test_creado_cerrado_no_tiene_resolucion_negativa(self):
+        ticket = self.crear_ticket(estado='CERRADO', prioridad='ALTA')
+        ticket.refresh_from_db()
+        self.assertGreaterEqual(ticket.fecha_cierre, ticket.fecha_creacion)
+        self.assertEqual(ticket.vence_en, ticket.fecha_creacion + Ticket.plazo_sla('ALTA'))
+        self.assertGreaterEqual(sla.percentiles_resolucion()[50], timedelta(0))
+
+    def test_cerrado_sin_hora_real_no_se_sella_al_guardar(self):
+        ticket = self.crear_ticket(estado='CERRADO')
+        # Como los cerrados antes de la 0030: sin hora de cierre.
+        Ticket.objects.filter(pk=ticket.pk).update(fecha_cierre=None)
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        ticket.asunto = 'Fuga en baño'
+        ticket.save()
+        ticket.refresh_from_db()
+        self.assertIsNone(ticket.fecha_cierre)
+
+        ticket.estado = 'ABIERTO'
+        ticket.save()
+        ticket.estado = 'CERRADO'
+        ticket.save()
+        self.assertIsNotNone(ticket.fecha_cierre)
+
+    def test_percentiles_y_cumplimiento_ignoran_cierres_desconocidos(self):
+        apertura = timezone.now() - timedelta(days=10)
+        for horas in (1, 2, 3, 4):
+            ticket = self.crear_ticket(estado='CERRADO')
+            Ticket.objects.filter(pk=ticket.pk).update(
+                fecha_creacion=apertura, fecha_cierre=apertura + timedelta(hours=horas),
+            )
+        sin_cierre = self.crear_ticket(estado='CERRADO')
+        Ticket.objects.filter(pk=sin_cierre.pk).update(fecha_creacion=apertura, fecha_cierre=None)
+
+        percentiles = sla.percentiles_resolucion(percentiles=(50, 100))
+        self.assertEqual(percentiles, {50: timedelta(hours=2), 100: timedelta(hours=4)})
+        resumen = sla.resumen()
+        self.assertEqual(resumen['cerrados'], 4)
+
+    def test_tablero_no_responde_304_cuando_un_ticket_se_vence(self):
+        ticket = self.crear_ticket()
+        self.client.force_login(User.objects.create_superuser('sla', 'sla@demo.condogest', 'x'))
+        url = reverse('dashboard_tickets')
+        self.client.get(url)  # la primera respuesta fija la cookie CSRF, que entra en el ETag
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Pasa el plazo: ninguna fila cambia (update() no toca updated_at), pero la página sí.
+        Ticket.objects.filter(pk=ticket.pk).update(vence_en=timezone.now() - timedelta(minutes=1))
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertContains(respuesta, 'sla-vencido')
+
+
+class FragmentoLogsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('logs', 'logs@demo.condogest', 'x'))
+        for i in range(3):
+            HistorialLog.objects.create(accion='EDICION', modulo='Pagos', descripcion=f"Cambio {i}")
+
+    def test_fragmento_en_cache_no_consulta_el_historial(self):
+        url = reverse('dashboard_seccion', kwargs={'seccion': 'logs'})
+        tabla = connection.ops.quote_name(HistorialLog._meta.db_table)
+
+        def consultas_al_historial():
+            with CaptureQueriesContext(connection) as consultas:
+                respuesta = self.client.get(url)
+            self.assertContains(respuesta, 'Cambio 2')
+            return [c['sql'] for c in consultas.captured_queries if 'ORDER BY' in c['sql'] and tabla in c['sql']]
+
+        self.assertTrue(consultas_al_historial())
+        self.assertEqual(consultas_al_historial(), [])
+
+
+class FragmentosDashboardTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin1', 'admin1@demo.condogest', 'x')
+        self.client.force_login(self.admin)
+
+    def seccion(self, nombre, cliente=None):
+        return (cliente or self.client).get(reverse('dashboard_seccion', kwargs={'seccion': nombre}))
+
+    def test_otra_conexion_ve_la_nueva_version(self):
+        # Los comandos y los demás procesos web tienen su propia conexión a la caché.
+        otra = caches.create_connection('default')
+        antes = cache_fragmentos.versiones_secciones()['usuarios']
+        self.assertEqual(otra.get(cache_fragmentos._llave('User')), int(antes))
+
+        cache_fragmentos.invalidar('User')
+        self.assertEqual(otra.get(cache_fragmentos._llave('User')), int(antes) + 1)
+
+    def test_documentacion_en_cache_se_invalida_al_borrar(self):
+        documento = Documento.objects.create(nombre='acta-enero.pdf', archivo='documentos/acta-enero.pdf', tipo='PDF')
+        self.assertContains(self.seccion('documentacion'), 'acta-enero.pdf')
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertContains(self.seccion('documentacion'), 'acta-enero.pdf')
+        tabla = connection.ops.quote_name(Documento._meta.db_table)
+        self.assertFalse([c for c in consultas.captured_queries if tabla in c['sql']])
+
+        self.client.post(reverse('eliminar_documento', args=[documento.id]))
+        self.assertNotContains(self.seccion('documentacion'), 'acta-enero.pdf')
+
+    def test_usuarios_en_cache_usa_el_token_csrf_de_cada_sesion(self):
+        otro = User.objects.create_superuser('admin2', 'admin2@demo.condogest', 'x')
+        baja = User.objects.create_user('saliente', 'saliente@demo.condogest', 'x')
+        Usuario.objects.create(user=baja, rol='residente')
+        self.seccion('usuarios')  # admin1 deja el fragmento en caché
+
+        cliente = Client(enforce_csrf_checks=True)
+        cliente.force_login(otro)
+        respuesta = self.seccion('usuarios', cliente)
+        self.assertContains(respuesta, 'saliente')
+        token = respuesta.context['csrf_token']
+        self.assertContains(respuesta, f'value="{token}"')
+
+        respuesta = cliente.post(reverse('eliminar_usuario', args=[baja.id]), {'csrfmiddlewaretoken': token})
+        self.assertEqual(respuesta.status_code, 302)
+        self.assertNotContains(self.seccion('usuarios'), 'saliente')
+
+    def test_iniciar_sesion_no_invalida_usuarios(self):
+        antes = cache_fragmentos.versiones_secciones()['usuarios']
+        self.assertTrue(Client().login(username='admin1', password='x'))
+        self.assertEqual(cache_fragmentos.versiones_secciones()['usuarios'], antes)
+
+
+class FacturacionTests(TestCase):
+
+    def setUp(self):
+        crear_residente('A101', 'DNI101')
+        crear_residente('A102', 'DNI102')
+        crear_residente('B201', 'DNI201', estado=Residente.INACTIVO)
+        indicadores.recalcular()
+
+    def generar(self, *args):
+        salida = StringIO()
+        call_command('generar_cuotas', '--periodo', '2026-03', *args, stdout=salida)
+        return salida.getvalue()
+
+    def test_volver_a_generar_no_duplica(self):
+        self.assertIn('2 cuotas creadas, 0 ya existían', self.generar())
+        self.assertIn('0 cuotas creadas, 2 ya existían', self.generar('--monto', '999'))
+
+        cuotas = Pago.objects.filter(periodo=date(2026, 3, 1))
+        self.assertEqual(cuotas.count(), 2)
+        self.assertEqual(set(cuotas.values_list('monto_total', flat=True)), {Decimal('1500.00')})
+        self.assertEqual(HistorialLog.objects.filter(modulo='Pagos').count(), 1)
+        # bulk_create no dispara señales: KPIs, saldos y resumen mensual se ajustan a mano.
+        self.assertEqual(indicadores.obtener_resumen().cuotas_pendientes, 2)
+        self.assertEqual(
+            sorted(SaldoResidente.objects.values_list('saldo', flat=True)), [Decimal('1500.00')] * 2,
+        )
+        self.assertEqual(ResumenFinanciero.objects.get(anio=2026, mes=3).emitido, Decimal('3000.00'))
+
+    def test_monto_invalido(self):
+        for monto in ('abc', 'NaN', '12.345', '0', '-5'):
+            with self.subTest(monto=monto), self.assertRaises(CommandError):
+                self.generar('--monto', monto)
+        self.assertFalse(Pago.objects.exists())
+
+    def test_corrida_simultanea_no_suma_dos_veces(self):
+        original = Pago.objects.bulk_create
+        adelantada = []
+
+        def otra_corrida_inserta_primero(objetos, **kwargs):
+            # Otra corrida leyó lo mismo y termina su inserción antes que ésta.
+            if not adelantada:
+                adelantada.append(True)
+                facturacion.generar_cuotas(date(2026, 3, 1))
+            return original(objetos, **kwargs)
+
+        with mock.patch.object(Pago.objects, 'bulk_create', side_effect=otra_corrida_inserta_primero):
+            facturacion.generar_cuotas(date(2026, 3, 1))
+        self.assertEqual(Pago.objects.count(), 2)
+        self.assertEqual(indicadores.obtener_resumen().cuotas_pendientes, 2)
+
+    def test_solo_los_residentes_indicados(self):
+        a101 = Residente.objects.filter(unidad_principal='A101')
+        self.assertEqual(facturacion.generar_cuotas(date(2026, 3, 15), residentes=a101)['creadas'], 1)
+        self.assertEqual(facturacion.generar_cuotas(date(2026, 3, 1))['creadas'], 1)
+
+    def test_periodo_actual_usa_la_zona_horaria_configurada(self):
+        # 1 de marzo 05:30 UTC todavía es 28 de febrero en America/Mexico_City.
+        instante = datetime(2026, 3, 1, 5, 30, tzinfo=dt_timezone.utc)
+        with self.settings(TIME_ZONE='America/Mexico_City'), mock.patch('django.utils.timezone.now', return_value=instante):
+            self.assertEqual(facturacion.periodo_actual(), date(2026, 2, 1))
+
+
+class IndicadoresTests(TestCase):
+
+    def assertKpisCuadran(self):
+        kpis = indicadores.obtener_resumen()
+        for campo, valor in indicadores.calcular_desde_tablas().items():
+            self.assertEqual(getattr(kpis, campo), valor, campo)
+
+    def kpis(self):
+        kpis = indicadores.obtener_resumen()
+        return kpis.residentes_activos, kpis.cuotas_pendientes, kpis.tickets_abiertos, kpis.total_ingresos
+
+    def test_senales_suman_solo_la_diferencia(self):
+        indicadores.recalcular()
+        residente = crear_residente()
+        cargo = crear_cargo(residente, '500.00', date(2026, 3, 1))
+        ticket = Ticket.objects.create(residente=residente, asunto='Fuga')
+        self.assertEqual(self.kpis(), (1, 1, 1, 0))
+
+        # Guardar sin cambios no mueve nada.
+        cargo.descripcion = 'Cuota marzo'
+        cargo.save()
+        self.assertEqual(self.kpis(), (1, 1, 1, 0))
+
+        cargo.monto_pagado = cargo.monto_total
+        cargo.estado = 'PAGADO'
+        cargo.save()
+        ticket.estado = 'CERRADO'
+        ticket.save()
+        residente.estado = Residente.INACTIVO
+        residente.save()
+        self.assertEqual(self.kpis(), (0, 0, 0, Decimal('500.00')))
+        self.assertKpisCuadran()
+
+        cargo.delete()
+        ticket.delete()
+        self.assertEqual(self.kpis(), (0, 0, 0, 0))
+        self.assertKpisCuadran()
+
+    def test_sin_fila_se_reconstruye_desde_las_tablas(self):
+        crear_cargo(crear_residente(), '500.00', date(2026, 3, 1))
+        ResumenKPI.objects.all().delete()
+        self.assertEqual(self.kpis(), (1, 1, 0, 0))
+
+
+class AutocompletadoTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('auto', 'auto@demo.condogest', 'x'))
+        self.maria = crear_residente('A101', 'DNI101', nombre_completo='María José López')
+        self.ana = crear_residente('A102', 'DNI102', nombre_completo='Ana Torres')
+        crear_residente('B201', 'DNI201', nombre_completo='Mario López', estado=Residente.INACTIVO)
+
+    def buscar(self, **params):
+        respuesta = self.client.get(reverse('api_residentes_buscar'), params)
+        self.assertEqual(respuesta.status_code, 200)
+        return [r['id'] for r in respuesta.json()['results']]
+
+    def test_unidad_por_prefijo_y_nombre_sin_acentos(self):
+        self.assertEqual(self.buscar(q='a10'), [self.maria.pk, self.ana.pk])
+        self.assertEqual(self.buscar(q='maria lopez'), [self.maria.pk])
+
+    def test_solo_activos_y_limite(self):
+        self.assertEqual(self.buscar(q='B201'), [])
+        self.assertEqual(self.buscar(q='A10', limite=1), [self.maria.pk])
+        self.assertEqual(self.buscar(q=''), [])
+
+
+class BusquedaLogsTests(TransactionTestCase):
+    """
+    TransactionTestCase porque en MySQL el índice FULLTEXT sólo ve filas
+    ya confirmadas; en los demás motores se prueba el índice invertido.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin_pagos', 'pagos@demo.condogest', 'x')
+        self.cuota = HistorialLog.objects.create(
+            usuario=self.admin, accion='EDICION', modulo='Pagos', descripcion='Registró la cuota de María',
+        )
+        self.ticket = HistorialLog.objects.create(accion='CREACION', modulo='Tickets', descripcion='Fuga en el baño')
+
+    def buscar(self, texto):
+        return set(busqueda_logs.buscar(HistorialLog.objects.all(), texto))
+
+    def test_palabras_por_prefijo_sin_acentos(self):
+        self.assertEqual(self.buscar('MARIA cuo'), {self.cuota})
+        self.assertEqual(self.buscar('bano tickets'), {self.ticket})
+        # Todas las palabras deben aparecer.
+        self.assertEqual(self.buscar('fuga pagos'), set())
+
+    def test_palabras_cortas_tambien_filtran(self):
+        # En MySQL "de" no está en el índice FULLTEXT y se busca aparte.
+        HistorialLog.objects.create(accion='ELIMINACION', modulo='Pagos', descripcion='Canceló la cuota')
+        self.assertEqual(self.buscar('de cuota'), {self.cuota})
+
+    def test_inicio_del_nombre_de_usuario(self):
+        self.assertEqual(self.buscar('admin_pa'), {self.cuota})
+        self.assertEqual(self.buscar(''), {self.cuota, self.ticket})
+
+
+class EstacionamientoTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+        self.vecino = crear_residente('B202', 'DNI202')
+
+    def espacios(self, residente):
+        return list(EspacioEstacionamiento.objects.filter(residente=residente).values_list('codigo', flat=True))
+
+    def test_limpiar_codigos(self):
+        self.assertEqual(estacionamiento.limpiar_codigos('e1, E2 ,,e1'), ['E1', 'E2'])
+
+    def test_asigna_y_libera_los_que_ya_no_tiene(self):
+        estacionamiento.asignar(self.residente, ['E1', 'E2'])
+        self.assertEqual(self.espacios(self.residente), ['E1', 'E2'])
+        estacionamiento.asignar(self.residente, ['E2', 'E3'])
+        self.assertEqual(self.espacios(self.residente), ['E2', 'E3'])
+        self.assertEqual(self.residente.espacios_estacionamiento, 'E2, E3')
+        self.assertIsNone(EspacioEstacionamiento.objects.get(codigo='E1').residente_id)
+
+    def test_espacio_de_otro_residente(self):
+        estacionamiento.asignar(self.vecino, ['E1'])
+        estacionamiento.asignar(self.residente, ['E5'])
+        with self.assertRaises(estacionamiento.EspacioOcupado) as error:
+            estacionamiento.asignar(self.residente, ['E1', 'E2'])
+        self.assertEqual(error.exception.codigos, ['E1'])
+        # Se deshace todo: ni reclama E2 ni suelta E5.
+        self.assertEqual(self.espacios(self.residente), ['E5'])
+        self.assertEqual(self.espacios(self.vecino), ['E1'])
+        self.assertEqual(estacionamiento.ocupados(['E1', 'E5'], self.vecino), ['E5'])
+
+    def editar(self, parking):
+        self.client.force_login(User.objects.create_superuser('parking', 'parking@demo.condogest', 'x'))
+        return self.client.post(reverse('residente_editar', args=[self.residente.pk]), {
+            'edit_name': 'Otro nombre', 'edit_unit': 'A101', 'edit_type': Residente.PROPIETARIO,
+            'edit_status': Residente.ACTIVO, 'edit_parking': parking,
+        }, follow=True)
+
+    def test_editar_con_espacio_ocupado_muestra_el_error(self):
+        estacionamiento.asignar(self.vecino, ['E1'])
+        self.assertContains(self.editar('e1'), 'ya están asignados')
+        self.residente.refresh_from_db()
+        self.assertEqual(self.residente.nombre_completo, 'Residente A101')
+
+    def test_editar_con_codigo_demasiado_largo_muestra_el_error(self):
+        codigo = 'X' * (estacionamiento.LARGO_CODIGO + 10)
+        self.assertContains(self.editar(codigo), 'demasiado largo')
+        self.residente.refresh_from_db()
+        self.assertEqual(self.residente.nombre_completo, 'Residente A101')
+        self.assertFalse(EspacioEstacionamiento.objects.exists())
+
+
+class ImportacionTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('importa', 'importa@demo.condogest', 'x'))
+
+    def subir(self, nombre, contenido):
+        respuesta = self.client.post(reverse('residente_importar'), {
+            'archivo_residentes': SimpleUploadedFile(nombre, contenido),
+        })
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.context['resultado_importacion']
+
+    def test_importa_por_lotes_y_reporta_filas_invalidas(self):
+        indicadores.recalcular()
+        crear_residente('A100', 'DNI100')
+        archivo = BytesIO(
+            "Nombre completo,Unidad,DNI,Tipo,Estado,Estacionamiento\n"
+            "Ana Torres,A101,12345678A,Arrendatario,Activo,e1\n"
+            "Luis Pérez,A100,,,,\n"
+            ",A102,,,,\n"
+            "Eva Ruiz,A103,12345678A,,,\n"
+            "Raúl Gómez,A104,,PR,IN,E1\n"
+            "María López,a105,,,,e2\n".encode()
+        )
+        resultado = importacion.importar(importacion.leer_filas(archivo, 'residentes.csv'), tamano_lote=1)
+        self.assertEqual(resultado['creados'], 2)
+        self.assertEqual(sorted(n for n, _ in resultado['errores']), [3, 4, 5, 6])
+
+        ana = Residente.objects.get(unidad_principal='A101')
+        self.assertEqual((ana.tipo_residente, ana.estado), (Residente.ARRENDATARIO, Residente.ACTIVO))
+        self.assertEqual(EspacioEstacionamiento.objects.get(codigo='E1').residente, ana)
+        self.assertEqual(EspacioEstacionamiento.objects.get(codigo='E2').residente.nombre_completo, 'María López')
+        # bulk_create no dispara señales: el importador indexa y suma a los KPIs por su cuenta.
+        self.assertEqual(indicadores.obtener_resumen().residentes_activos, 2)
+        self.assertEqual(list(busqueda_residentes.buscar(Residente.objects.all(), 'maria lopez')),
+                         [Residente.objects.get(unidad_principal='a105')])
+
+    def test_sin_columnas_obligatorias(self):
+        resultado = self.subir('residentes.csv', b'dni,telefono\n12345678A,5512345678\n')
+        self.assertEqual(resultado['creados'], 0)
+        self.assertIn("'nombre' y 'unidad'", resultado['errores'][0][1])
+
+    def test_csv_de_excel_en_windows(self):
+        resultado = self.subir('residentes.csv', 'nombre;unidad\r\nJosé Núñez;A101\r\n'.encode('cp1252'))
+        self.assertEqual(resultado['creados'], 1)
+        self.assertEqual(Residente.objects.get().nombre_completo, 'José Núñez')
+
+    def test_csv_ilegible_se_reporta(self):
+        resultado = self.subir('residentes.csv', b'nombre,unidad\nAna,A101\n\x81\x8d,A102\n')
+        self.assertEqual(resultado['creados'], 0)
+        self.assertIn('UTF-8', resultado['errores'][0][1])
+        self.assertFalse(Residente.objects.exists())
+
+    @skipUnless(importacion.openpyxl, "openpyxl no está instalado")
+    def test_xlsx_danado_se_reporta(self):
+        resultado = self.subir('residentes.xlsx', b'PK\x03\x04 no es un libro')
+        self.assertEqual(resultado['creados'], 0)
+        self.assertIn('dañado', resultado['errores'][0][1])
+
+
+class AccionMasivaTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('masivo', 'masivo@demo.condogest', 'x'))
+        self.a101 = crear_residente('A101', 'DNI101')
+        self.a102 = crear_residente('A102', 'DNI102', estado=Residente.PENDIENTE)
+        self.a103 = crear_residente('A103', 'DNI103', estado=Residente.PENDIENTE)
+        self.b201 = crear_residente('B201', 'DNI201', tipo_residente=Residente.ARRENDATARIO)
+        indicadores.recalcular()
+
+    def enviar(self, **datos):
+        return self.client.post(reverse('residente_accion_masiva'), datos, follow=True)
+
+    def estados(self):
+        return dict(Residente.objects.values_list('unidad_principal', 'estado'))
+
+    def test_seleccion_en_un_update_con_un_solo_log(self):
+        respuesta = self.enviar(ids=[self.a101.pk, self.a102.pk, self.a103.pk], nuevo_estado=Residente.ACTIVO)
+        self.assertContains(respuesta, '2 residentes actualizados')
+        self.assertEqual(set(self.estados().values()), {Residente.ACTIVO})
+        self.assertEqual(indicadores.obtener_resumen().residentes_activos, 4)
+        log = HistorialLog.objects.get()
+        self.assertIn('Unidades: A102, A103', log.descripcion)
+
+    def test_todos_los_que_cumplen_el_filtro(self):
+        self.enviar(alcance='filtro', tipo=Residente.PROPIETARIO, nuevo_estado=Residente.INACTIVO)
+        self.assertEqual(self.estados(), {
+            'A101': Residente.INACTIVO, 'A102': Residente.INACTIVO, 'A103': Residente.INACTIVO,
+            'B201': Residente.ACTIVO,
+        })
+        self.assertEqual(indicadores.obtener_resumen().residentes_activos, 1)
+
+    def test_choque_de_unidad_no_cambia_nada(self):
+        otro = crear_residente('A101', 'DNI999', tipo_residente=Residente.ARRENDATARIO)
+        respuesta = self.enviar(ids=[otro.pk, self.b201.pk], nuevo_tipo=Residente.PROPIETARIO)
+        self.assertContains(respuesta, 'No se aplicó el cambio')
+        self.assertEqual(Residente.objects.filter(tipo_residente=Residente.ARRENDATARIO).count(), 2)
+        self.assertFalse(HistorialLog.objects.exists())
+
+    def test_solo_administradores(self):
+        self.client.force_login(User.objects.create_user('vecino', 'vecino@demo.condogest', 'x'))
+        self.enviar(ids=[self.a102.pk], nuevo_estado=Residente.ACTIVO)
+        self.assertEqual(self.estados()['A102'], Residente.PENDIENTE)
+
+
+class GetCondicionalTests(TestCase):
+
+    def test_304_hasta_que_cambia_una_tabla(self):
+        crear_residente()
+        self.client.force_login(User.objects.create_superuser('etag', 'etag@demo.condogest', 'x'))
+        url = reverse('residente_listado')
+        self.client.get(url)  # fija la cookie CSRF, que entra en el ETag
+        respuesta = self.client.get(url)
+        etag = respuesta['ETag']
+        self.assertIn('no-cache', respuesta['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        crear_residente('B202', 'DNI202')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def etag_fresco(self, url):
+        self.client.get(url)  # fija la cookie CSRF, que entra en el ETag
+        return self.client.get(url)['ETag']
+
+    def test_baja_no_responde_304_por_fecha(self):
+        crear_residente()
+        residente = crear_residente('B202', 'DNI202')
+        self.client.force_login(User.objects.create_superuser('etag', 'etag@demo.condogest', 'x'))
+        url = reverse('residente_listado')
+        respuesta = self.client.get(url)
+        self.assertNotIn('Last-Modified', respuesta)
+        self.assertIn('Cookie', respuesta['Vary'])
+
+        # Borrar no cambia MAX(updated_at): sin Last-Modified, If-Modified-Since no basta para un 304.
+        residente.delete()
+        futuro = 'Thu, 01 Jan 2099 00:00:00 GMT'
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=futuro).status_code, 200)
+
+    def test_cambio_de_rol_cambia_el_etag(self):
+        usuario = User.objects.create_user('guardia', 'guardia@demo.condogest', 'x')
+        perfil = Usuario.objects.create(user=usuario, rol='guardia')
+        self.client.force_login(usuario)
+        url = reverse('residente_listado')
+        etag = self.etag_fresco(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        perfil.rol = 'admin'
+        perfil.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SaldosTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+        self.vecino = crear_residente('B202', 'DNI202')
+
+    def saldo(self, residente):
+        saldo = SaldoResidente.objects.get(residente=residente)
+        return saldo.saldo, saldo.saldo_vencido, saldo.fecha_adeudo_mas_antiguo, saldo.cargos_vencidos
+
+    def test_cada_escritura_de_pago_recalcula_al_residente(self):
+        enero = crear_cargo(self.residente, '500.00', date(2026, 1, 1))
+        crear_cargo(self.residente, '300.00', date(2026, 2, 1))
+        crear_cargo(self.residente, '100.00', date(2026, 1, 1), tipo_movimiento='EGRESO')
+        self.assertEqual(self.saldo(self.residente), (Decimal('800.00'), 0, date(2026, 1, 1), 0))
+
+        enero.monto_pagado = Decimal('200.00')
+        enero.save()
+        self.assertEqual(self.saldo(self.residente)[0], Decimal('600.00'))
+
+        facturacion.vencer_pagos(hoy=date(2026, 1, 31))
+        self.assertEqual(self.saldo(self.residente), (Decimal('600.00'), Decimal('300.00'), date(2026, 1, 1), 1))
+
+        # Cambiar de dueño recalcula al anterior y al nuevo.
+        enero.refresh_from_db()
+        enero.residente = self.vecino
+        enero.save()
+        self.assertEqual(self.saldo(self.residente), (Decimal('300.00'), 0, date(2026, 2, 1), 0))
+        self.assertEqual(self.saldo(self.vecino)[:2], (Decimal('300.00'), Decimal('300.00')))
+
+        enero.delete()
+        self.assertEqual(self.saldo(self.vecino), (0, 0, None, 0))
+
+    def test_reconstruccion_coincide_con_lo_mantenido(self):
+        crear_cargo(self.residente, '500.00', date(2026, 1, 1), estado='VENCIDO')
+        crear_cargo(self.vecino, '250.00', date(2026, 3, 1))
+        mantenidos = {r.pk: self.saldo(r) for r in (self.residente, self.vecino)}
+        SaldoResidente.objects.all().delete()
+        self.assertEqual(saldos.recalcular_todos(), 2)
+        self.assertEqual({r.pk: self.saldo(r) for r in (self.residente, self.vecino)}, mantenidos)
+
+
+class FoliosTests(TestCase):
+
+    def setUp(self):
+        folios._bloques.clear()
+
+    @override_settings(FOLIOS_TAMANO_BLOQUE=2)
+    def test_bloques_consecutivos_sin_repetir_entre_procesos(self):
+        self.assertEqual([folios.siguiente('ING') for _ in range(3)], [1, 2, 3])
+        folios._bloques.clear()  # otro proceso: su bloque empieza después del último reservado
+        self.assertEqual(folios.siguiente('ING'), 5)
+        self.assertEqual(folios.numero_recibo('EGRESO'), 'EGR-00000001')
+
+    def test_no_reserva_dentro_de_otra_transaccion(self):
+        with transaction.atomic():
+            with self.assertRaises(RuntimeError):
+                folios.siguiente('ING')
+
+
+class AbonosTests(TestCase):
+
+    def setUp(self):
+        folios._bloques.clear()
+        self.residente = crear_residente()
+        self.enero = crear_cargo(self.residente, '500.00', date(2026, 1, 1))
+        self.febrero = crear_cargo(self.residente, '500.00', date(2026, 2, 1))
+
+    def assertAgregadosCuadran(self):
+        """Saldos, resumen mensual y KPIs mantenidos al vuelo = recalculados desde gestion_pagos."""
+        saldo = SaldoResidente.objects.get(residente=self.residente)
+        pendiente = sum(p.monto_total - p.monto_pagado for p in Pago.objects.filter(
+            residente=self.residente, estado__in=('PENDIENTE', 'VENCIDO')))
+        self.assertEqual(saldo.saldo, pendiente)
+
+        self.assertEqual(*resumen_al_vuelo_y_reconstruido())
+
+        kpis = indicadores.obtener_resumen()
+        for campo, valor in indicadores.calcular_desde_tablas().items():
+            self.assertEqual(getattr(kpis, campo), valor, campo)
+
+    def test_abono_paga_primero_el_cargo_mas_antiguo(self):
+        abono = abonos.abonar(self.residente, '700.00', fecha=date(2026, 2, 10))
+        self.enero.refresh_from_db()
+        self.febrero.refresh_from_db()
+        self.assertEqual(self.enero.estado, 'PAGADO')
+        self.assertEqual(self.febrero.estado, 'PENDIENTE')
+        self.assertEqual(self.febrero.monto_pagado, Decimal('200.00'))
+        self.assertEqual(abono.monto_aplicado, Decimal('700.00'))
+        self.assertEqual(
+            sorted(AplicacionAbono.objects.values_list('pago_id', 'monto')),
+            sorted([(self.enero.pk, Decimal('500.00')), (self.febrero.pk, Decimal('200.00'))]),
+        )
+        self.assertAgregadosCuadran()
+
+    def test_excedente_queda_a_favor(self):
+        abono = abonos.abonar(self.residente, '1200.00')
+        self.assertEqual(abono.saldo_a_favor, Decimal('200.00'))
+        self.assertFalse(Pago.objects.filter(estado='PENDIENTE').exists())
+        self.assertAgregadosCuadran()
+
+    def test_objetivo_se_paga_antes_que_el_mas_antiguo(self):
+        abono = Abono(residente=self.residente, monto=Decimal('500.00'), fecha=date(2026, 2, 10))
+        abonos.aplicar([abono], [self.febrero.pk])
+        self.febrero.refresh_from_db()
+        self.assertEqual(self.febrero.estado, 'PAGADO')
+        self.assertEqual(Pago.objects.get(pk=self.enero.pk).monto_pagado, 0)
+
+    def test_monto_invalido(self):
+        with self.assertRaises(abonos.AbonoInvalido):
+            abonos.abonar(self.residente, '0')
+
+
+class ResumenFinancieroTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+
+    def cubeta(self, mes, categoria='MULTA'):
+        fila = ResumenFinanciero.objects.get(anio=2026, mes=mes, tipo_movimiento='INGRESO', categoria=categoria)
+        return fila.movimientos, fila.emitido, fila.cobrado, fila.cobrado_liquidado
+
+    def test_emision_y_cobro_en_meses_distintos(self):
+        cargo = crear_cargo(self.residente, '300.00', date(2026, 3, 1), categoria='MULTA')
+        crear_cargo(self.residente, '1500.00', date(2026, 3, 1))
+        self.assertEqual(self.cubeta(3), (1, Decimal('300.00'), 0, 0))
+        self.assertEqual(*resumen_al_vuelo_y_reconstruido())
+
+        cargo.monto_pagado = cargo.monto_total
+        cargo.estado = 'PAGADO'
+        cargo.fecha_pago = '2026-04-02'  # como llega del formulario
+        cargo.save()
+        self.assertEqual(self.cubeta(3), (1, Decimal('300.00'), 0, 0))
+        self.assertEqual(self.cubeta(4), (0, 0, Decimal('300.00'), Decimal('300.00')))
+        self.assertEqual(resumen_financiero.total('emitido', anio=2026, mes=3), Decimal('1800.00'))
+        self.assertEqual(*resumen_al_vuelo_y_reconstruido())
+
+        cargo.delete()
+        self.assertEqual(self.cubeta(3), (0, 0, 0, 0))
+        self.assertEqual(self.cubeta(4), (0, 0, 0, 0))
+        self.assertEqual(*resumen_al_vuelo_y_reconstruido())
+
+    def test_cancelados_no_cuentan_como_emitidos(self):
+        crear_cargo(self.residente, '300.00', date(2026, 3, 1), categoria='MULTA', estado='CANCELADO')
+        self.assertEqual(self.cubeta(3), (0, 0, 0, 0))
+        self.assertEqual(*resumen_al_vuelo_y_reconstruido())
+
+
+class PaginacionTests(TestCase):
+
+    def test_recorre_todas_las_filas_una_vez_aunque_empaten_las_fechas(self):
+        residente = crear_residente()
+        misma_hora = timezone.now()
+        Ticket.objects.bulk_create([
+            Ticket(residente=residente, asunto=str(i), fecha_creacion=misma_hora - timedelta(minutes=i % 3))
+            for i in range(25)
+        ])
+        vistos, cursor = [], ''
+        while True:
+            filas, cursor = pagina_keyset(Ticket.objects.all(), cursor, 7, campo='fecha_creacion')
+            vistos += [t.pk for t in filas]
+            if not cursor:
+                break
+        self.assertEqual(len(vistos), 25)
+        self.assertEqual(set(vistos), set(Ticket.objects.values_list('pk', flat=True)))
+        self.assertEqual(
+            vistos, list(Ticket.objects.order_by('-fecha_creacion', '-id').values_list('pk', flat=True)),
+        )
+
+    def test_cursor_invalido_empieza_desde_el_principio(self):
+        crear_residente()
+        filas, _ = pagina_keyset(Residente.objects.all(), 'no-es-un-cursor', 10, campo='nombre_completo')
+        self.assertEqual(len(filas), 1)
+
+    def test_tablero_combina_filtros_e_ignora_los_invalidos(self):
+        a101, b202 = crear_residente(), crear_residente('B202', 'DNI202')
+        esperado = Ticket.objects.create(residente=a101, asunto='Fuga', prioridad='ALTA')
+        Ticket.objects.create(residente=a101, asunto='Ruido', prioridad='BAJA')
+        Ticket.objects.create(residente=b202, asunto='Fuga', prioridad='ALTA')
+        Ticket.objects.create(residente=a101, asunto='Fuga', prioridad='ALTA', estado='CERRADO')
+        self.client.force_login(User.objects.create_superuser('tablero', 'tablero@demo.condogest', 'x'))
+
+        respuesta = self.client.get(reverse('dashboard_tickets'), {
+            'estado': 'ABIERTO', 'prioridad': 'ALTA', 'unidad': 'a1', 'asignado': 'sin', 'desde': 'ayer',
+        })
+        self.assertEqual([t.pk for t in respuesta.context['tickets']], [esperado.pk])
+        self.assertEqual(respuesta.context['filtros'],
+                         {'estado': 'ABIERTO', 'prioridad': 'ALTA', 'unidad': 'a1', 'asignado': 'sin'})
+
+
+@override_settings(ASIGNACION_TICKETS={
+    'Mantenimiento': {'puestos': ['Mantenimiento'], 'servicios': ['Plomería']},
+    'Queja': {'puestos': ['Administrador'], 'servicios': []},
+    'Otro': {'puestos': [], 'servicios': ['Plomería']},
+})
+class AsignacionTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+        self.tecnicos = [
+            Empleado.objects.create(nombre_completo=f"Técnico {i}", dni=f"EMP{i}", puesto='mantenimiento',
+                                    fecha_ingreso=date(2025, 1, 1))
+            for i in range(2)
+        ]
+        self.plomero = Proveedor.objects.create(nombre_empresa='Plomería SA', tipo_servicio='Plomeria')
+
+    def crear_tickets(self, n, tipo, **extra):
+        return [
+            Ticket.objects.create(residente=self.residente, tipo_solicitud=tipo, asunto='x', **extra)
+            for _ in range(n)
+        ]
+
+    def test_reparte_por_carga_de_trabajo(self):
+        self.crear_tickets(3, 'Mantenimiento', empleado_asignado=self.tecnicos[0])
+        self.crear_tickets(5, 'Mantenimiento')
+        self.assertEqual(asignacion.asignar(), {'asignados': 5, 'sin_candidato': 0})
+        carga = asignacion.cargas()
+        self.assertEqual(carga[('e', self.tecnicos[0].pk)], 4)
+        self.assertEqual(carga[('e', self.tecnicos[1].pk)], 4)
+
+    def test_proveedor_sin_empleado_y_tipo_desconocido(self):
+        self.crear_tickets(1, 'Algo raro')
+        queja, = self.crear_tickets(1, 'Queja')
+        self.assertEqual(asignacion.asignar(), {'asignados': 1, 'sin_candidato': 1})
+        self.assertEqual(asignacion.cargas(), {('p', self.plomero.pk): 1})
+        queja.refresh_from_db()
+        self.assertIsNone(queja.empleado_asignado_id)
+
+    def test_no_pisa_asignacion_manual(self):
+        a_mano, = self.crear_tickets(1, 'Mantenimiento', proveedor_asignado=self.plomero)
+        pendiente, = self.crear_tickets(1, 'Mantenimiento')
+        self.assertEqual(asignacion.asignar(), {'asignados': 1, 'sin_candidato': 0})
+        a_mano.refresh_from_db()
+        self.assertEqual((a_mano.empleado_asignado_id, a_mano.proveedor_asignado_id), (None, self.plomero.pk))
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.empleado_asignado_id, self.tecnicos[0].pk)
+
+
+class EscalamientoTests(TestCase):
+
+    def setUp(self):
+        self.residente = crear_residente()
+
+    def crear_vencido(self, prioridad, estado='ABIERTO'):
+        ticket = Ticket.objects.create(
+            residente=self.residente, tipo_solicitud='Otro', asunto='Fuga', prioridad=prioridad, estado=estado,
+        )
+        Ticket.objects.filter(pk=ticket.pk).update(vence_en=timezone.now() - timedelta(hours=1))
+        return ticket
+
+    def test_escala_un_nivel_y_solo_una_vez(self):
+        baja, emergencia = self.crear_vencido('BAJA'), self.crear_vencido('EMERGENCIA')
+        cerrado = self.crear_vencido('BAJA', estado='CERRADO')
+        al_dia = Ticket.objects.create(residente=self.residente, asunto='Ruido', prioridad='BAJA')
+
+        ahora = timezone.now()
+        self.assertEqual(sla.escalar(ahora), {'EMERGENCIA': 1, 'BAJA': 1})
+        baja.refresh_from_db()
+        self.assertEqual((baja.prioridad, baja.nivel_escalamiento), ('MEDIA', 1))
+        self.assertEqual(baja.vence_en, ahora + Ticket.plazo_sla('MEDIA'))
+        emergencia.refresh_from_db()
+        self.assertEqual((emergencia.prioridad, emergencia.nivel_escalamiento), ('EMERGENCIA', 1))
+        for ticket in (cerrado, al_dia):
+            ticket.refresh_from_db()
+            self.assertEqual(ticket.nivel_escalamiento, 0)
+
+        self.assertEqual(sla.escalar(), {})
+
+    def test_escalado_no_cuenta_como_resuelto_a_tiempo(self):
+        ticket = self.crear_vencido('ALTA')
+        sla.escalar()
+        ticket.refresh_from_db()
+        ticket.estado = 'CERRADO'
+        ticket.save()
+        self.assertEqual(sla.resumen()['cumplimiento'], 0)
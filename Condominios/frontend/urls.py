@@ -8,6 +8,7 @@ urlpatterns = [
     path("", login_view, name="home"),
     path("login/", login_view, name="login"),
     path("dashboard/", dashboard_view, name="dashboard"),
+    path("dashboard/seccion/<str:seccion>/", views.dashboard_seccion, name="dashboard_seccion"),
     path("logout/", logout_view, name="logout"),
 
     path("portal-residentes/", views.residentes_view, name="portal_residentes"),
@@ -15,11 +16,21 @@ urlpatterns = [
     # RUTA PRINCIPAL DE GESTIÓN (Maneja Listado, Registro POST, Edición POST)
     path("residentes/", views.residente_listado_y_registro, name="residente_listado"),
     
+    # Autocompletado de residentes (reemplaza los <select> con todos los residentes)
+    path("api/residentes/buscar/", api_views.api_residentes_buscar, name="api_residentes_buscar"),
+
+    # Feed de actividad (paginado por cursor)
+    path("api/actividad/", api_views.api_actividad_list, name="api_actividad_list"),
+
     # Documentos
     path("api/documentos/", api_views.api_documentos_list, name="api_documentos_list"),
     path("api/documentos/<int:pk>/descargar/", api_views.api_documento_marcar_descarga, name="api_documento_descargar"),
     path('eliminar-documento/<int:doc_id>/', views.eliminar_documento, name='eliminar_documento'),
     
+    # C: Importación masiva (POST)
+    path('residentes/importar/', views.residente_importar, name='residente_importar'),
+    path('residentes/masivo/', views.residente_accion_masiva, name='residente_accion_masiva'),
+
     # R/U: Detalle (GET) y Edición (POST)
     path('residentes/editar/<int:pk>/', views.residente_editar, name='residente_editar'),
     
@@ -29,11 +40,15 @@ urlpatterns = [
     # PAGOS
     path('pagos/', views.dashboard_pagos, name='dashboard_pagos'),
     path('pagos/guardar/', views.guardar_pago, name='guardar_pago'),
+    path('pagos/abonar/', views.abonar_pago, name='abonar_pago'),
+    path('pagos/conciliacion/importar/', views.conciliacion_importar, name='conciliacion_importar'),
+    path('pagos/conciliacion/<int:pk>/', views.conciliacion_resolver, name='conciliacion_resolver'),
 
     #TICKETS
     path('tickets/', views.dashboard_tickets, name='dashboard_tickets'),
     path('tickets/crear/', views.crear_ticket, name='crear_ticket'),
     path('tickets/actualizar/<int:pk>/', views.actualizar_ticket, name='actualizar_ticket'),
+    path('tickets/asignar/', views.asignar_tickets_auto, name='asignar_tickets_auto'),
 
     #PERSONAL
     path('personal/', views.dashboard_personal, name='dashboard_personal'),
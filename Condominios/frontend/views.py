@@ -3,21 +3,31 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_POST
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Sum, Count, F
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.contrib.auth.models import User
-from decimal import Decimal
-from datetime import datetime, timedelta
+from django.conf import settings
+from decimal import Decimal, InvalidOperation
+from datetime import date, datetime, timedelta
 import time
 import csv
-from django.http import HttpResponse
-from django.core.paginator import Paginator
+from urllib.parse import urlencode
+from django.http import HttpResponse, HttpResponseForbidden, Http404
 
 from .models import (
     Documento, Residente, Pago, Ticket,
     Empleado, Proveedor, Contrato, Tarea, Prioridad,
-    Reunion, ControlAcceso, AreaComun, Reserva, HistorialLog, Usuario,
+    Reunion, ControlAcceso, AreaComun, Reserva, HistorialLog, Usuario, Actividad,
+    TicketComentario, SaldoResidente, MovimientoBancario, EstadoMovimiento,
 )
+from . import (
+    abonos, agregados, asignacion, busqueda_logs, busqueda_residentes, cache_fragmentos, conciliacion,
+    estacionamiento, folios, importacion, indicadores, resumen_financiero, sla,
+)
+from .condicional import condicional
+from .paginacion import pagina_keyset, total_aproximado
 
 
 def obtener_rol(user):
@@ -60,34 +70,6 @@ def es_guardia(user):
     return obtener_rol(user) == 'guardia'
 
 
-def _limpiar_slots_estacionamiento(cadena):
-    if not cadena:
-        return []
-    slots = []
-    for raw in cadena.split(','):
-        s = raw.strip().upper()
-        if s:
-            slots.append(s)
-    return slots
-
-
-def _buscar_slots_ocupados(slots_nuevos, residente_actual=None):
-    if not slots_nuevos:
-        return []
-
-    qs = Residente.objects.all()
-    if residente_actual is not None:
-        qs = qs.exclude(pk=residente_actual.pk)
-
-    ocupados = set()
-    for otro in qs:
-        existentes = set(_limpiar_slots_estacionamiento(otro.espacios_estacionamiento or ""))
-        inter = existentes.intersection(slots_nuevos)
-        if inter:
-            ocupados.update(inter)
-    return sorted(list(ocupados))
-
-
 def login_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
@@ -119,11 +101,34 @@ def logout_view(request):
     return redirect("login")
 
 
+ROLES_DASHBOARD = ('admin', 'residente', 'empleado', 'guardia', 'propietario')
+
+# Pestaña -> roles que la ven (mismas reglas que el menú lateral)
+SECCIONES_DASHBOARD = {
+    'home': ROLES_DASHBOARD,
+    'residentes': ('admin', 'guardia'),
+    'pagos': ('admin', 'residente', 'propietario', 'empleado'),
+    'tickets': ('admin', 'residente', 'propietario', 'empleado'),
+    'personal': ('admin',),
+    'reuniones': ('admin', 'residente', 'propietario', 'guardia'),
+    'seguridad': ('admin', 'guardia'),
+    'areas': ROLES_DASHBOARD,
+    'reportes': ('admin',),
+    'documentacion': ('admin',),
+    'usuarios': ('admin',),
+    'logs': ('admin',),
+}
+
+
+def _puede_ver_seccion(rol, seccion):
+    return rol in SECCIONES_DASHBOARD.get(seccion, ())
+
+
 @login_required
 def dashboard_view(request):
     rol = obtener_rol(request.user)
 
-    if rol not in ('admin', 'residente', 'empleado', 'guardia', 'propietario'):
+    if rol not in ROLES_DASHBOARD:
         messages.error(request, "No tienes un rol válido para acceder al dashboard.")
         return redirect('residente_listado')
 
@@ -142,111 +147,166 @@ def dashboard_view(request):
                 messages.success(request, "Documento subido.")
                 return redirect("dashboard")
 
-    kpi_residentes = Residente.objects.filter(estado='AC').count()
-    kpi_cuotas = Pago.objects.filter(estado__in=['PENDIENTE', 'VENCIDO']).count()
-    kpi_tickets = Ticket.objects.exclude(estado='CERRADO').count()
-    actividad_reciente = []
-    logs_list = HistorialLog.objects.all().order_by('-fecha')
-    query_logs = request.GET.get('q_logs')
-    if query_logs:
-        logs_list = logs_list.filter(
-            descripcion__icontains=query_logs
-        ) | logs_list.filter(
-            usuario__username__icontains=query_logs
-        )
+    tab_activa = request.GET.get('section', 'home')
+    if not _puede_ver_seccion(rol, tab_activa):
+        tab_activa = 'home'
 
-    paginator = Paginator(logs_list, 20)
-    page_number = request.GET.get('page')
-    logs_page = paginator.get_page(page_number)
-
-    pagos_recent_feed = Pago.objects.select_related('residente', 'empleado', 'proveedor').order_by('-created_at')[:3]
-    for p in pagos_recent_feed:
-        if p.residente:
-            nom, uni = p.residente.nombre_completo, p.residente.unidad_principal
-        elif p.empleado:
-            nom, uni = p.empleado.nombre_completo, "Staff"
-        elif p.proveedor:
-            nom, uni = p.proveedor.nombre_empresa, "Proveedor"
-        else:
-            nom, uni = "Sistema", "-"
-
-        actividad_reciente.append({
-            'hora': p.created_at,
-            'evento': 'Pago registrado',
-            'detalle': f"${p.monto_pagado}",
-            'usuario': nom,
-            'unidad': uni,
-            'tipo': 'pago'
-        })
-
-    tickets_recent_feed = Ticket.objects.select_related('residente').order_by('-fecha_creacion')[:3]
-    for t in tickets_recent_feed:
-        nom = t.residente.nombre_completo if t.residente else "Desconocido"
-        uni = t.residente.unidad_principal if t.residente else "-"
-        actividad_reciente.append({
-            'hora': t.fecha_creacion,
-            'evento': 'Ticket creado',
-            'detalle': t.asunto,
-            'usuario': nom,
-            'unidad': uni,
-            'tipo': 'ticket'
-        })
-
-    actividad_reciente.sort(key=lambda x: x['hora'], reverse=True)
-
-    ultimos_pagos = Pago.objects.select_related('residente').order_by('-fecha_emision')[:15]
-    ultimos_tickets = Ticket.objects.select_related('residente').order_by('-fecha_creacion')[:15]
-
-    empleados = Empleado.objects.filter(estado='ACTIVO')
-    proveedores = Proveedor.objects.filter(estado='ACTIVO')
-
-    ultimas_reuniones = Reunion.objects.filter(
-        estado__in=['PROGRAMADA', 'EN_CURSO']
-    ).order_by('fecha_reunion')
-
-    accesos_recientes = ControlAcceso.objects.filter(
-        fecha_salida__isnull=True
-    ).select_related('residente').order_by('-fecha_entrada')[:5]
-
-    total_ingresos = Pago.objects.filter(
-        tipo_movimiento='INGRESO', estado='PAGADO'
-    ).aggregate(t=Sum('monto_pagado'))['t'] or 0
-
-    areas_comunes = AreaComun.objects.all()
-    proximas_reservas = Reserva.objects.filter(
-        fecha_reserva__gte=timezone.now().date(),
-        estado__in=['APROBADA', 'PENDIENTE']
-    ).select_related('area', 'residente')[:5]
-
-    usuarios = None
-    logs_recientes = None
-    if rol == 'admin':
-        usuarios = User.objects.select_related('frontend_profile').order_by('username')
-        logs_recientes = HistorialLog.objects.select_related('usuario').order_by('-id')[:50]
+    # Sólo se consulta la sección visible; el resto se carga bajo demanda
+    # desde dashboard_seccion cuando el usuario abre su pestaña.
+    context = _contexto_seccion(request, rol, tab_activa)
+    context["tab_activa"] = tab_activa
+    return render(request, "dashboard.html", context)
+
+
+@login_required
+def dashboard_seccion(request, seccion):
+    """
+    Devuelve el fragmento HTML de una pestaña del dashboard.
+    """
+    rol = obtener_rol(request.user)
+    if seccion not in SECCIONES_DASHBOARD:
+        raise Http404("Sección no encontrada.")
+    if not _puede_ver_seccion(rol, seccion):
+        return HttpResponseForbidden("No tienes permisos para ver esta sección.")
 
+    context = _contexto_seccion(request, rol, seccion)
+    return render(request, f"dashboard/seccion_{seccion}.html", context)
+
+
+def _contexto_seccion(request, rol, seccion):
     context = {
-        "kpi_residentes": kpi_residentes,
-        "kpi_cuotas": kpi_cuotas,
-        "kpi_tickets": kpi_tickets,
-        "actividad_reciente": actividad_reciente[:5],
-        "ultimos_pagos": ultimos_pagos,
-        "ultimos_tickets": ultimos_tickets,
-        "empleados": empleados,
-        "proveedores": proveedores,
-        "ultimas_reuniones": ultimas_reuniones,
-        "accesos_recientes": accesos_recientes,
-        "total_ingresos": total_ingresos,
-        "areas_comunes": areas_comunes,
-        "proximas_reservas": proximas_reservas,
-        "documentos": Documento.objects.order_by("-fecha")[:5],
-        "residentes": Residente.objects.filter(estado='AC'),
-        "usuarios": usuarios,
-        "logs_recientes": logs_recientes,
         "rol_usuario": rol,
-        "logs": logs_page,
-        "tab_activa": request.GET.get('section','home')
+        # Llaves de los fragmentos cacheados: cambian cuando se escribe en sus modelos
+        "versiones": cache_fragmentos.versiones_secciones(),
+        "fragmentos_ttl": settings.FRAGMENTOS_CACHE_TTL,
     }
-    return render(request, "dashboard.html", context)
+    context.update(_CONSTRUCTORES_SECCION[seccion](request))
+    return context
+
+
+ACTIVIDAD_DASHBOARD_LIMITE = 5
+
+
+def _seccion_home(request):
+    # Los KPIs se leen de la tabla de resumen (una fila) en lugar de contar tablas completas
+    kpis = indicadores.obtener_resumen()
+
+    # Feed unificado de todos los módulos: una lectura por índice (fecha, id)
+    actividad_reciente, cursor_actividad = pagina_keyset(
+        Actividad.objects.all(), None, ACTIVIDAD_DASHBOARD_LIMITE
+    )
+
+    return {
+        "kpi_residentes": kpis.residentes_activos,
+        "kpi_cuotas": kpis.cuotas_pendientes,
+        "kpi_tickets": kpis.tickets_abiertos,
+        "actividad_reciente": actividad_reciente,
+        "cursor_actividad": cursor_actividad,
+    }
+
+
+DIRECTORIO_DASHBOARD_LIMITE = 20
+
+
+def _seccion_residentes(request):
+    return {
+        "residentes": Residente.objects.filter(estado='AC').order_by('unidad_principal')[:DIRECTORIO_DASHBOARD_LIMITE],
+    }
+
+
+def _seccion_pagos(request):
+    return {"ultimos_pagos": Pago.objects.select_related('residente').order_by('-fecha_emision')[:15]}
+
+
+def _seccion_tickets(request):
+    return {
+        "ultimos_tickets": Ticket.objects.select_related('residente').defer('descripcion').order_by('-fecha_creacion')[:15],
+    }
+
+
+def _seccion_personal(request):
+    return {
+        "empleados": Empleado.objects.filter(estado='ACTIVO'),
+        "proveedores": Proveedor.objects.filter(estado='ACTIVO'),
+    }
+
+
+def _seccion_reuniones(request):
+    return {
+        "ultimas_reuniones": Reunion.objects.filter(
+            estado__in=['PROGRAMADA', 'EN_CURSO']
+        ).order_by('fecha_reunion'),
+    }
+
+
+def _seccion_seguridad(request):
+    return {
+        "accesos_recientes": ControlAcceso.objects.filter(
+            fecha_salida__isnull=True
+        ).select_related('residente').order_by('-fecha_entrada')[:5],
+    }
+
+
+def _seccion_areas(request):
+    return {
+        "areas_comunes": AreaComun.objects.all(),
+        "proximas_reservas": Reserva.objects.filter(
+            fecha_reserva__gte=timezone.now().date(),
+            estado__in=['APROBADA', 'PENDIENTE']
+        ).select_related('area', 'residente')[:5],
+    }
+
+
+def _seccion_reportes(request):
+    return {"total_ingresos": indicadores.obtener_resumen().total_ingresos}
+
+
+def _seccion_documentacion(request):
+    return {"documentos": Documento.objects.order_by("-fecha")[:5]}
+
+
+def _seccion_usuarios(request):
+    return {"usuarios": User.objects.select_related('frontend_profile').order_by('username')}
+
+
+LOGS_DASHBOARD_POR_PAGINA = 20
+
+
+def _seccion_logs(request):
+    query_logs = request.GET.get('q_logs', '')
+    logs_list = busqueda_logs.buscar(HistorialLog.objects.select_related('usuario'), query_logs)
+    cursor = request.GET.get('cursor', '')
+    # Perezosa como los querysets de las otras secciones: sólo se consulta
+    # si el fragmento cacheado (filas y enlace "Siguiente") no está en caché.
+    pagina = SimpleLazyObject(lambda: dict(zip(
+        ('filas', 'siguiente'), pagina_keyset(logs_list, cursor, LOGS_DASHBOARD_POR_PAGINA)
+    )))
+    return {
+        "pagina_logs": pagina,
+        "cursor_logs": cursor,
+        "q_logs": query_logs,
+        # Con búsqueda no se muestra total: contarla costaría lo que se quiere evitar.
+        "total_logs": None if query_logs else total_aproximado(HistorialLog),
+    }
+
+
+_CONSTRUCTORES_SECCION = {
+    'home': _seccion_home,
+    'residentes': _seccion_residentes,
+    'pagos': _seccion_pagos,
+    'tickets': _seccion_tickets,
+    'personal': _seccion_personal,
+    'reuniones': _seccion_reuniones,
+    'seguridad': _seccion_seguridad,
+    'areas': _seccion_areas,
+    'reportes': _seccion_reportes,
+    'documentacion': _seccion_documentacion,
+    'usuarios': _seccion_usuarios,
+    'logs': _seccion_logs,
+}
+
+
+LOGS_POR_PAGINA = 100
 
 
 @login_required
@@ -255,15 +315,17 @@ def dashboard_logs(request):
         messages.error(request, "No tienes permisos para ver el historial de actividad.")
         return redirect('residente_listado')
 
-    logs = HistorialLog.objects.select_related('usuario').all()
-    query = request.GET.get('q')
-    if query:
-        logs = logs.filter(
-            Q(usuario__username__icontains=query)
-            | Q(descripcion__icontains=query)
-            | Q(modulo__icontains=query)
-        )
-    return render(request, 'logs.html', {'logs': logs[:100], 'busqueda_actual': query})
+    query = request.GET.get('q', '')
+    logs = busqueda_logs.buscar(HistorialLog.objects.select_related('usuario'), query)
+    cursor = request.GET.get('cursor', '')
+    logs, siguiente = pagina_keyset(logs, cursor, LOGS_POR_PAGINA)
+    return render(request, 'logs.html', {
+        'logs': logs,
+        'busqueda_actual': query,
+        'cursor_actual': cursor,
+        'siguiente': siguiente,
+        'total_aproximado': None if query else total_aproximado(HistorialLog),
+    })
 
 
 @login_required
@@ -477,7 +539,82 @@ def residentes_view(request):
     return redirect('residente_listado')
 
 
+RESIDENTES_POR_PAGINA = 50
+
+# Columna ordenable -> campo del modelo. Sólo columnas NOT NULL: la paginación
+# por cursor compara (campo, id) y no admite NULL.
+ORDEN_RESIDENTES = {
+    'nombre': 'nombre_completo',
+    'tipo': 'tipo_residente',
+    'unidad': 'unidad_principal',
+    'estado': 'estado',
+}
+
+
+def _residentes_filtrados(datos):
+    """
+    Aplica los filtros del listado (q, estado, tipo) tomados de `datos`
+    (request.GET o request.POST). Devuelve (queryset, {filtro: valor válido}).
+    """
+    query = datos.get('q', '').strip()
+    estado = datos.get('estado', '')
+    tipo = datos.get('tipo', '')
+
+    residentes = busqueda_residentes.buscar(Residente.objects.all(), query)
+    if estado in dict(Residente.ESTADO_CHOICES):
+        residentes = residentes.filter(estado=estado)
+    else:
+        estado = ''
+    if tipo in dict(Residente.TIPO_RESIDENTE_CHOICES):
+        residentes = residentes.filter(tipo_residente=tipo)
+    else:
+        tipo = ''
+    return residentes, {'q': query, 'estado': estado, 'tipo': tipo}
+
+
+def _contexto_listado_residentes(request):
+    """
+    Listado de residentes paginado por cursor, con filtros por estado/tipo y
+    orden por columna (?orden=nombre, ?orden=-unidad, ...).
+    """
+    orden = request.GET.get('orden', 'unidad')
+    if orden.lstrip('-') not in ORDEN_RESIDENTES:
+        orden = 'unidad'
+    descendente = orden.startswith('-')
+
+    residentes, valores = _residentes_filtrados(request.GET)
+    query, estado, tipo = valores['q'], valores['estado'], valores['tipo']
+    residentes = residentes.only(
+        'nombre_completo', 'tipo_residente', 'unidad_principal', 'correo_electronico', 'estado'
+    )
+
+    cursor = request.GET.get('cursor', '')
+    residentes, siguiente = pagina_keyset(
+        residentes, cursor, RESIDENTES_POR_PAGINA,
+        campo=ORDEN_RESIDENTES[orden.lstrip('-')], descendente=descendente,
+    )
+
+    filtros = {k: v for k, v in (('q', query), ('estado', estado), ('tipo', tipo)) if v}
+    return {
+        'residentes': residentes,
+        'busqueda_actual': query,
+        'estado_actual': estado,
+        'tipo_actual': tipo,
+        'orden_actual': orden,
+        # Clic en la columna ya ordenada invierte el sentido.
+        'orden_links': {c: f'-{c}' if orden == c else c for c in ORDEN_RESIDENTES},
+        'qs_filtros': urlencode(filtros),
+        'qs_listado': urlencode({**filtros, 'orden': orden}),
+        'cursor_actual': cursor,
+        'siguiente': siguiente,
+        'TIPO_RESIDENTE_CHOICES': Residente.TIPO_RESIDENTE_CHOICES,
+        'ESTADO_CHOICES': Residente.ESTADO_CHOICES,
+        'rol_usuario': obtener_rol(request.user),
+    }
+
+
 @login_required
+@condicional(lambda request: [Residente.objects.all()])
 def residente_listado_y_registro(request):
     if request.method == 'POST':
         try:
@@ -508,43 +645,30 @@ def residente_listado_y_registro(request):
                 messages.error(request, "Ya existe un residente con ese DNI.")
                 return redirect('residente_listado')
 
-            nuevos_slots = set(_limpiar_slots_estacionamiento(parking_text))
-            ocupados = _buscar_slots_ocupados(nuevos_slots)
-            if ocupados:
-                messages.error(
-                    request,
-                    f"Los espacios de estacionamiento {', '.join(ocupados)} ya están asignados a otro residente."
-                )
+            codigos = estacionamiento.limpiar_codigos(parking_text)
+            try:
+                with transaction.atomic():
+                    r = Residente.objects.create(
+                        nombre_completo=nombre_completo,
+                        dni=dni,
+                        telefono=telefono,
+                        correo_electronico=correo,
+                        tipo_residente=tipo_residente,
+                        unidad_principal=unidad,
+                        estado=estado,
+                        espacios_estacionamiento=', '.join(codigos) or None,
+                    )
+                    estacionamiento.asignar(r, codigos)
+            except (estacionamiento.EspacioOcupado, ValueError) as e:
+                messages.error(request, str(e))
                 return redirect('residente_listado')
-
-            r = Residente.objects.create(
-                nombre_completo=nombre_completo,
-                dni=dni,
-                telefono=telefono,
-                correo_electronico=correo,
-                tipo_residente=tipo_residente,
-                unidad_principal=unidad,
-                estado=estado,
-                espacios_estacionamiento=parking_text or None,
-            )
             registrar_log(request.user, 'CREACION', 'Residentes', f"Nuevo residente: {r.nombre_completo}")
             messages.success(request, "Registrado.")
             return redirect('residente_listado')
         except Exception as e:
             messages.error(request, f"Error: {e}")
 
-    query = request.GET.get('q')
-    residentes = Residente.objects.all().order_by('unidad_principal')
-    if query:
-        residentes = residentes.filter(nombre_completo__icontains=query)
-
-    return render(request, 'residentes.html', {
-        'residentes': residentes,
-        'busqueda_actual': query,
-        'TIPO_RESIDENTE_CHOICES': Residente.TIPO_RESIDENTE_CHOICES,
-        'ESTADO_CHOICES': Residente.ESTADO_CHOICES,
-        'rol_usuario': obtener_rol(request.user),
-    })
+    return render(request, 'residentes.html', _contexto_listado_residentes(request))
 
 
 @login_required
@@ -567,40 +691,145 @@ def residente_editar(request, pk):
             messages.error(request, "Ya existe otro residente con ese DNI.")
             return redirect('residente_listado')
 
-        nuevos_slots = set(_limpiar_slots_estacionamiento(nuevo_parking))
-        ocupados = _buscar_slots_ocupados(nuevos_slots, residente_actual=r)
-        if ocupados:
-            messages.error(
-                request,
-                f"Los espacios de estacionamiento {', '.join(ocupados)} ya están asignados a otro residente."
-            )
-            return redirect('residente_listado')
-
         r.nombre_completo = nuevo_nombre
         r.dni = nuevo_dni or None
         r.telefono = nuevo_tel or None
         r.tipo_residente = nuevo_tipo
         r.unidad_principal = nueva_unidad
         r.estado = nuevo_estado
-        r.espacios_estacionamiento = nuevo_parking or None
-        r.save()
+        try:
+            with transaction.atomic():
+                estacionamiento.asignar(r, estacionamiento.limpiar_codigos(nuevo_parking))
+                r.save()
+        except (estacionamiento.EspacioOcupado, ValueError) as e:
+            messages.error(request, str(e))
+            return redirect('residente_listado')
         registrar_log(request.user, 'EDICION', 'Residentes', f"Editó a {r.nombre_completo}")
         messages.success(request, "Actualizado.")
         return redirect('residente_listado')
 
-    query = request.GET.get('q')
-    residentes = Residente.objects.all().order_by('unidad_principal')
-    if query:
-        residentes = residentes.filter(nombre_completo__icontains=query)
+    context = _contexto_listado_residentes(request)
+    context['residente_a_editar'] = r
+    return render(request, 'residentes.html', context)
 
-    return render(request, 'residentes.html', {
-        'residentes': residentes,
-        'busqueda_actual': query,
-        'TIPO_RESIDENTE_CHOICES': Residente.TIPO_RESIDENTE_CHOICES,
-        'ESTADO_CHOICES': Residente.ESTADO_CHOICES,
-        'residente_a_editar': r,
-        'rol_usuario': obtener_rol(request.user),
-    })
+
+UNIDADES_EN_LOG_MASIVO = 20
+
+
+@login_required
+@require_POST
+def residente_accion_masiva(request):
+    """
+    Cambia estado y/o tipo de muchos residentes con un solo UPDATE: los
+    marcados en el listado o, con alcance=filtro, todos los que cumplen los
+    filtros actuales. Deja un único registro en el historial.
+    """
+    if not es_admin(request.user):
+        messages.error(request, "No tienes permisos para modificar residentes en bloque.")
+        return redirect('residente_listado')
+
+    nuevo_estado = request.POST.get('nuevo_estado', '')
+    nuevo_tipo = request.POST.get('nuevo_tipo', '')
+    cambios = {}
+    if nuevo_estado in dict(Residente.ESTADO_CHOICES):
+        cambios['estado'] = nuevo_estado
+    if nuevo_tipo in dict(Residente.TIPO_RESIDENTE_CHOICES):
+        cambios['tipo_residente'] = nuevo_tipo
+    if not cambios:
+        messages.error(request, "Elige el nuevo estado o tipo.")
+        return redirect('residente_listado')
+
+    if request.POST.get('alcance') == 'filtro':
+        residentes, filtros = _residentes_filtrados(request.POST)
+        descripcion_alcance = ', '.join(f"{k}={v}" for k, v in filtros.items() if v) or 'todos'
+    else:
+        ids = [int(i) for i in request.POST.getlist('ids') if i.isdigit()]
+        if not ids:
+            messages.error(request, "No seleccionaste ningún residente.")
+            return redirect('residente_listado')
+        residentes = Residente.objects.filter(pk__in=ids)
+        descripcion_alcance = 'selección'
+
+    # Sólo las filas que realmente cambian.
+    residentes = residentes.exclude(**cambios)
+
+    try:
+        with transaction.atomic():
+            conteo = residentes.aggregate(
+                total=Count('id'),
+                activos=Count('id', filter=Q(estado=Residente.ACTIVO)),
+            )
+            unidades = list(residentes.order_by('unidad_principal').values_list(
+                'unidad_principal', flat=True
+            )[:UNIDADES_EN_LOG_MASIVO])
+            actualizados = residentes.update(**cambios, updated_at=timezone.now())
+    except IntegrityError:
+        messages.error(
+            request,
+            "No se aplicó el cambio: alguna unidad ya tiene un residente de ese tipo."
+        )
+        return redirect('residente_listado')
+
+    if actualizados:
+        delta = 0
+        if 'estado' in cambios:
+            if cambios['estado'] == Residente.ACTIVO:
+                delta = conteo['total'] - conteo['activos']
+            else:
+                delta = -conteo['activos']
+        agregados.tras_escritura_masiva('Residente', residentes_activos=delta)
+
+        etiquetas = []
+        if 'estado' in cambios:
+            etiquetas.append(f"estado {dict(Residente.ESTADO_CHOICES)[cambios['estado']]}")
+        if 'tipo_residente' in cambios:
+            etiquetas.append(f"tipo {dict(Residente.TIPO_RESIDENTE_CHOICES)[cambios['tipo_residente']]}")
+        lista = ', '.join(unidades)
+        if actualizados > len(unidades):
+            lista += f" y {actualizados - len(unidades)} más"
+        registrar_log(
+            request.user, 'EDICION', 'Residentes',
+            f"Cambio masivo ({descripcion_alcance}): {actualizados} residentes a "
+            f"{' y '.join(etiquetas)}. Unidades: {lista}"
+        )
+
+    messages.success(request, f"{actualizados} residentes actualizados.")
+    return redirect('residente_listado')
+
+
+REPORTE_IMPORTACION_MAX = 500
+
+
+@login_required
+@require_POST
+def residente_importar(request):
+    if not es_admin(request.user):
+        messages.error(request, "No tienes permisos para importar residentes.")
+        return redirect('residente_listado')
+
+    archivo = request.FILES.get('archivo_residentes')
+    if not archivo:
+        messages.error(request, "Selecciona un archivo .csv o .xlsx.")
+        return redirect('residente_listado')
+
+    try:
+        resultado = importacion.importar(importacion.leer_filas(archivo.file, archivo.name))
+    except importacion.ArchivoInvalido as e:
+        resultado = {'creados': 0, 'errores': [(1, str(e))]}
+
+    if resultado['creados']:
+        registrar_log(
+            request.user, 'CREACION', 'Residentes',
+            f"Importó {resultado['creados']} residentes desde {archivo.name}"
+        )
+
+    context = _contexto_listado_residentes(request)
+    context['resultado_importacion'] = {
+        'creados': resultado['creados'],
+        'total_errores': len(resultado['errores']),
+        'errores': resultado['errores'][:REPORTE_IMPORTACION_MAX],
+    }
+    return render(request, 'residentes.html', context)
 
 
 @login_required
@@ -617,6 +846,11 @@ def residente_eliminar(request, pk):
         messages.warning(request, "Eliminado.")
     return redirect('residente_listado')
 
+MOVIMIENTOS_POR_PAGINA = 50
+ESTADOS_EN_REVISION = (EstadoMovimiento.REVISION, EstadoMovimiento.SIN_COINCIDENCIA)
+ERRORES_CONCILIACION_EN_MENSAJE = 5
+
+
 @login_required
 def dashboard_pagos(request):
     rol = obtener_rol(request.user)
@@ -624,21 +858,16 @@ def dashboard_pagos(request):
         messages.error(request, "No tienes permisos para gestionar pagos.")
         return redirect('residente_listado')
 
-    res_list = Residente.objects.filter(estado='AC').order_by('unidad_principal')
     emp_list = Empleado.objects.filter(estado='ACTIVO').order_by('nombre_completo')
     prov_list = Proveedor.objects.filter(estado='ACTIVO').order_by('nombre_empresa')
 
-    deuda = Pago.objects.filter(
-        estado__in=['PENDIENTE', 'VENCIDO', 'PARCIAL'],
-        tipo_movimiento='INGRESO'
-    ).aggregate(t=Sum(F('monto_total') - F('monto_pagado')))['t'] or 0
-    hoy = timezone.now()
-    ingresos = Pago.objects.filter(
-        tipo_movimiento='INGRESO',
-        monto_pagado__gt=0,
-        fecha_pago__month=hoy.month
-    ).aggregate(t=Sum('monto_pagado'))['t'] or 0
-    morosos = Pago.objects.filter(estado='VENCIDO').count()
+    # Deuda y morosos salen de la tabla de saldos (rango sobre sus índices), no de gestion_pagos.
+    deuda = SaldoResidente.objects.filter(saldo__gt=0).aggregate(t=Sum('saldo'))['t'] or 0
+    hoy = timezone.localdate()
+    ingresos = resumen_financiero.total(
+        'cobrado', anio=hoy.year, mes=hoy.month, tipo_movimiento='INGRESO'
+    )
+    morosos = SaldoResidente.objects.filter(saldo_vencido__gt=0).count()
 
     pendientes = Pago.objects.filter(
         estado__in=['PENDIENTE', 'VENCIDO']
@@ -653,13 +882,26 @@ def dashboard_pagos(request):
         pendientes = pendientes.filter(f)
         historial = historial.filter(f)
 
+    revision, siguiente_revision = [], None
+    if rol == 'admin':
+        revision, siguiente_revision = pagina_keyset(
+            MovimientoBancario.objects.filter(estado__in=ESTADOS_EN_REVISION),
+            request.GET.get('cursor_conciliacion'), MOVIMIENTOS_POR_PAGINA,
+            campo='fecha', descendente=False,
+        )
+        candidatos = conciliacion.candidatos_para(revision)
+        for m in revision:
+            m.candidatos = candidatos[m.pk]
+
     return render(request, 'pagos.html', {
+        'movimientos_revision': revision,
+        'cursor_conciliacion': request.GET.get('cursor_conciliacion', ''),
+        'siguiente_conciliacion': siguiente_revision,
         'total_pendiente': deuda,
         'ingresos_mes': ingresos,
         'cantidad_morosos': morosos,
         'pagos_pendientes': pendientes[:20],
         'historial_pagos': historial[:20],
-        'residentes_list': res_list,
         'empleados_list': emp_list,
         'proveedores_list': prov_list,
         'busqueda_actual': query,
@@ -711,8 +953,7 @@ def guardar_pago(request):
             nuevo.fecha_pago = timezone.now().date()
             nuevo.metodo_pago = request.POST.get('metodo_pago')
             if estado == 'PAGADO':
-                pref = "ING" if nuevo.tipo_movimiento == 'INGRESO' else "EGR"
-                nuevo.numero_recibo = f"{pref}-{int(time.time())}"
+                nuevo.numero_recibo = folios.numero_recibo(nuevo.tipo_movimiento)
         else:
             nuevo.monto_pagado = 0
 
@@ -725,29 +966,224 @@ def guardar_pago(request):
 
 
 @login_required
+@require_POST
+def abonar_pago(request):
+    """
+    Registra un abono de un residente y lo reparte entre sus cargos
+    abiertos, del más antiguo al más nuevo.
+    """
+    rol = obtener_rol(request.user)
+    if rol not in ('admin', 'residente', 'empleado', 'guardia', 'propietario'):
+        messages.error(request, "No tienes permisos para registrar pagos.")
+        return redirect('residente_listado')
+
+    residente = get_object_or_404(Residente, id=request.POST.get('residente_id') or 0)
+    try:
+        monto = Decimal(request.POST.get('monto') or 0)
+        abono = abonos.abonar(
+            residente,
+            monto,
+            metodo_pago=request.POST.get('metodo_pago'),
+            referencia=request.POST.get('referencia', '').strip(),
+        )
+    except InvalidOperation:
+        messages.error(request, "El monto del abono no es válido.")
+        return redirect('dashboard_pagos')
+    except abonos.AbonoInvalido as e:
+        messages.error(request, str(e))
+        return redirect('dashboard_pagos')
+
+    registrar_log(
+        request.user, 'CREACION', 'Pagos',
+        f"Abono {abono.numero_recibo} de ${abono.monto} ({residente.unidad_principal}) "
+        f"aplicado a {len(abono.aplicaciones_nuevas)} cargos",
+    )
+    mensaje = (
+        f"Abono {abono.numero_recibo}: ${abono.monto_aplicado} aplicados a "
+        f"{len(abono.aplicaciones_nuevas)} cargos."
+    )
+    if abono.saldo_a_favor:
+        mensaje += f" Saldo a favor: ${abono.saldo_a_favor}."
+    messages.success(request, mensaje)
+    return redirect('dashboard_pagos')
+
+
+@login_required
+@require_POST
+def conciliacion_importar(request):
+    if not es_admin(request.user):
+        messages.error(request, "No tienes permisos para conciliar estados de cuenta.")
+        return redirect('dashboard_pagos')
+
+    archivo = request.FILES.get('estado_cuenta')
+    if not archivo:
+        messages.error(request, "Selecciona el estado de cuenta (.csv).")
+        return redirect('/pagos/?tab=conciliacion')
+    try:
+        resultado = conciliacion.importar(archivo.file)
+    except conciliacion.EstadoCuentaInvalido as e:
+        messages.error(request, str(e))
+        return redirect('/pagos/?tab=conciliacion')
+
+    if resultado['nuevos']:
+        registrar_log(
+            request.user, 'CREACION', 'Pagos',
+            f"Conciliación de {archivo.name}: {resultado['conciliados']} depósitos aplicados, "
+            f"{resultado['revision'] + resultado['sin_coincidencia']} para revisión",
+        )
+    messages.success(
+        request,
+        f"{resultado['nuevos']} depósitos nuevos de {resultado['leidos']}: "
+        f"{resultado['conciliados']} conciliados, {resultado['revision']} en revisión, "
+        f"{resultado['sin_coincidencia']} sin coincidencia.",
+    )
+    errores = resultado['errores']
+    if errores:
+        detalle = '; '.join(f"fila {f}: {m}" for f, m in errores[:ERRORES_CONCILIACION_EN_MENSAJE])
+        if len(errores) > ERRORES_CONCILIACION_EN_MENSAJE:
+            detalle += f" (y {len(errores) - ERRORES_CONCILIACION_EN_MENSAJE} más)"
+        messages.warning(request, f"{len(errores)} filas no se pudieron leer: {detalle}")
+    return redirect('/pagos/?tab=conciliacion')
+
+
+@login_required
+@require_POST
+def conciliacion_resolver(request, pk):
+    """
+    Cola de revisión: conciliar un movimiento con el cargo elegido o descartarlo.
+    """
+    if not es_admin(request.user):
+        messages.error(request, "No tienes permisos para conciliar estados de cuenta.")
+        return redirect('dashboard_pagos')
+
+    movimiento = get_object_or_404(MovimientoBancario, pk=pk)
+    if request.POST.get('accion') == 'descartar':
+        MovimientoBancario.objects.filter(pk=pk).exclude(
+            estado=EstadoMovimiento.CONCILIADO
+        ).update(estado=EstadoMovimiento.DESCARTADO)
+        registrar_log(request.user, 'EDICION', 'Pagos', f"Descartó el depósito bancario {movimiento}")
+        messages.warning(request, "Movimiento descartado.")
+        return redirect('/pagos/?tab=conciliacion')
+
+    pago = get_object_or_404(Pago, pk=request.POST.get('pago_id') or 0)
+    try:
+        movimiento = conciliacion.resolver(pk, pago)
+    except abonos.AbonoInvalido as e:
+        messages.error(request, str(e))
+        return redirect('/pagos/?tab=conciliacion')
+    registrar_log(
+        request.user, 'EDICION', 'Pagos',
+        f"Concilió el depósito {movimiento} con el cargo #{pago.pk} ({movimiento.abono.numero_recibo})",
+    )
+    messages.success(request, f"Depósito conciliado: abono {movimiento.abono.numero_recibo}.")
+    return redirect('/pagos/?tab=conciliacion')
+
+
+TICKETS_POR_PAGINA = 50
+ESTADOS_TICKET = ('ABIERTO', 'EN_PROCESO', 'ESPERANDO_REPUESTO', 'CERRADO')
+
+
+def _tickets_filtrados(datos):
+    """
+    Filtros combinables del tablero de tickets. Cada uno tiene un índice
+    (filtro, fecha_creacion) para que la página por cursor siga siendo un
+    rango del índice. Devuelve (queryset, {filtro: valor válido}).
+
+    asignado: 'e<id>' empleado, 'p<id>' proveedor, 'sin' sin asignar.
+    unidad: prefijo de la unidad del residente.
+    desde / hasta: fechas AAAA-MM-DD de creación (inclusive).
+    """
+    tickets = Ticket.objects.all()
+    filtros = {}
+
+    estado = datos.get('estado', '')
+    if estado in ESTADOS_TICKET:
+        tickets = tickets.filter(estado=estado)
+        filtros['estado'] = estado
+
+    prioridad = datos.get('prioridad', '')
+    if prioridad in Prioridad.values:
+        tickets = tickets.filter(prioridad=prioridad)
+        filtros['prioridad'] = prioridad
+
+    tipo = datos.get('tipo', '').strip()
+    if tipo:
+        tickets = tickets.filter(tipo_solicitud=tipo)
+        filtros['tipo'] = tipo
+
+    asignado = datos.get('asignado', '')
+    if asignado == 'sin':
+        tickets = tickets.filter(empleado_asignado__isnull=True, proveedor_asignado__isnull=True)
+        filtros['asignado'] = asignado
+    elif asignado[:1] in ('e', 'p') and asignado[1:].isdigit():
+        campo = 'empleado_asignado_id' if asignado[0] == 'e' else 'proveedor_asignado_id'
+        tickets = tickets.filter(**{campo: int(asignado[1:])})
+        filtros['asignado'] = asignado
+
+    unidad = datos.get('unidad', '').strip()
+    if unidad:
+        tickets = tickets.filter(
+            residente__in=Residente.objects.filter(unidad_principal__istartswith=unidad).values('pk')
+        )
+        filtros['unidad'] = unidad
+
+    zona = timezone.get_current_timezone()
+    for nombre, lookup, dias in (('desde', 'gte', 0), ('hasta', 'lt', 1)):
+        try:
+            dia = date.fromisoformat(datos.get(nombre, ''))
+        except ValueError:
+            continue
+        limite = datetime.combine(dia + timedelta(days=dias), datetime.min.time(), tzinfo=zona)
+        tickets = tickets.filter(**{f'fecha_creacion__{lookup}': limite})
+        filtros[nombre] = dia.isoformat()
+
+    return tickets, filtros
+
+
+@login_required
+@condicional(lambda request: [
+    Ticket.objects.all(), Residente.objects.all(), Empleado.objects.all(), Proveedor.objects.all(),
+    # El aviso de SLA vencido cambia con la hora aunque ninguna fila cambie: su COUNT entra en el ETag.
+    Ticket.objects.filter(vence_en__lt=timezone.now()).exclude(estado=sla.ESTADO_CERRADO),
+])
 def dashboard_tickets(request):
     rol = obtener_rol(request.user)
     if rol not in ('admin', 'residente', 'empleado', 'propietario'):
         messages.error(request, "No tienes permisos para gestionar tickets.")
         return redirect('residente_listado')
 
-    tickets = Ticket.objects.select_related(
-        'residente', 'empleado_asignado', 'proveedor_asignado'
-    ).all().order_by('-fecha_creacion')
-    estado = request.GET.get('estado')
-    if estado and estado != 'TODOS':
-        tickets = tickets.filter(estado=estado)
+    tickets, filtros = _tickets_filtrados(request.GET)
+    cursor = request.GET.get('cursor', '')
+    tickets, siguiente = pagina_keyset(
+        tickets.select_related('residente', 'empleado_asignado', 'proveedor_asignado').defer('descripcion'),
+        cursor, TICKETS_POR_PAGINA, campo='fecha_creacion',
+    )
 
-    sel_ticket = None
+    sel_ticket, comentarios = None, []
     if request.GET.get('ticket_id'):
         sel_ticket = get_object_or_404(Ticket, id=request.GET.get('ticket_id'))
+        comentarios = sel_ticket.comentarios.select_related('autor')
 
+    empleados = list(Empleado.objects.filter(estado='ACTIVO'))
+    proveedores = list(Proveedor.objects.filter(estado='ACTIVO'))
     return render(request, 'solicitudes.html', {
         'tickets': tickets,
+        'filtros': filtros,
+        'qs_filtros': urlencode({k: v for k, v in filtros.items() if v}),
+        'cursor_actual': cursor,
+        'siguiente': siguiente,
+        # Valores distintos leídos del índice (tipo_solicitud, fecha_creacion)
+        'tipos_solicitud': sorted(
+            set(Ticket.TIPOS_SOLICITUD)
+            | set(Ticket.objects.exclude(tipo_solicitud='').values_list('tipo_solicitud', flat=True).distinct())
+        ),
+        'asignables': [(f'e{e.pk}', e.nombre_completo) for e in empleados]
+                      + [(f'p{p.pk}', p.nombre_empresa) for p in proveedores],
         'ticket_seleccionado': sel_ticket,
-        'residentes': Residente.objects.filter(estado='AC'),
-        'empleados': Empleado.objects.filter(estado='ACTIVO'),
-        'proveedores': Proveedor.objects.filter(estado='ACTIVO'),
+        'comentarios': comentarios,
+        'ahora': timezone.now(),
+        'empleados': empleados,
+        'proveedores': proveedores,
         'prioridades': Prioridad.choices,
         'active_tab': 'detalle' if sel_ticket else request.GET.get('tab', 'listado'),
         'rol_usuario': rol,
@@ -766,6 +1202,7 @@ def crear_ticket(request):
             res = Residente.objects.get(id=request.POST.get('residente_id'))
             Ticket.objects.create(
                 residente=res,
+                tipo_solicitud=request.POST.get('tipo_solicitud') or 'Otro',
                 asunto=request.POST.get('asunto'),
                 descripcion=request.POST.get('descripcion'),
                 prioridad=request.POST.get('prioridad'),
@@ -790,7 +1227,8 @@ def actualizar_ticket(request, pk):
         messages.error(request, "No tienes permisos para actualizar tickets.")
         return redirect('residente_listado')
 
-    t = get_object_or_404(Ticket, pk=pk)
+    # Sin la descripción: save() escribe sólo los campos cargados.
+    t = get_object_or_404(Ticket.objects.defer('descripcion'), pk=pk)
     if request.method == 'POST':
         tipo, obj_id = request.POST.get('asignado_tipo'), request.POST.get('asignado_id')
         if tipo == 'empleado' and obj_id:
@@ -799,12 +1237,11 @@ def actualizar_ticket(request, pk):
             t.proveedor_asignado_id, t.empleado_asignado_id = obj_id, None
 
         t.estado = request.POST.get('estado')
-        nota = request.POST.get('notas')
-        if nota:
-            prev = t.descripcion or ""
-            t.descripcion = f"{prev}\n[Nota]: {nota}"
-
-        t.save()
+        nota = (request.POST.get('notas') or '').strip()
+        with transaction.atomic():
+            t.save()
+            if nota:
+                TicketComentario.objects.create(ticket=t, autor=request.user, texto=nota)
         registrar_log(request.user, 'EDICION', 'Tickets', f"Actualizó ticket #{t.id}")
         messages.success(request, "Actualizado.")
         if t.estado == 'CERRADO':
@@ -813,6 +1250,38 @@ def actualizar_ticket(request, pk):
     return redirect('dashboard_tickets')
 
 
+@login_required
+@require_POST
+def asignar_tickets_auto(request):
+    """
+    Asigna automáticamente un ticket (ticket_id) o todos los abiertos sin
+    responsable, según tipo de solicitud y carga de trabajo.
+    """
+    if not es_admin(request.user):
+        messages.error(request, "No tienes permisos para asignar tickets.")
+        return redirect('dashboard_tickets')
+
+    ticket_id = request.POST.get('ticket_id')
+    tickets = Ticket.objects.filter(pk=ticket_id) if ticket_id else None
+    resultado = asignacion.asignar(tickets)
+    if resultado['asignados']:
+        registrar_log(
+            request.user, 'EDICION', 'Tickets',
+            f"Asignación automática de {resultado['asignados']} tickets",
+        )
+        messages.success(request, f"{resultado['asignados']} tickets asignados.")
+    if resultado['sin_candidato']:
+        messages.warning(
+            request,
+            f"{resultado['sin_candidato']} tickets sin personal activo para su tipo de solicitud.",
+        )
+    if not resultado['asignados'] and not resultado['sin_candidato']:
+        messages.info(request, "No hay tickets abiertos sin asignar.")
+    if ticket_id:
+        return redirect(f'/tickets/?ticket_id={ticket_id}')
+    return redirect('dashboard_tickets')
+
+
 def eliminar_personal(request):
     if request.method == 'POST':
         obj_id = request.POST.get('obj_id')
@@ -970,7 +1439,6 @@ def dashboard_areas(request):
     ).select_related('residente', 'area').order_by('fecha_reserva')
     return render(request, 'areas.html', {
         'areas_list': AreaComun.objects.all(),
-        'residentes_list': Residente.objects.filter(estado='AC'),
         'reservas_list': res,
         'active_tab': request.GET.get('tab', 'calendario'),
         'rol_usuario': rol,
@@ -1065,6 +1533,7 @@ def cancelar_reserva(request, pk):
 
 
 @login_required
+@condicional(lambda request: [ControlAcceso.objects.all(), Residente.objects.all()])
 def dashboard_accesos(request):
     rol = obtener_rol(request.user)
     if rol not in ('admin', 'guardia'):
@@ -1074,7 +1543,6 @@ def dashboard_accesos(request):
     activos = ControlAcceso.objects.filter(fecha_salida__isnull=True).order_by('-fecha_entrada')
     hist = ControlAcceso.objects.filter(fecha_salida__isnull=False).order_by('-fecha_entrada')[:50]
     return render(request, 'accesos.html', {
-        'residentes': Residente.objects.filter(estado='AC'),
         'accesos_activos': activos,
         'historial_accesos': hist,
         'active_tab': request.GET.get('tab', 'activos'),
@@ -1182,26 +1650,16 @@ def dashboard_reportes(request):
         messages.error(request, "No tienes permisos para ver reportes.")
         return redirect('residente_listado')
 
-    ing = Pago.objects.filter(
-        tipo_movimiento='INGRESO',
-        estado='PAGADO'
-    ).aggregate(t=Sum('monto_pagado'))['t'] or 0
-    egr = Pago.objects.filter(
-        tipo_movimiento='EGRESO',
-        estado='PAGADO'
-    ).aggregate(t=Sum('monto_pagado'))['t'] or 0
-    deuda = Pago.objects.filter(
-        estado='VENCIDO'
-    ).aggregate(t=Sum(F('monto_total') - F('monto_pagado')))['t'] or 0
+    ing = resumen_financiero.total('cobrado_liquidado', tipo_movimiento='INGRESO')
+    egr = resumen_financiero.total('cobrado_liquidado', tipo_movimiento='EGRESO')
+    vencidos = SaldoResidente.objects.filter(saldo_vencido__gt=0)
+    deuda = vencidos.aggregate(t=Sum('saldo_vencido'))['t'] or 0
     tickets = [Ticket.objects.filter(estado=x).count() for x in ['ABIERTO', 'EN_PROCESO', 'CERRADO']]
-    morosos = Pago.objects.filter(
-        estado='VENCIDO'
-    ).values(
+    morosos = vencidos.order_by('-saldo_vencido').values(
         'residente__unidad_principal',
-        'residente__nombre_completo'
-    ).annotate(
-        deuda=Sum(F('monto_total') - F('monto_pagado'))
-    ).order_by('-deuda')[:5]
+        'residente__nombre_completo',
+        deuda=F('saldo_vencido'),
+    )[:5]
 
     return render(request, 'reportes.html', {
         'ingresos': ing,
@@ -1209,6 +1667,7 @@ def dashboard_reportes(request):
         'balance': ing - egr,
         'total_deuda': deuda,
         'tickets_stats': tickets,
+        'sla': sla.resumen(),
         'top_morosos': morosos,
         'active_tab': request.GET.get('tab', 'financiero'),
         'rol_usuario': obtener_rol(request.user),
@@ -1294,7 +1753,7 @@ def exportar_csv(request):
 
     elif tipo_reporte == 'tickets':
         writer.writerow(['ID', 'FECHA', 'ASUNTO', 'SOLICITANTE', 'ESTADO', 'PRIORIDAD'])
-        tickets = Ticket.objects.select_related('residente').all().order_by('-fecha_creacion')
+        tickets = Ticket.objects.select_related('residente').defer('descripcion').order_by('-fecha_creacion')
         if start and end:
             end_full = datetime.combine(end, datetime.max.time())
             start_full = datetime.combine(start, datetime.min.time())